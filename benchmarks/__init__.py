@@ -0,0 +1 @@
+"""Benchmarks for url-normalize, run with `python -m benchmarks`."""
@@ -0,0 +1,249 @@
+"""Run the benchmark suite and compare the results against a baseline.
+
+Usage:
+    python -m benchmarks [--filter TEXT] [--save FILE] [--compare FILE]
+
+Every benchmark is run once to fill caches and load lazy imports, then
+its loop count is calibrated so a timed run lasts at least --min-time
+seconds, and it is timed --repeat times. Throughput is reported in
+operations (URLs or components) per second: the best run, which noise
+from other processes can only slow down, and the median, with the
+interquartile spread of the runs relative to it. Baselines are compared
+on the best run; benchmarks whose spread exceeds --max-spread are marked
+UNSTABLE, as their comparison cannot be trusted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from url_normalize import __version__
+
+from .suite import build_benchmarks
+
+if TYPE_CHECKING:
+    from .suite import Benchmark
+
+BASELINE_FORMAT = 1
+DEFAULT_REPEAT = 15
+DEFAULT_MIN_TIME = 0.1
+# Flag benchmarks whose best throughput dropped by more than this fraction
+DEFAULT_THRESHOLD = 0.1
+# Flag benchmarks whose runs spread by more than this fraction of the median
+DEFAULT_MAX_SPREAD = 0.1
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark url-normalize."
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        metavar="TEXT",
+        help="Only run benchmarks whose name contains TEXT.",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Number of timed runs per benchmark. Default: {DEFAULT_REPEAT}",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        metavar="SECONDS",
+        help=f"Minimum duration of a timed run. Default: {DEFAULT_MIN_TIME}",
+    )
+    parser.add_argument(
+        "--save",
+        metavar="FILE",
+        help="Write the results to FILE as a JSON baseline.",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="Compare the results with a JSON baseline written by --save.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown reported as a regression, as a fraction. Default: 0.1",
+    )
+    parser.add_argument(
+        "--max-spread",
+        type=float,
+        default=DEFAULT_MAX_SPREAD,
+        help=(
+            "Interquartile spread of the runs above which a benchmark is "
+            "reported as unstable, as a fraction. Default: 0.1"
+        ),
+    )
+    return parser
+
+
+def _calibrate(timer: timeit.Timer, min_time: float) -> int:
+    """Find the number of loops for a timed run to last at least min_time."""
+    # Fill the caches and load the lazy imports before timing anything
+    timer.timeit(1)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            return number
+        # Extrapolate from the last run, at least doubling the loop count
+        number = max(number * 2, math.ceil(number * min_time / max(elapsed, 1e-9)))
+
+
+def measure(benchmark: Benchmark, *, repeat: int, min_time: float) -> dict:
+    """Time a benchmark and summarize its throughput.
+
+    Params:
+        benchmark: Benchmark to run
+        repeat: Number of timed runs
+        min_time: Minimum duration of a timed run, in seconds
+
+    Returns:
+        Best and median throughput in operations per second, and the
+        interquartile range of the runs relative to the median
+
+    """
+    timer = timeit.Timer(benchmark.func)
+    number = _calibrate(timer, min_time)
+    rates = sorted(
+        number * benchmark.size / elapsed
+        for elapsed in timer.repeat(repeat=repeat, number=number)
+    )
+    median = statistics.median(rates)
+    spread = 0.0
+    if len(rates) > 1:
+        low, _, high = statistics.quantiles(rates, n=4)
+        spread = (high - low) / median
+    return {"ops_per_sec": median, "best_ops_per_sec": rates[-1], "spread": spread}
+
+
+def _load_baseline(path: str) -> dict[str, dict]:
+    """Read the results of a baseline file."""
+    with Path(path).open(encoding="utf-8") as stream:
+        baseline = json.load(stream)
+    if baseline.get("format") != BASELINE_FORMAT:
+        msg = f"{path}: unsupported baseline format"
+        raise ValueError(msg)
+    return baseline["results"]
+
+
+def _save_baseline(path: str, results: dict[str, dict]) -> None:
+    """Write results and the environment they were measured in."""
+    baseline: dict[str, Any] = {
+        "format": BASELINE_FORMAT,
+        "url_normalize": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with Path(path).open("w", encoding="utf-8") as stream:
+        json.dump(baseline, stream, indent=2, sort_keys=True)
+        stream.write("\n")
+
+
+def _compare(
+    result: dict,
+    reference: dict | None,
+    threshold: float,
+) -> tuple[str, bool]:
+    """Format the change against the baseline and flag regressions."""
+    if reference is None:
+        return "new", False
+    change = result["best_ops_per_sec"] / reference["best_ops_per_sec"] - 1
+    regressed = change < -threshold
+    return f"{change:+7.1%}{'  REGRESSION' if regressed else ''}", regressed
+
+
+def _parse_args(argv: list[str] | None) -> tuple[argparse.Namespace, dict[str, dict]]:
+    """Parse and validate the arguments, and load the baseline if any."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.repeat < 1 or args.min_time <= 0:
+        parser.error("--repeat and --min-time must be positive")
+    if args.max_spread <= 0:
+        parser.error("--max-spread must be positive")
+
+    baseline: dict[str, dict] = {}
+    if args.compare:
+        try:
+            baseline = _load_baseline(args.compare)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"argument --compare: {e}")
+    return args, baseline
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and print a report.
+
+    Returns:
+        Exit status, 1 if a benchmark regressed against the baseline
+
+    """
+    args, baseline = _parse_args(argv)
+    benchmarks = [
+        benchmark
+        for benchmark in build_benchmarks()
+        if not args.filter or args.filter in benchmark.name
+    ]
+    width = max((len(benchmark.name) for benchmark in benchmarks), default=0)
+    print(
+        f"url-normalize {__version__}, "
+        f"{platform.python_implementation()} {platform.python_version()}"
+    )
+
+    results: dict[str, dict] = {}
+    regressions = 0
+    unstable = 0
+    for benchmark in benchmarks:
+        result = measure(benchmark, repeat=args.repeat, min_time=args.min_time)
+        results[benchmark.name] = result
+        line = (
+            f"{benchmark.name:<{width}}  {result['best_ops_per_sec']:>12,.0f} ops/s"
+            f"  median {result['ops_per_sec']:>12,.0f}  ±{result['spread']:5.1%}"
+        )
+        if result["spread"] > args.max_spread:
+            unstable += 1
+            line += "  UNSTABLE"
+        if args.compare:
+            change, regressed = _compare(
+                result, baseline.get(benchmark.name), args.threshold
+            )
+            regressions += regressed
+            line += f"  {change}"
+        print(line, flush=True)
+
+    if args.save:
+        _save_baseline(args.save, results)
+    if unstable:
+        print(
+            f"warning: {unstable} benchmark(s) spread by more than "
+            f"{args.max_spread:.0%}; close other programs or raise --min-time "
+            "and --repeat before trusting their comparison",
+            file=sys.stderr,
+        )
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
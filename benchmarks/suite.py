@@ -0,0 +1,174 @@
+"""Benchmark definitions for every stage of the normalization pipeline."""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from url_normalize import url_humanize, url_normalize
+from url_normalize.generic_url_cleanup import generic_url_cleanup
+from url_normalize.normalize_fragment import normalize_fragment
+from url_normalize.normalize_host import _normalize_host, normalize_host
+from url_normalize.normalize_path import normalize_path
+from url_normalize.normalize_port import normalize_port
+from url_normalize.normalize_query import normalize_query
+from url_normalize.normalize_scheme import normalize_scheme
+from url_normalize.normalize_userinfo import normalize_userinfo
+from url_normalize.provide_url_domain import provide_url_domain
+from url_normalize.provide_url_scheme import provide_url_scheme
+from url_normalize.tools import URL, deconstruct_url, reconstruct_url
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+CATEGORIES = ("ascii", "idn", "long_query", "percent", "special")
+
+
+class Benchmark(NamedTuple):
+    """A named workload processing a fixed number of items per call."""
+
+    name: str
+    func: Callable[[], object]
+    size: int
+
+
+def load_corpus(category: str) -> list[str]:
+    """Load the URLs of a corpus category, one per line."""
+    path = CORPUS_DIR / f"{category}.txt"
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def _stage_inputs(urls: list[str]) -> dict[str, list]:
+    """Run the pipeline once and record the input of every stage.
+
+    Mirrors Normalizer.__call__ with the default options, so each stage is
+    benchmarked on exactly the values it sees in production.
+    """
+    inputs: dict[str, list] = {
+        "provide_url_domain": urls,
+        "provide_url_scheme": [],
+        "generic_url_cleanup": [],
+        "deconstruct_url": [],
+        "elements": [],
+        "reconstruct_url": [],
+    }
+    for url in urls:
+        url = provide_url_domain(url, None)  # noqa: PLW2901
+        inputs["provide_url_scheme"].append(url)
+        url = provide_url_scheme(url)  # noqa: PLW2901
+        inputs["generic_url_cleanup"].append(url)
+        url = generic_url_cleanup(url)  # noqa: PLW2901
+        inputs["deconstruct_url"].append(url)
+        elements = deconstruct_url(url)
+        inputs["elements"].append(elements)
+        scheme = normalize_scheme(elements.scheme)
+        inputs["reconstruct_url"].append(
+            URL(
+                scheme=scheme,
+                userinfo=normalize_userinfo(elements.userinfo),
+                host=normalize_host(elements.host),
+                port=normalize_port(elements.port, scheme),
+                path=normalize_path(elements.path, scheme),
+                query=normalize_query(elements.query, host=elements.host),
+                fragment=normalize_fragment(elements.fragment),
+            )
+        )
+    return inputs
+
+
+def _mapped(func: Callable[..., object], *columns: list) -> Callable[[], object]:
+    """Build a workload calling func on the items of columns, side by side."""
+
+    def run() -> object:
+        return list(map(func, *columns))
+
+    return run
+
+
+def _stage_benchmarks(urls: list[str]) -> list[Benchmark]:
+    """Build one benchmark per pipeline stage over the whole corpus."""
+    inputs = _stage_inputs(urls)
+    elements: list[URL] = inputs["elements"]
+    hosts = [e.host for e in elements]
+    schemes = [normalize_scheme(e.scheme) for e in elements]
+
+    stages = [
+        ("provide_url_domain", _mapped(provide_url_domain, urls)),
+        (
+            "provide_url_scheme",
+            _mapped(provide_url_scheme, inputs["provide_url_scheme"]),
+        ),
+        (
+            "generic_url_cleanup",
+            _mapped(generic_url_cleanup, inputs["generic_url_cleanup"]),
+        ),
+        ("deconstruct_url", _mapped(deconstruct_url, inputs["deconstruct_url"])),
+        ("normalize_scheme", _mapped(normalize_scheme, [e.scheme for e in elements])),
+        (
+            "normalize_userinfo",
+            _mapped(normalize_userinfo, [e.userinfo for e in elements]),
+        ),
+        ("normalize_host", _mapped(normalize_host, hosts)),
+        (
+            "normalize_host[uncached]",
+            _mapped(partial(_normalize_host, charset="utf-8"), hosts),
+        ),
+        (
+            "normalize_port",
+            _mapped(normalize_port, [e.port for e in elements], schemes),
+        ),
+        (
+            "normalize_path",
+            _mapped(normalize_path, [e.path for e in elements], schemes),
+        ),
+        (
+            "normalize_query",
+            _mapped(lambda e: normalize_query(e.query, host=e.host), elements),
+        ),
+        (
+            "normalize_query[filtered]",
+            _mapped(
+                lambda e: normalize_query(e.query, host=e.host, filter_params=True),
+                elements,
+            ),
+        ),
+        (
+            "normalize_fragment",
+            _mapped(normalize_fragment, [e.fragment for e in elements]),
+        ),
+        ("reconstruct_url", _mapped(reconstruct_url, inputs["reconstruct_url"])),
+    ]
+    return [Benchmark(f"stage/{name}", func, len(urls)) for name, func in stages]
+
+
+def _end_to_end_benchmarks(category: str, urls: list[str]) -> list[Benchmark]:
+    """Build url_normalize and url_humanize benchmarks for a URL set."""
+
+    def run_url_normalize() -> object:
+        return [url_normalize(url) for url in urls]
+
+    def run_url_humanize() -> object:
+        return [url_humanize(url) for url in urls]
+
+    return [
+        Benchmark(f"url_normalize/{category}", run_url_normalize, len(urls)),
+        Benchmark(f"url_humanize/{category}", run_url_humanize, len(urls)),
+    ]
+
+
+def build_benchmarks() -> list[Benchmark]:
+    """Build all benchmarks over the bundled corpus.
+
+    Returns:
+        Stage benchmarks over the full corpus, followed by end-to-end
+        benchmarks per corpus category
+
+    """
+    corpus = {category: load_corpus(category) for category in CATEGORIES}
+    everything = [url for urls in corpus.values() for url in urls]
+    benchmarks = _stage_benchmarks(everything)
+    for category, urls in corpus.items():
+        benchmarks.extend(_end_to_end_benchmarks(category, urls))
+    return benchmarks
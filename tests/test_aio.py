@@ -0,0 +1,126 @@
+"""Asynchronous batch normalization tests."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import TYPE_CHECKING
+
+import pytest
+
+from url_normalize import url_normalize, url_normalize_many_async
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "",
+    None,
+    "www.foo.com:80/foo",
+    "пример.испытание/Служебная",
+    "https://www.google.com/search?q=test&utm_source=test",
+]
+
+
+async def _async_iter(values: Iterable) -> AsyncIterator:
+    for value in values:
+        await asyncio.sleep(0)
+        yield value
+
+
+async def _collect(urls: object, **kwargs: object) -> list:
+    return [url async for url in url_normalize_many_async(urls, **kwargs)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 500])
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_url_normalize_many_async_matches_url_normalize(
+    chunk_size: int,
+    concurrency: int,
+) -> None:
+    """Assert async results match url_normalize, in input order."""
+    expected = [url_normalize(url) for url in URLS]
+
+    result = asyncio.run(_collect(URLS, chunk_size=chunk_size, concurrency=concurrency))
+
+    assert result == expected
+
+
+def test_url_normalize_many_async_accepts_async_iterables() -> None:
+    """Assert async iterables and normalization options are supported."""
+    expected = [url_normalize(url, filter_params=True) for url in URLS]
+
+    result = asyncio.run(_collect(_async_iter(URLS), chunk_size=2, filter_params=True))
+
+    assert result == expected
+
+
+def test_url_normalize_many_async_uses_executor() -> None:
+    """Assert chunks run on the given executor."""
+    with ThreadPoolExecutor(1, thread_name_prefix="urls") as executor:
+        result = asyncio.run(_collect(URLS * 10, chunk_size=7, executor=executor))
+
+    assert result == [url_normalize(url) for url in URLS * 10]
+
+
+def test_url_normalize_many_async_applies_backpressure() -> None:
+    """Assert the input is read at most a few chunks ahead of the consumer."""
+    consumed = []
+
+    def urls() -> Iterable[str]:
+        for index in range(1000):
+            consumed.append(index)
+            yield f"example.com/{index}"
+
+    async def take_first() -> str | None:
+        async with aclosing(
+            url_normalize_many_async(urls(), chunk_size=10, concurrency=2)
+        ) as results:
+            first = await anext(results)
+            await asyncio.sleep(0.05)
+            return first
+
+    assert asyncio.run(take_first()) == "https://example.com/0"
+    # The consumed chunk, the chunks in flight and the one being filled
+    assert len(consumed) <= 10 * 4 + 1
+
+
+def test_url_normalize_many_async_raises_input_errors() -> None:
+    """Assert errors raised by the input are propagated to the consumer."""
+
+    def urls() -> Iterable[str]:
+        yield "example.com"
+        msg = "broken input"
+        raise OSError(msg)
+
+    with pytest.raises(OSError, match="broken input"):
+        asyncio.run(_collect(urls(), chunk_size=1))
+
+
+def test_url_normalize_many_async_raises_normalization_errors() -> None:
+    """Assert normalization errors are propagated to the consumer."""
+    with pytest.raises(ValueError, match="Invalid IPv6 URL"):
+        asyncio.run(_collect(["example.com", "http://[::1/"], chunk_size=1))
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"chunk_size": 0}, {"concurrency": 0}, {"chunk_size": -1}]
+)
+def test_url_normalize_many_async_rejects_invalid_sizes(kwargs: dict) -> None:
+    """Assert chunk_size and concurrency must be positive."""
+    with pytest.raises(ValueError, match="positive"):
+        url_normalize_many_async(URLS, **kwargs)
+
+
+def test_url_normalize_many_async_validates_options_eagerly() -> None:
+    """Assert invalid options fail before iteration starts."""
+    with pytest.raises(LookupError):
+        url_normalize_many_async(URLS, charset="no-such-charset")
+
+
+def test_url_normalize_many_async_rejects_return_bytes() -> None:
+    """Assert async results are always str URLs."""
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_normalize_many_async(URLS, return_bytes=True)
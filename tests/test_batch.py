@@ -0,0 +1,68 @@
+"""Batch normalization tests."""
+
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from url_normalize import (
+    url_normalize,
+    url_normalize_enumerate,
+    url_normalize_list,
+    url_normalize_many,
+)
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "",
+    None,
+    "www.foo.com:80/foo",
+    "пример.испытание/Служебная",
+    "https://www.google.com/search?q=test&utm_source=test",
+]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"default_scheme": "http"},
+        {"filter_params": True},
+        {"filter_params": True, "param_allowlist": ["utm_source"]},
+    ],
+)
+def test_url_normalize_many_matches_url_normalize(options: dict) -> None:
+    """Assert batch results are identical to single-URL normalization."""
+    expected = [url_normalize(url, **options) for url in URLS]
+
+    assert list(url_normalize_many(URLS, **options)) == expected
+    assert url_normalize_list(URLS, **options) == expected
+    assert list(url_normalize_enumerate(URLS, **options)) == list(enumerate(expected))
+
+
+def test_url_normalize_many_is_lazy() -> None:
+    """Assert unbounded inputs are consumed on demand."""
+    urls = itertools.cycle(["HTTP://EXAMPLE.COM"])
+
+    result = list(itertools.islice(url_normalize_many(urls), 3))
+
+    assert result == ["http://example.com/"] * 3
+
+
+def test_url_normalize_many_rejects_unknown_options() -> None:
+    """Assert options are validated before any URL is consumed."""
+    with pytest.raises(TypeError, match="unknown_option"):
+        url_normalize_many(["example.com"], unknown_option=True)
+
+
+def test_url_normalize_many_rejects_return_bytes() -> None:
+    """Assert batches only return str URLs."""
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_normalize_many(["example.com"], return_bytes=True)
+
+
+def test_url_normalize_many_rejects_unknown_charset() -> None:
+    """Assert an invalid charset fails once, up front."""
+    with pytest.raises(LookupError):
+        url_normalize_list(["example.com"], charset="no-such-charset")
@@ -0,0 +1,170 @@
+"""LRU cache tests."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from url_normalize.cache import CacheInfo, LRUCache, SizedCacheInfo, SizedLRUCache
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Assert the oldest untouched entry is evicted first."""
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3  # noqa: PLR2004
+    assert cache.info() == CacheInfo(
+        hits=3, misses=1, evictions=1, maxsize=2, currsize=2
+    )
+
+
+def test_lru_cache_resize_and_clear() -> None:
+    """Assert shrinking evicts entries and clear resets counters."""
+    cache: LRUCache[int, int] = LRUCache(10)
+    for i in range(10):
+        cache.put(i, i)
+
+    cache.resize(3)
+
+    assert cache.info().currsize == 3  # noqa: PLR2004
+    assert cache.info().evictions == 7  # noqa: PLR2004
+    assert cache.get(9) == 9  # noqa: PLR2004
+
+    cache.clear()
+
+    assert cache.info() == CacheInfo(
+        hits=0, misses=0, evictions=0, maxsize=3, currsize=0
+    )
+
+
+def test_lru_cache_zero_size_disables_caching() -> None:
+    """Assert a cache of size 0 never stores anything."""
+    cache: LRUCache[str, str] = LRUCache(0)
+    cache.put("a", "a")
+
+    assert cache.get("a") is None
+    assert cache.info().currsize == 0
+
+
+@pytest.mark.parametrize("maxsize", [-1])
+def test_lru_cache_rejects_negative_size(maxsize: int) -> None:
+    """Assert negative sizes are rejected."""
+    with pytest.raises(ValueError, match="non-negative"):
+        LRUCache(maxsize)
+    with pytest.raises(ValueError, match="non-negative"):
+        LRUCache(1).resize(maxsize)
+
+
+def test_lru_cache_concurrent_access() -> None:
+    """Assert concurrent writers keep the cache within its bound."""
+    cache: LRUCache[int, int] = LRUCache(50)
+
+    def worker(offset: int) -> None:
+        for i in range(1000):
+            cache.put(offset + i, i)
+            cache.get(offset + i // 2)
+
+    threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = cache.info()
+    assert info.currsize == 50  # noqa: PLR2004
+    assert info.hits + info.misses == 4000  # noqa: PLR2004
+
+
+def length(key: str, value: str) -> int:
+    """Size entries by the length of their key and value."""
+    return len(key) + len(value)
+
+
+def test_sized_lru_cache_evicts_by_size() -> None:
+    """Assert entries are evicted once their total size exceeds the bound."""
+    cache: SizedLRUCache[str, str] = SizedLRUCache(10, length)
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    assert cache.get("a") == "1234"
+
+    cache.put("c", "12")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1234"
+    assert cache.info() == SizedCacheInfo(
+        hits=2, misses=1, evictions=1, maxbytes=10, currbytes=8, currsize=2
+    )
+
+
+def test_sized_lru_cache_replaces_entries() -> None:
+    """Assert storing a key again replaces its size, too."""
+    cache: SizedLRUCache[str, str] = SizedLRUCache(100, length)
+    cache.put("a", "1234")
+    cache.put("a", "1")
+
+    assert cache.get("a") == "1"
+    assert cache.info().currbytes == 2  # noqa: PLR2004
+
+
+def test_sized_lru_cache_skips_large_entries() -> None:
+    """Assert entries larger than the bound are not stored."""
+    cache: SizedLRUCache[str, str] = SizedLRUCache(4, length)
+    cache.put("a", "12")
+    cache.put("b", "1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "12"
+
+
+def test_sized_lru_cache_resize_and_clear() -> None:
+    """Assert shrinking evicts entries and clear resets counters."""
+    cache: SizedLRUCache[int, str] = SizedLRUCache(100, lambda _key, _value: 10)
+    for i in range(10):
+        cache.put(i, str(i))
+    cache.get(0)
+    cache.get(10)
+
+    assert cache.info().hit_ratio == 0.5  # noqa: PLR2004
+    cache.resize(30)
+    assert cache.info().currsize == 3  # noqa: PLR2004
+    assert cache.info().evictions == 7  # noqa: PLR2004
+    cache.clear()
+    assert cache.info() == SizedCacheInfo(0, 0, 0, 30, 0, 0)
+    assert cache.info().hit_ratio == 0.0
+
+
+def test_sized_lru_cache_rejects_negative_size() -> None:
+    """Assert negative sizes are rejected."""
+    with pytest.raises(ValueError, match="non-negative"):
+        SizedLRUCache(-1, length)
+    with pytest.raises(ValueError, match="non-negative"):
+        SizedLRUCache(1, length).resize(-1)
+
+
+def test_sized_lru_cache_concurrent_access() -> None:
+    """Assert concurrent writers keep the cache within its bound."""
+    cache: SizedLRUCache[int, int] = SizedLRUCache(500, lambda _key, _value: 10)
+
+    def worker(offset: int) -> None:
+        for i in range(1000):
+            cache.put(offset + i, i)
+            cache.get(offset + i // 2)
+
+    threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = cache.info()
+    assert info.currsize == 50  # noqa: PLR2004
+    assert info.currbytes == 500  # noqa: PLR2004
+    assert info.hits + info.misses == 4000  # noqa: PLR2004
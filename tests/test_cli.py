@@ -9,6 +9,9 @@ import pytest
 from url_normalize import __version__
 from url_normalize.cli import main
 
+# Exit status of argparse usage errors
+USAGE_ERROR = 2
+
 
 def run_cli(*args: str) -> subprocess.CompletedProcess:
     """Run the CLI command with given arguments.
@@ -342,3 +345,409 @@ def test_cli_default_domain_no_effect_on_relative_paths() -> None:
     assert result.returncode == 0
     assert result.stdout.strip() == expected
     assert not result.stderr
+
+
+def run_cli_with_input(*args: str, stdin: bytes) -> subprocess.CompletedProcess:
+    """Run the CLI command feeding stdin as raw bytes.
+
+    Params:
+        *args: Command line arguments to pass to the CLI.
+        stdin: Raw bytes to send on standard input.
+
+    Returns:
+        A completed process with binary stdout and stderr.
+
+    """
+    command = [sys.executable, "-m", "url_normalize.cli", *list(args)]
+    return subprocess.run(  # noqa: S603
+        command, input=stdin, capture_output=True, check=False
+    )
+
+
+def test_cli_bulk_stdin() -> None:
+    """Test normalizing newline-delimited URLs from stdin."""
+    stdin = b"http://EXAMPLE.com/./a/../b\r\nwww.foo.com:443/foo\n\n//example.com"
+
+    result = run_cli_with_input("--input", "-", stdin=stdin)
+
+    assert result.returncode == 0
+    assert result.stdout.decode().split("\n") == [
+        "http://example.com/b",
+        "https://www.foo.com/foo",
+        "",
+        "https://example.com/",
+        "",
+    ]
+    assert not result.stderr
+
+
+def test_cli_bulk_file(tmp_path) -> None:
+    """Test normalizing URLs read from a file, with options applied."""
+    path = tmp_path / "urls.txt"
+    path.write_text("google.com?q=1&utm_source=x\n/images/logo.png\n")
+
+    result = run_cli("-f", "-d", "example.com", "-i", str(path))
+
+    assert result.returncode == 0
+    assert result.stdout.splitlines() == [
+        "https://google.com/?q=1",
+        "https://example.com/images/logo.png",
+    ]
+
+
+def test_cli_bulk_null_delimiters() -> None:
+    """Test NUL-delimited input and output."""
+    stdin = b"EXAMPLE.com/a\nb c\x00example.org"
+
+    result = run_cli_with_input("-0", "-i", "-", stdin=stdin)
+
+    assert result.returncode == 0
+    assert result.stdout == b"https://example.com/ab%20c\x00https://example.org/\x00"
+
+
+def test_cli_bulk_humanize() -> None:
+    """Test humanized output in bulk mode."""
+    stdin = b"https://xn--e1afmkfd.xn--80akhbyknj4f/\n"
+
+    result = run_cli_with_input("-H", "-i", "-", stdin=stdin)
+
+    assert result.returncode == 0
+    assert result.stdout.decode() == "https://пример.испытание/\n"
+
+
+def test_cli_bulk_continues_after_errors() -> None:
+    """Test failing lines are reported with their line number and skipped."""
+    stdin = b"example.com\nhttp://[::1/\nexample.org\n"
+
+    result = run_cli_with_input("-i", "-", stdin=stdin)
+
+    assert result.returncode == 1
+    assert result.stdout.decode().splitlines() == [
+        "https://example.com/",
+        "https://example.org/",
+    ]
+    assert "<stdin>:2: Error normalizing URL" in result.stderr.decode()
+
+
+def test_cli_bulk_output_is_buffered(capsys, monkeypatch, tmp_path) -> None:
+    """Test large inputs are written out in several buffered chunks."""
+    path = tmp_path / "urls.txt"
+    path.write_text("example.com/page\n" * 5000)
+    monkeypatch.setattr("sys.argv", ["url-normalize", "-i", str(path)])
+
+    main()
+
+    captured = capsys.readouterr()
+    assert captured.out == "https://example.com/page\n" * 5000
+
+
+def test_cli_bulk_missing_file() -> None:
+    """Test a readable error when the input file does not exist."""
+    result = run_cli("-i", "/nonexistent/urls.txt")
+
+    assert result.returncode == USAGE_ERROR
+    assert "argument -i/--input" in result.stderr
+
+
+def test_cli_url_and_input_are_exclusive() -> None:
+    """Test a URL argument cannot be combined with --input."""
+    result = run_cli("-i", "-", "example.com")
+
+    assert result.returncode == USAGE_ERROR
+    assert "not allowed with argument -i/--input" in result.stderr
+
+
+def test_cli_bulk_parallel_jobs() -> None:
+    """Test parallel bulk mode keeps input order and reports errors."""
+    urls = [f"EXAMPLE.com/{i}" for i in range(50)]
+    stdin = "\n".join([*urls[:10], "http://[::1/", *urls[10:]]).encode()
+
+    result = run_cli_with_input("-j", "2", "-i", "-", stdin=stdin)
+
+    assert result.returncode == 1
+    assert result.stdout.decode().splitlines() == [
+        f"https://example.com/{i}" for i in range(50)
+    ]
+    assert "<stdin>:11: Error normalizing URL" in result.stderr.decode()
+
+
+@pytest.mark.parametrize("null", [False, True])
+def test_cli_file_ranges(tmp_path, null: bool) -> None:  # noqa: FBT001
+    """Test parallel file mode merges the ranges in order with file:line errors."""
+    delimiter = "\0" if null else "\n"
+    urls = [f"EXAMPLE.com/{i}" for i in range(50)]
+    path = tmp_path / "urls.txt"
+    path.write_text(delimiter.join([*urls[:10], "http://[::1/", *urls[10:]]))
+    args = ["-0"] if null else []
+
+    result = run_cli(*args, "-j", "3", "-i", str(path))
+
+    assert result.returncode == 1
+    assert result.stdout.split(delimiter) == [
+        *(f"https://example.com/{i}" for i in range(50)),
+        "",
+    ]
+    assert f"{path}:11: Error normalizing URL" in result.stderr
+
+
+def test_cli_file_ranges_check(tmp_path) -> None:
+    """Test --check in parallel file mode."""
+    path = tmp_path / "urls.txt"
+    path.write_text("https://example.com/\nEXAMPLE.com\nhttps://example.org/\n")
+
+    result = run_cli("-C", "-j", "2", "-i", str(path))
+
+    assert result.returncode == 1
+    assert result.stdout == "EXAMPLE.com\n"
+
+
+def test_cli_shard_dir(tmp_path) -> None:
+    """Test --shard-dir leaves one output file per range."""
+    path = tmp_path / "urls.txt"
+    path.write_text("".join(f"EXAMPLE.com/{i}\n" for i in range(20)))
+    shard_dir = tmp_path / "shards"
+    shard_dir.mkdir()
+
+    result = run_cli("-j", "2", "--shard-dir", str(shard_dir), "-i", str(path))
+
+    assert result.returncode == 0
+    assert not result.stdout
+    shards = sorted(shard_dir.iterdir())
+    assert [shard.name for shard in shards] == ["part-00000", "part-00001"]
+    assert "".join(shard.read_text() for shard in shards).splitlines() == [
+        f"https://example.com/{i}" for i in range(20)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (["-i", "-"], "requires -j/--jobs and a regular -i/--input FILE"),
+        (["-j", "1", "-i", "FILE"], "requires -j/--jobs"),
+        (["-j", "2", "-u", "-i", "FILE"], "not allowed with argument -u/--dedupe"),
+        (["-j", "2", "-i", "FILE", "--shard-dir", "/nonexistent"], "not a directory"),
+    ],
+)
+def test_cli_shard_dir_invalid_arguments(tmp_path, args, message) -> None:
+    """Test invalid --shard-dir combinations are rejected."""
+    path = tmp_path / "urls.txt"
+    path.write_text("example.com\n")
+    args = [str(path) if arg == "FILE" else arg for arg in args]
+    if "--shard-dir" not in args:
+        args += ["--shard-dir", str(tmp_path)]
+
+    result = run_cli(*args)
+
+    assert result.returncode == USAGE_ERROR
+    assert f"argument --shard-dir: {message}" in result.stderr
+
+
+def test_cli_negative_jobs() -> None:
+    """Test negative job counts are rejected."""
+    result = run_cli("-j", "-1", "-i", "-")
+
+    assert result.returncode == USAGE_ERROR
+    assert "argument -j/--jobs" in result.stderr
+
+
+def test_cli_check_lists_non_normalized_urls() -> None:
+    """Test --check prints only the URLs that are not normalized."""
+    stdin = b"https://example.com/\nHTTP://example.com/\n\nhttps://example.com/a%2fb\n"
+
+    result = run_cli_with_input("--check", "-i", "-", stdin=stdin)
+
+    assert result.returncode == 1
+    assert result.stdout.decode().splitlines() == [
+        "HTTP://example.com/",
+        "https://example.com/a%2fb",
+    ]
+
+
+def test_cli_check_all_normalized() -> None:
+    """Test --check succeeds silently when every URL is normalized."""
+    stdin = b"https://example.com/\nmailto:a@example.com\n"
+
+    result = run_cli_with_input("-C", "-j", "2", "-i", "-", stdin=stdin)
+
+    assert result.returncode == 0
+    assert not result.stdout
+
+
+def test_cli_check_respects_options() -> None:
+    """Test --check compares against normalization with the given options."""
+    url = "https://google.com/?q=1&utm_source=x"
+
+    assert run_cli("--check", url).returncode == 0
+    result = run_cli("--check", "-f", url)
+
+    assert result.returncode == 1
+    assert result.stdout.strip() == url
+
+
+def test_cli_check_and_humanize_are_exclusive() -> None:
+    """Test --check cannot be combined with --humanize."""
+    result = run_cli("--check", "-H", "https://example.com/")
+
+    assert result.returncode != 0
+    assert "not allowed with argument -H/--humanize" in result.stderr
+
+
+def test_cli_query_order() -> None:
+    """Test --sort-params and --collapse-params reorder the query."""
+    url = "example.com/?b=2&a=1&b=2&a=0"
+
+    result = run_cli("--sort-params", "--collapse-params", url)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "https://example.com/?a=1&a=0&b=2"
+    result = run_cli("--sort-params", "--sort-param-values", url)
+    assert result.stdout.strip() == "https://example.com/?a=0&a=1&b=2&b=2"
+
+
+def test_cli_strip_tracking() -> None:
+    """Test --strip-tracking removes denylisted parameters."""
+    url = "example.com/?utm_source=a&id=1&ref=2"
+
+    result = run_cli("-t", url)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "https://example.com/?id=1&ref=2"
+    result = run_cli("-t", "--param-denylist", "ref,utm*", url)
+    assert result.stdout.strip() == "https://example.com/?id=1"
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        ((), "https://example.com/?q=1"),
+        (("-H",), "https://example.com/?q=1"),
+        # Not normalized under the rules, so listed by --check
+        (("-C",), "https://example.com/?q=1&ref=2&id=3"),
+    ],
+)
+def test_cli_rules(tmp_path, args, expected) -> None:
+    """Test --rules reads the allowlist and denylist from a file."""
+    rules = tmp_path / "rules.json"
+    rules.write_text(
+        '{"allowlist": {"example.com": ["q", "ref"]}, "denylist": ["ref"]}'
+    )
+
+    result = run_cli(
+        "--rules", str(rules), "-f", "-t", *args, "https://example.com/?q=1&ref=2&id=3"
+    )
+
+    assert result.stdout.strip() == expected
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (("--rules", "missing.json"), "argument --rules: [Errno 2]"),
+        (("--rules", "r.json", "-p", "q"), "not allowed with argument -p"),
+        (("--rules", "r.json", "--param-denylist", "q"), "not allowed with"),
+    ],
+)
+def test_cli_rules_invalid_arguments(tmp_path, args, message) -> None:
+    """Test --rules errors are reported as usage errors."""
+    (tmp_path / "r.json").write_text("{}")
+    args = tuple(str(tmp_path / arg) if arg.endswith(".json") else arg for arg in args)
+
+    result = run_cli(*args, "https://example.com/")
+
+    assert result.returncode == USAGE_ERROR
+    assert message in result.stderr
+
+
+def test_cli_sort_param_values_requires_sort_params() -> None:
+    """Test --sort-param-values is rejected without --sort-params."""
+    result = run_cli("--sort-param-values", "https://example.com/")
+
+    assert result.returncode != 0
+    assert "requires --sort-params" in result.stderr
+
+
+@pytest.mark.parametrize("args", [(), ("--bloom", "1000"), ("-j", "2")])
+def test_cli_dedupe(args) -> None:
+    """Test --dedupe prints the first URL of each normalized form, as given."""
+    stdin = b"EXAMPLE.com/a\nhttps://example.com/a\nexample.org\n\nexample.com/a\n"
+
+    result = run_cli_with_input("--dedupe", *args, "-i", "-", stdin=stdin)
+
+    assert result.returncode == 0
+    assert result.stdout.decode().split("\n") == [
+        "EXAMPLE.com/a",
+        "example.org",
+        "",
+        "",
+    ]
+    assert "5 URLs, 3 unique, 2 duplicates removed" in result.stderr.decode()
+
+
+def test_cli_dedupe_requires_input() -> None:
+    """Test --dedupe is only available in bulk mode."""
+    result = run_cli("--dedupe", "example.com")
+
+    assert result.returncode == USAGE_ERROR
+    assert "requires -i/--input" in result.stderr
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (("--bloom", "10"), "argument --bloom: requires -u/--dedupe"),
+        (("-u", "--bloom", "0"), "capacity must be a positive integer"),
+        (("-u", "--bloom", "10", "--error-rate", "2"), "error_rate must be between"),
+        (("-u", "--check"), "not allowed with argument -C/--check"),
+    ],
+)
+def test_cli_dedupe_invalid_arguments(args, message) -> None:
+    """Test invalid deduplication arguments are rejected."""
+    result = run_cli(*args, "-i", "-")
+
+    assert result.returncode == USAGE_ERROR
+    assert message in result.stderr
+
+
+def test_cli_stats() -> None:
+    """Test --stats prints per-stage statistics on stderr."""
+    stdin = b"example.com\ngoogle.com/?q=1&utm_source=x\n"
+
+    result = run_cli_with_input("--stats", "-f", "-i", "-", stdin=stdin)
+
+    assert result.returncode == 0
+    assert result.stdout.decode().splitlines() == [
+        "https://example.com/",
+        "https://google.com/?q=1",
+    ]
+    stderr = result.stderr.decode()
+    assert stderr.startswith("2 URLs, 1 in 1 timed\n")
+    assert "normalize_host " in stderr
+    assert "param_dropped: 1" in stderr
+
+
+def test_cli_stats_sample(capsys, monkeypatch) -> None:
+    """Test --stats-sample times 1 in N URLs, also for a single URL."""
+    monkeypatch.setattr(
+        "sys.argv", ["url-normalize", "--stats", "--stats-sample", "5", "a.com"]
+    )
+
+    main()
+
+    captured = capsys.readouterr()
+    assert captured.out == "https://a.com/\n"
+    assert captured.err.startswith("1 URLs, 1 in 5 timed\n")
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (("--stats", "-j", "2"), "argument --stats: not allowed with"),
+        (("--stats", "--stats-sample", "0"), "must be a positive integer"),
+    ],
+)
+def test_cli_stats_invalid_arguments(args, message) -> None:
+    """Test invalid --stats arguments are rejected."""
+    result = run_cli(*args, "-i", "-")
+
+    assert result.returncode == USAGE_ERROR
+    assert message in result.stderr
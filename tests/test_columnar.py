@@ -0,0 +1,172 @@
+"""Columnar normalization tests."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from url_normalize import url_normalize, url_normalize_array
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "www.foo.com:80/foo",
+    "пример.испытание/Служебная",
+    "https://www.google.com/search?q=test&utm_source=test",
+    "",
+    "http://EXAMPLE.com/./path/../other/",
+    "www.foo.com:80/foo",
+]
+OPTIONS = [{}, {"default_scheme": "http", "filter_params": True}]
+
+
+def _expected(values: list, **options: Any) -> list:  # noqa: ANN401
+    return [url_normalize(url, **options) for url in values]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_numpy_object_array(options):
+    """Object arrays keep None and match url_normalize value by value."""
+    np = pytest.importorskip("numpy")
+    values = [*URLS, None]
+    result = url_normalize_array(np.array(values, dtype=object), **options)
+
+    assert result.dtype == object
+    assert result.tolist() == _expected(values, **options)
+
+
+def test_numpy_string_array_is_widened():
+    """Fixed-width string arrays are widened to fit the normalized URLs."""
+    np = pytest.importorskip("numpy")
+    values = np.array(["EXAMPLE.com", "", "EXAMPLE.com"])
+    result = url_normalize_array(values)
+
+    assert result.dtype.kind == "U"
+    assert result.tolist() == _expected(values.tolist())
+
+
+def test_numpy_keeps_shape():
+    """Multidimensional arrays keep their shape."""
+    np = pytest.importorskip("numpy")
+    values = np.array(URLS[:6], dtype=object).reshape(2, 3)
+    result = url_normalize_array(values)
+
+    assert result.shape == (2, 3)
+    assert result.ravel().tolist() == _expected(URLS[:6])
+
+
+def test_numpy_variable_width_string_array():
+    """NumPy 2 variable-width string arrays keep their dtype."""
+    np = pytest.importorskip("numpy")
+    if not hasattr(np.dtypes, "StringDType"):
+        pytest.skip("requires numpy.dtypes.StringDType")
+    values = np.array(URLS, dtype=np.dtypes.StringDType())
+    result = url_normalize_array(values)
+
+    assert result.dtype == values.dtype
+    assert result.tolist() == _expected(URLS)
+
+
+def test_numpy_empty_array():
+    """Empty arrays are returned empty."""
+    np = pytest.importorskip("numpy")
+    assert url_normalize_array(np.array([], dtype=object)).tolist() == []
+    assert url_normalize_array(np.array([], dtype=str)).tolist() == []
+
+
+def test_numpy_unsupported_dtype():
+    """Numeric arrays are rejected."""
+    np = pytest.importorskip("numpy")
+    with pytest.raises(TypeError, match="dtype"):
+        url_normalize_array(np.arange(3))
+
+
+def test_numpy_normalizes_distinct_values_once(monkeypatch):
+    """Repeated URLs are normalized once."""
+    np = pytest.importorskip("numpy")
+    from url_normalize import columnar
+
+    calls = []
+    normalize_unique = columnar._normalize_unique  # noqa: SLF001
+
+    def spy(normalizer, uniques) -> list:
+        calls.append(list(uniques))
+        return normalize_unique(normalizer, uniques)
+
+    monkeypatch.setattr(columnar, "_normalize_unique", spy)
+    url_normalize_array(np.array(["a.com", "b.com"] * 1000, dtype=object))
+
+    assert calls == [["a.com", "b.com"]]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("type_name", ["string", "large_string", "string_view"])
+def test_arrow_array(options, type_name):
+    """Arrow string arrays keep their type and nulls."""
+    pa = pytest.importorskip("pyarrow")
+    values = [*URLS, None]
+    array = pa.array(values, type=getattr(pa, type_name)())
+    result = url_normalize_array(array, **options)
+
+    assert result.type == array.type
+    assert result.to_pylist() == _expected(values, **options)
+
+
+def test_arrow_chunked_array():
+    """Chunked arrays are factorized across chunks."""
+    pa = pytest.importorskip("pyarrow")
+    array = pa.chunked_array([URLS[:3], [None, *URLS[3:]]])
+    result = url_normalize_array(array)
+
+    assert isinstance(result, pa.ChunkedArray)
+    assert result.type == array.type
+    assert result.to_pylist() == _expected(array.to_pylist())
+
+
+def test_arrow_dictionary_array():
+    """Dictionary-encoded arrays keep their indices."""
+    pa = pytest.importorskip("pyarrow")
+    array = pa.array([*URLS, None]).dictionary_encode()
+    result = url_normalize_array(array)
+
+    assert pa.types.is_dictionary(result.type)
+    assert result.indices == array.indices
+    assert result.to_pylist() == _expected(array.to_pylist())
+
+
+def test_arrow_chunked_dictionary_array():
+    """Chunked dictionary-encoded arrays are normalized chunk by chunk."""
+    pa = pytest.importorskip("pyarrow")
+    array = pa.chunked_array(
+        [pa.array(URLS[:3]).dictionary_encode(), pa.array(URLS[3:]).dictionary_encode()]
+    )
+    result = url_normalize_array(array)
+
+    assert result.num_chunks == 2  # noqa: PLR2004
+    assert result.to_pylist() == _expected(URLS)
+
+
+def test_arrow_unsupported_type():
+    """Non-string arrays are rejected."""
+    pa = pytest.importorskip("pyarrow")
+    with pytest.raises(TypeError, match="type int64"):
+        url_normalize_array(pa.array([1, 2]))
+
+
+def test_unsupported_container():
+    """Plain Python sequences are rejected."""
+    with pytest.raises(TypeError, match="NumPy or PyArrow array"):
+        url_normalize_array(URLS)
+
+
+def test_unknown_option():
+    """Options are validated like url_normalize does."""
+    with pytest.raises(TypeError):
+        url_normalize_array(URLS, unknown=True)
+
+
+def test_return_bytes_is_rejected():
+    """Arrays are always normalized into str URLs."""
+    np = pytest.importorskip("numpy")
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_normalize_array(np.array(URLS, dtype=object), return_bytes=True)
@@ -0,0 +1,136 @@
+"""Streaming deduplication tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from url_normalize.dedupe import (
+    BloomFilter,
+    DedupeStats,
+    Deduplicator,
+    ExactFilter,
+    url_dedupe,
+)
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "www.foo.com:443/foo",
+    "http://example.com/other/",
+    "",
+    "https://www.foo.com/foo",
+    None,
+    "https://www.google.com/search?q=test&utm_source=test",
+]
+
+
+@pytest.mark.parametrize("mode", ["exact", "bloom"])
+def test_url_dedupe_keeps_first_of_each_normalized_form(mode):
+    """The first URL of each normalized form is yielded as given."""
+    stats = DedupeStats()
+
+    result = list(url_dedupe(URLS, mode=mode, capacity=1000, stats=stats))
+
+    assert result == [
+        "http://EXAMPLE.com/./path/../other/",
+        "www.foo.com:443/foo",
+        "",
+        "https://www.google.com/search?q=test&utm_source=test",
+    ]
+    assert (stats.total, stats.unique, stats.duplicates) == (7, 4, 3)
+
+
+def test_url_dedupe_applies_options():
+    """Normalization options decide which URLs are duplicates."""
+    urls = ["google.com/?q=1&utm_source=a", "google.com/?q=1&utm_source=b"]
+
+    assert list(url_dedupe(urls)) == urls
+    assert list(url_dedupe(urls, filter_params=True)) == urls[:1]
+
+
+def test_url_dedupe_is_lazy():
+    """URLs are consumed one at a time."""
+    stats = DedupeStats()
+    result = url_dedupe(iter(["a.com", "A.COM", "b.com"]), stats=stats)
+
+    assert next(result) == "a.com"
+    assert stats.total == 1
+    assert next(result) == "b.com"
+    assert stats.duplicates == 1
+
+
+def test_url_dedupe_validates_eagerly():
+    """Invalid arguments fail before any URL is consumed."""
+    with pytest.raises(ValueError, match="mode must be one of"):
+        url_dedupe(URLS, mode="fuzzy")
+    with pytest.raises(TypeError):
+        url_dedupe(URLS, unknown=True)
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_dedupe(URLS, return_bytes=True)
+
+
+def test_exact_filter():
+    """The exact filter reports each key as new once."""
+    seen = ExactFilter()
+
+    assert seen.add("a")
+    assert not seen.add("a")
+    assert seen.add("b")
+    assert "a" in seen
+    assert "c" not in seen
+    assert len(seen) == 2  # noqa: PLR2004
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Every added key is reported present."""
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"https://example.com/{i}" for i in range(1000)]
+
+    assert sum(bloom.add(key) for key in keys) >= 990  # noqa: PLR2004
+    assert all(key in bloom for key in keys)
+    assert not any(bloom.add(key) for key in keys)
+
+
+def test_bloom_filter_false_positive_rate():
+    """False positives stay close to the target rate at capacity."""
+    bloom = BloomFilter(10_000, 0.01)
+    for i in range(10_000):
+        bloom.add(f"https://example.com/{i}")
+
+    false_positives = sum(f"https://example.org/{i}" in bloom for i in range(10_000))
+
+    assert false_positives < 200  # noqa: PLR2004
+    assert bloom.false_positive_rate() == pytest.approx(0.01, rel=0.2)
+
+
+def test_bloom_filter_size():
+    """The filter is sized from the capacity and error rate."""
+    bloom = BloomFilter(1_000_000, 0.001)
+
+    assert bloom.hash_count == 10  # noqa: PLR2004
+    assert 1_700_000 < bloom.nbytes < 1_900_000  # noqa: PLR2004
+
+
+def test_bloom_filter_handles_surrogates():
+    """Keys that are not valid UTF-8 can still be hashed."""
+    bloom = BloomFilter(10)
+
+    assert bloom.add("https://example.com/\udcff")
+    assert "https://example.com/\udcff" in bloom
+
+
+@pytest.mark.parametrize(
+    ("capacity", "error_rate"), [(0, 0.01), (10, 0), (10, 1), (10, -0.5)]
+)
+def test_bloom_filter_invalid_parameters(capacity, error_rate):
+    """Capacity must be positive and the error rate between 0 and 1."""
+    with pytest.raises(ValueError, match="must be"):
+        BloomFilter(capacity, error_rate)
+
+
+def test_deduplicator_counts_empty_values_once():
+    """None and the empty string are the same empty key."""
+    deduplicator = Deduplicator()
+
+    assert deduplicator.add(None)
+    assert not deduplicator.add("")
+    assert repr(deduplicator.stats) == "DedupeStats(total=2, unique=1, duplicates=1)"
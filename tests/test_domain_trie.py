@@ -0,0 +1,36 @@
+"""Domain trie tests."""
+
+from __future__ import annotations
+
+from url_normalize.domain_trie import DomainTrie
+
+
+def test_lookup_uses_closest_listed_parent() -> None:
+    """Assert hosts get the value of their closest listed parent domain."""
+    trie: DomainTrie[str] = DomainTrie()
+    trie.add("Example.com.", "example")
+    trie.add("a.b.example.com", "a.b")
+
+    assert trie.lookup("example.com") == "example"
+    assert trie.lookup("WWW.example.com.:8080") == "example"
+    assert trie.lookup("b.example.com") == "example"
+    assert trie.lookup("x.a.b.example.com") == "a.b"
+    assert trie.lookup("example.org") is None
+    assert trie.lookup("com") is None
+
+
+def test_inherit_combines_parent_values() -> None:
+    """Assert inherited values combine every listed parent domain."""
+    trie: DomainTrie[list[str]] = DomainTrie()
+    trie.add("example.com", ["a"])
+    trie.add("x.y.example.com", ["b"])
+    trie.add("example.org", ["c"])
+
+    combined = trie.inherit(lambda parent, value: (*parent, *value), ("root",))
+
+    assert combined.lookup("x.y.example.com") == ("root", "a", "b")
+    assert combined.lookup("y.example.com") == ("root", "a")
+    assert combined.lookup("example.org") == ("root", "c")
+    assert combined.lookup("example.net") is None
+    assert combined
+    assert not DomainTrie()
@@ -0,0 +1,147 @@
+"""Memory-mapped file range normalization tests."""
+
+from __future__ import annotations
+
+from itertools import pairwise
+from pathlib import Path
+
+import pytest
+
+from url_normalize import file_ranges, url_normalize
+from url_normalize.file_ranges import (
+    copy_shard,
+    iter_records,
+    normalize_file_ranges,
+    split_ranges,
+)
+
+DATA = b"a\nbb\n\nccc\r\ndddd\ne"
+URL_COUNT = 60
+# Line number of the URL that fails to normalize
+FAILING_LINE = 31
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 5, 100])
+@pytest.mark.parametrize("delimiter", [b"\n", b"\0"])
+def test_split_ranges_cover_data(parts: int, delimiter: bytes) -> None:
+    """Assert ranges are contiguous, non-empty and end on a delimiter."""
+    data = DATA.replace(b"\n", delimiter)
+
+    ranges = split_ranges(data, parts, delimiter)
+
+    assert 1 <= len(ranges) <= parts
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in pairwise(ranges):
+        assert end == start
+        assert data[end - 1 : end] == delimiter
+    assert all(start < end for start, end in ranges)
+
+
+def test_split_ranges_long_record() -> None:
+    """Assert a record longer than a range is not split."""
+    data = b"x" * 100 + b"\ny\n"
+
+    assert split_ranges(data, 4) == [(0, 101), (101, 103)]
+
+
+def test_split_ranges_rejects_no_parts() -> None:
+    """Assert at least one range is requested."""
+    with pytest.raises(ValueError, match="parts"):
+        split_ranges(DATA, 0)
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 5])
+def test_iter_records_matches_lines(parts: int) -> None:
+    """Assert records of all ranges are the lines of the data, in order."""
+    records = [
+        record
+        for start, end in split_ranges(DATA, parts)
+        for record in iter_records(DATA, start, end)
+    ]
+
+    assert records == [b"a", b"bb", b"", b"ccc", b"dddd", b"e"]
+
+
+def test_iter_records_reads_blocks(monkeypatch) -> None:
+    """Assert records spanning several blocks are read whole."""
+    monkeypatch.setattr(file_ranges, "BLOCK_SIZE", 3)
+    data = b"abcdefgh\n\nij\nk\n"
+
+    assert list(iter_records(data, 0, len(data))) == [b"abcdefgh", b"", b"ij", b"k"]
+
+
+def test_iter_records_null_delimiter() -> None:
+    """Assert NUL-delimited records keep carriage returns and newlines."""
+    data = b"a\r\n\0\0b"
+
+    assert list(iter_records(data, 0, len(data), b"\0")) == [b"a\r\n", b"", b"b"]
+
+
+@pytest.fixture
+def urls_file(tmp_path) -> str:
+    """Write a file of URLs with a failing one on FAILING_LINE."""
+    lines = [f"EXAMPLE.com/{i}" for i in range(URL_COUNT)]
+    lines[FAILING_LINE - 1] = "http://[::1/"
+    path = tmp_path / "urls.txt"
+    path.write_bytes("\n".join(lines).encode() + b"\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_normalize_file_ranges(urls_file: str, tmp_path, jobs: int) -> None:
+    """Assert shards hold the results in order and errors have line numbers."""
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    results = list(
+        normalize_file_ranges(url_normalize, urls_file, str(output_dir), jobs=jobs)
+    )
+
+    assert [result.range_index for result in results] == list(range(len(results)))
+    assert sum(result.records for result in results) == URL_COUNT
+    assert [error for result in results for error in result.errors] == [
+        (FAILING_LINE, "Invalid IPv6 URL")
+    ]
+    output = b"".join(
+        (output_dir / Path(result.path).name).read_bytes() for result in results
+    )
+    expected = [
+        f"https://example.com/{i}" for i in range(URL_COUNT) if i != FAILING_LINE - 1
+    ]
+    assert output.decode().splitlines() == expected
+
+
+def keep_odd(url: str) -> str | None:
+    """Return URLs ending with an odd digit, None for the others."""
+    return url if url[-1] in "13579" else None
+
+
+def test_normalize_file_ranges_check(urls_file: str, tmp_path) -> None:
+    """Assert check mode only writes non-None results."""
+    results = list(
+        normalize_file_ranges(keep_odd, urls_file, str(tmp_path), jobs=2, check=True)
+    )
+
+    assert sum(result.written for result in results) == URL_COUNT // 2
+
+
+def test_normalize_file_ranges_empty_file(tmp_path) -> None:
+    """Assert an empty file gives no ranges."""
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    assert list(normalize_file_ranges(url_normalize, str(path), str(tmp_path))) == []
+
+
+def test_copy_shard(tmp_path) -> None:
+    """Assert a shard is appended to the stream and removed."""
+    shard = tmp_path / "part-00000"
+    shard.write_bytes(b"a\nb\n")
+    output = tmp_path / "output"
+
+    with output.open("wb") as stream:
+        copy_shard(str(shard), stream)
+
+    assert output.read_bytes() == b"a\nb\n"
+    assert not shard.exists()
@@ -0,0 +1,101 @@
+"""URL fingerprint tests."""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from url_normalize import (
+    NORMALIZATION_RULES_VERSION,
+    url_fingerprint,
+    url_fingerprint_many,
+)
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "www.foo.com:443/foo",
+    "",
+    None,
+    "пример.испытание/Служебная",
+]
+
+
+def test_fingerprint_is_stable():
+    """Fingerprints are pinned for the current rules version.
+
+    A failure here means fingerprints changed: bump
+    NORMALIZATION_RULES_VERSION and update the expected values.
+    """
+    assert NORMALIZATION_RULES_VERSION == 1
+    assert url_fingerprint("https://example.com/") == 6569277382839056736  # noqa: PLR2004
+    assert (
+        url_fingerprint("https://example.com/", bits=128)
+        == 0xF1A54267FCE1FDD2C2E15CCAED73EDFB  # noqa: PLR2004
+    )
+
+
+def test_fingerprint_of_normalized_form():
+    """URLs with the same normalized form have the same fingerprint."""
+    assert url_fingerprint("EXAMPLE.com:443") == url_fingerprint("https://example.com/")
+    assert url_fingerprint("example.com") != url_fingerprint("example.org")
+    assert url_fingerprint(None) == url_fingerprint("")
+
+
+def test_fingerprint_width():
+    """Fingerprints fit their width."""
+    for url in URLS:
+        assert 0 <= url_fingerprint(url) < 2**64
+        assert 0 <= url_fingerprint(url, bits=128) < 2**128
+
+
+def test_fingerprint_applies_options():
+    """Normalization options are applied before hashing."""
+    url = "google.com/?q=1&utm_source=a"
+
+    assert url_fingerprint(url, filter_params=True) == url_fingerprint(
+        "google.com/?q=1"
+    )
+    assert url_fingerprint(url) != url_fingerprint("google.com/?q=1")
+
+
+@pytest.mark.parametrize("bits", [0, 32, 256])
+def test_fingerprint_invalid_bits(bits):
+    """Only 64 and 128 bit fingerprints are supported."""
+    with pytest.raises(ValueError, match="bits must be 64 or 128"):
+        url_fingerprint("example.com", bits=bits)
+    with pytest.raises(ValueError, match="bits must be 64 or 128"):
+        url_fingerprint_many([], bits=bits)
+
+
+def test_fingerprint_rejects_return_bytes():
+    """Fingerprints hash str results, so return_bytes is rejected."""
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_fingerprint("www.foo.com", return_bytes=True)
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_fingerprint_many(["www.foo.com"], return_bytes=True)
+
+
+def test_fingerprint_many_64():
+    """64-bit batch fingerprints are an array('Q') of url_fingerprint values."""
+    result = url_fingerprint_many(iter(URLS))
+
+    assert isinstance(result, array)
+    assert result.typecode == "Q"
+    assert result.tolist() == [url_fingerprint(url) for url in URLS]
+
+
+def test_fingerprint_many_128():
+    """128-bit batch fingerprints are packed big-endian bytes."""
+    result = url_fingerprint_many(URLS, bits=128)
+
+    assert isinstance(result, bytes)
+    assert [
+        int.from_bytes(result[i : i + 16], "big") for i in range(0, len(result), 16)
+    ] == [url_fingerprint(url, bits=128) for url in URLS]
+
+
+def test_fingerprint_many_empty():
+    """Empty inputs give empty buffers."""
+    assert url_fingerprint_many([]) == array("Q")
+    assert url_fingerprint_many([], bits=128) == b""
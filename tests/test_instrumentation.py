@@ -0,0 +1,187 @@
+"""Instrumentation tests."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from url_normalize import Normalizer, instrumentation, url_humanize, url_normalize
+from url_normalize.normalize_host import host_cache_clear, normalize_host
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+PIPELINE_STAGES = [
+    "provide_url_domain",
+    "provide_url_scheme",
+    "generic_url_cleanup",
+    "deconstruct_url",
+    "normalize_scheme",
+    "normalize_userinfo",
+    "normalize_host",
+    "normalize_port",
+    "normalize_path",
+    "normalize_query",
+    "normalize_fragment",
+    "reconstruct_url",
+    "url_normalize",
+]
+
+
+@pytest.fixture(autouse=True)
+def _disable_instrumentation() -> Iterator[None]:
+    """Disable instrumentation after each test."""
+    yield
+    instrumentation.disable()
+
+
+def test_disabled_by_default():
+    """Nothing is recorded unless instrumentation is enabled."""
+    assert not instrumentation.is_enabled()
+    url_normalize("www.foo.com:80/foo")
+
+    assert instrumentation.active is None
+
+
+def test_records_every_stage():
+    """Each stage is counted once per normalization, in pipeline order."""
+    instrumentation.enable()
+    for _ in range(3):
+        url_normalize("www.foo.com:80/foo?q=1")
+    url_normalize("")
+    url_normalize(None)
+
+    stats = instrumentation.snapshot()
+
+    assert stats["calls"] == 3  # noqa: PLR2004
+    assert list(stats["stages"]) == PIPELINE_STAGES
+    for summary in stats["stages"].values():
+        assert summary["count"] == 3  # noqa: PLR2004
+        assert 0 < summary["p50_us"] <= summary["p99_us"] <= summary["max_us"]
+        assert summary["total_s"] > 0
+    total = stats["stages"]["url_normalize"]["total_s"]
+    assert total >= stats["stages"]["deconstruct_url"]["total_s"]
+
+
+def test_results_are_unchanged():
+    """Instrumented normalization returns the same results."""
+    urls = ["www.foo.com:80/foo", "google.com/?q=1&utm_source=x", "/a", "#!x"]
+    expected = [url_normalize(url, filter_params=True) for url in urls]
+    instrumentation.enable()
+
+    assert [url_normalize(url, filter_params=True) for url in urls] == expected
+
+
+def test_skip_normalized_is_timed():
+    """The fast check is timed as its own stage."""
+    instrumentation.enable()
+    normalize = Normalizer(skip_normalized=True)
+
+    assert normalize("https://example.com/") == "https://example.com/"
+    assert normalize("EXAMPLE.com") == "https://example.com/"
+
+    stages = instrumentation.snapshot()["stages"]
+    assert stages["is_normalized"]["count"] == 2  # noqa: PLR2004
+    assert stages["url_normalize"]["count"] == 2  # noqa: PLR2004
+    assert stages["deconstruct_url"]["count"] == 1
+
+
+def test_sampling():
+    """Only 1 in N normalizations are timed, starting with the first."""
+    instrumentation.enable(sample_rate=4)
+    for i in range(10):
+        url_normalize(f"example.com/{i}")
+
+    stats = instrumentation.snapshot()
+
+    assert stats["calls"] == 10  # noqa: PLR2004
+    assert stats["sample_rate"] == 4  # noqa: PLR2004
+    assert stats["stages"]["url_normalize"]["count"] == 3  # noqa: PLR2004
+
+
+def test_reservoir_is_bounded():
+    """Percentiles come from a bounded sample, counts are exact."""
+    recorder = instrumentation.enable(reservoir_size=8)
+    for i in range(100):
+        url_normalize(f"example.com/{i}")
+
+    stages = recorder.snapshot()["stages"]
+    assert stages["url_normalize"]["count"] == 100  # noqa: PLR2004
+    for stats in recorder._stages.values():  # noqa: SLF001
+        assert len(stats.reservoir) == 8  # noqa: PLR2004
+
+
+def test_events():
+    """IDNA2003 fallbacks and dropped parameters are counted."""
+    instrumentation.enable()
+    url_normalize("google.com/?q=1&utm_source=x&utm_medium=y", filter_params=True)
+    host_cache_clear()
+    # The second fallback is served by the host cache and still counted
+    normalize_host("xn--a.com")
+    normalize_host("xn--a.com")
+
+    assert instrumentation.snapshot()["events"] == {
+        instrumentation.PARAM_DROPPED: 2,
+        instrumentation.IDNA2003_FALLBACK: 2,
+    }
+
+
+def test_events_outside_sampled_calls():
+    """Events are counted for every call, not only sampled ones."""
+    instrumentation.enable(sample_rate=1000)
+    url_normalize("example.com/?q=1")
+    url_humanize("google.com/?q=1&utm_source=x", filter_params=True)
+
+    assert instrumentation.snapshot()["events"][instrumentation.PARAM_DROPPED] >= 1
+
+
+def test_snapshot_after_disable():
+    """The last statistics stay readable after disable()."""
+    instrumentation.enable()
+    url_normalize("example.com")
+    instrumentation.disable()
+    instrumentation.disable()
+    url_normalize("example.com")
+
+    assert instrumentation.snapshot()["calls"] == 1
+
+
+def test_threads():
+    """Concurrent normalizations are all counted."""
+    instrumentation.enable()
+
+    def work() -> None:
+        for i in range(200):
+            url_normalize(f"example.com/{i}")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = instrumentation.snapshot()
+    assert stats["calls"] == 800  # noqa: PLR2004
+    assert stats["stages"]["normalize_path"]["count"] == 800  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(("sample_rate", "reservoir_size"), [(0, 1), (1, 0)])
+def test_invalid_parameters(sample_rate, reservoir_size):
+    """Sample rate and reservoir size must be positive."""
+    with pytest.raises(ValueError, match="must be positive"):
+        instrumentation.enable(sample_rate, reservoir_size)
+
+
+def test_format_snapshot():
+    """The table lists every stage and event."""
+    instrumentation.enable()
+    url_normalize("google.com/?utm_source=x", filter_params=True)
+
+    lines = instrumentation.format_snapshot(instrumentation.snapshot()).splitlines()
+
+    assert lines[0] == "1 URLs, 1 in 1 timed"
+    assert lines[1].split()[:2] == ["stage", "count"]
+    assert [line.split()[0] for line in lines[2:-1]] == PIPELINE_STAGES
+    assert lines[-1] == "param_dropped: 1"
@@ -0,0 +1,104 @@
+"""Tests for lazily imported dependencies and warmup()."""
+
+from __future__ import annotations
+
+import ast
+import subprocess
+import sys
+
+import pytest
+
+import url_normalize
+
+# Modules that `import url_normalize` must not load
+HEAVY_MODULES = [
+    "asyncio",
+    "concurrent.futures",
+    "hashlib",
+    "idna",
+    "importlib.metadata",
+    "multiprocessing",
+]
+
+
+def run_python(code: str) -> list[str]:
+    """Run code in a fresh interpreter and return its output lines."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.splitlines()
+
+
+def loaded_after(code: str) -> list[str]:
+    """Return the heavy modules loaded after running code."""
+    lines = run_python(
+        f"import sys\n{code}\nprint([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    return ast.literal_eval(lines[-1])
+
+
+def test_import_is_lazy() -> None:
+    """Assert importing the package loads none of the heavy modules."""
+    assert loaded_after("import url_normalize") == []
+
+
+def test_ascii_urls_do_not_load_idna() -> None:
+    """Assert ASCII URLs are normalized without idna."""
+    code = "from url_normalize import url_normalize\nurl_normalize('EXAMPLE.com/a b')"
+
+    assert loaded_after(code) == []
+
+
+def test_non_ascii_host_loads_idna() -> None:
+    """Assert idna is loaded on the first host that needs it."""
+    code = "from url_normalize import url_normalize\nurl_normalize('пример.рф')"
+
+    assert "idna" in loaded_after(code)
+
+
+def test_warmup_loads_lazy_modules() -> None:
+    """Assert warmup() loads idna and its UTS46 tables."""
+    lines = run_python(
+        "import sys, url_normalize\n"
+        "url_normalize.warmup()\n"
+        "print('idna.uts46data' in sys.modules)"
+    )
+
+    assert lines == ["True"]
+
+
+def test_warmup_is_repeatable() -> None:
+    """Assert warmup() can be called again and changes no result."""
+    url_normalize.warmup()
+    url_normalize.warmup()
+
+    assert url_normalize.url_normalize("пример.испытание") == (
+        "https://xn--e1afmkfd.xn--80akhbyknj4f/"
+    )
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "url_dedupe",
+        "url_fingerprint",
+        "url_fingerprint_many",
+        "url_normalize_array",
+        "url_normalize_many_async",
+        "url_normalize_parallel",
+    ],
+)
+def test_lazy_attributes(name: str) -> None:
+    """Assert lazily loaded names resolve to the functions of their modules."""
+    value = getattr(url_normalize, name)
+
+    assert callable(value)
+    assert value.__name__ == name
+    assert name in dir(url_normalize)
+    assert name in url_normalize.__all__
+
+
+def test_unknown_attribute() -> None:
+    """Assert unknown names still raise AttributeError."""
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        url_normalize.missing  # noqa: B018
@@ -1,7 +1,16 @@
 """Tests for normalize_host function."""
 
+from unittest.mock import patch
+
+import idna
 import pytest
 
+from url_normalize.normalize_host import (
+    DEFAULT_HOST_CACHE_SIZE,
+    host_cache_clear,
+    host_cache_info,
+    set_host_cache_size,
+)
 from url_normalize.url_normalize import normalize_host
 
 
@@ -30,3 +39,102 @@ def test_normalize_host_result_is_expected(host: str, expected: str) -> None:
     """Assert we got expected results from the normalize_host function."""
     result = normalize_host(host)
     assert result == expected, host
+
+
+def test_normalize_host_cache_counts_hits_and_misses() -> None:
+    """Assert repeated hosts are served from the host cache."""
+    host_cache_clear()
+
+    normalize_host("Cache-Test.example")
+    normalize_host("Cache-Test.example")
+
+    info = host_cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_normalize_host_cache_remembers_idna_fallback() -> None:
+    """Assert the IDNA2003 fallback path runs once per host."""
+    host_cache_clear()
+
+    with patch("idna.encode") as encode:
+        encode.side_effect = idna.IDNAError("label failed")
+        first = normalize_host("under_score.example")
+        second = normalize_host("under_score.example")
+
+    assert first == second == "under_score.example"
+    assert encode.call_count == 1
+
+
+def test_normalize_host_cache_remembers_idna_failures() -> None:
+    """Assert hosts failing IDNA2003 too raise without processing them again."""
+    host_cache_clear()
+    host = "a" * 64 + ".example"
+
+    with patch("idna.encode", wraps=idna.encode) as encode:
+        for _ in range(2):
+            with pytest.raises(UnicodeError, match="label empty or too long"):
+                normalize_host(host)
+
+    assert encode.call_count == 1
+    assert host_cache_info().hits == 1
+
+
+def test_set_host_cache_size() -> None:
+    """Assert the host cache can be resized and disabled at runtime."""
+    try:
+        set_host_cache_size(1)
+        normalize_host("one.example")
+        normalize_host("two.example")
+        assert host_cache_info().currsize == 1
+
+        set_host_cache_size(0)
+        assert host_cache_info().currsize == 0
+        assert normalize_host("THREE.example") == "three.example"
+        assert host_cache_info().currsize == 0
+    finally:
+        set_host_cache_size(DEFAULT_HOST_CACHE_SIZE)
+
+
+@pytest.mark.parametrize(
+    "host",
+    ["www.example.com", "EXAMPLE.COM", "a-b.c0m", "127.0.0.1", "x" * 63 + ".com"],
+)
+def test_normalize_host_ascii_fast_path_skips_idna(host: str) -> None:
+    """Assert plain ASCII LDH hosts never reach the idna package."""
+    host_cache_clear()
+
+    with patch("idna.encode") as encode:
+        result = normalize_host(host)
+
+    assert result == host.lower()
+    encode.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("host", "expected"),
+    [
+        ("xn--e1afmkfd.com", "xn--e1afmkfd.com"),
+        ("-leading.com", "-leading.com"),
+        ("trailing-.com", "trailing-.com"),
+        ("ab--cd.com", "ab--cd.com"),
+        ("under_score.com", "under_score.com"),
+    ],
+)
+def test_normalize_host_unusual_ascii_labels_use_idna(host: str, expected: str) -> None:
+    """Assert labels outside the LDH fast path still go through idna."""
+    host_cache_clear()
+
+    with patch("idna.encode", wraps=idna.encode) as encode:
+        result = normalize_host(host)
+
+    assert result == expected
+    encode.assert_called()
+
+
+def test_normalize_host_too_long_label_still_fails() -> None:
+    """Assert overlong labels keep raising instead of taking the fast path."""
+    host_cache_clear()
+
+    with pytest.raises(UnicodeError):
+        normalize_host("x" * 64 + ".com")
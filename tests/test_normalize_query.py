@@ -22,3 +22,24 @@ def test_normalize_query_result_is_expected(query, expected):
     """Assert we got expected results from the normalize_query function."""
     result = normalize_query(query)
     assert result == expected, query
+
+
+@pytest.mark.parametrize(
+    ("query", "options", "expected"),
+    [
+        ("b=2&a=1&b=1", {"sort_params": True}, "a=1&b=2&b=1"),
+        (
+            "b=2&a=1&b=1",
+            {"sort_params": True, "sort_param_values": True},
+            "a=1&b=1&b=2",
+        ),
+        ("b=2&a=&b", {"sort_params": True, "sort_param_values": True}, "a&b&b=2"),
+        ("Z=1&a=1&%C3%A9=1", {"sort_params": True}, "%C3%A9=1&Z=1&a=1"),
+        ("a=1&b=2&a=1&a=2", {"collapse_params": True}, "a=1&b=2&a=2"),
+        ("a=1&b=2&a=1", {"sort_params": True, "collapse_params": True}, "a=1&b=2"),
+        ("q=%7e&q=~", {"collapse_params": True}, "q=~"),
+    ],
+)
+def test_normalize_query_order(query: str, options: dict, expected: str) -> None:
+    """Assert parameters are sorted and collapsed on their normalized form."""
+    assert normalize_query(query, **options) == expected
@@ -96,3 +96,22 @@ def test_custom_list_allowlist():
 def test_parameter_filtering(url: str, expected: str):
     """Test URL parameter filtering functionality with various scenarios."""
     assert url_normalize(url, filter_params=True) == expected
+
+
+def test_subdomains_inherit_allowlist():
+    """Test subdomains use the rules of their parent domain."""
+    assert (
+        url_normalize(
+            "https://news.google.com/search?q=test&utm_source=test",
+            filter_params=True,
+        )
+        == "https://news.google.com/search?q=test"
+    )
+    assert (
+        url_normalize(
+            "https://shop.example.com/?id=1&ref=x",
+            filter_params=True,
+            param_allowlist={"example.com": ["id"]},
+        )
+        == "https://shop.example.com/?id=1"
+    )
@@ -0,0 +1,134 @@
+"""Normalizer tests."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from url_normalize import Normalizer, url_normalize
+from url_normalize.url_normalize import get_normalizer
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "www.foo.com:80/foo",
+    "/images/logo.png",
+    "https://www.google.com/search?q=test&utm_source=test",
+    "https://example.com/search?page=1&id=123&utm_source=test",
+    "пример.испытание/Служебная:Search/Test",
+]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"default_scheme": "http", "default_domain": "example.com"},
+        {"filter_params": True},
+        {"filter_params": True, "param_allowlist": ["utm_source", "page"]},
+        {"filter_params": True, "param_allowlist": {"example.com": ["id"]}},
+    ],
+)
+def test_normalizer_matches_url_normalize(options: dict) -> None:
+    """Assert a Normalizer gives the same results as url_normalize."""
+    normalize = Normalizer(**options)
+
+    for url in URLS:
+        assert normalize(url) == url_normalize(url, **options)
+
+
+@pytest.mark.parametrize("value", ["", None])
+def test_normalizer_preserves_empty_values(value: str | None) -> None:
+    """Assert empty inputs are returned as is."""
+    assert Normalizer()(value) == value
+
+
+def test_normalizer_is_immutable() -> None:
+    """Assert the configuration cannot be changed after construction."""
+    normalize = Normalizer()
+
+    with pytest.raises(AttributeError, match="immutable"):
+        normalize._charset = "latin-1"  # noqa: SLF001
+    with pytest.raises(AttributeError, match="immutable"):
+        del normalize._charset  # noqa: SLF001
+
+
+def test_normalizer_copies_allowlist() -> None:
+    """Assert later changes to the allowlist argument are not picked up."""
+    allowlist = ["q"]
+    normalize = Normalizer(filter_params=True, param_allowlist=allowlist)
+    allowlist.append("utm_source")
+
+    assert normalize("example.com/?q=1&utm_source=x") == "https://example.com/?q=1"
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"charset": "latin-1", "default_scheme": "http"},
+        {"filter_params": True, "param_allowlist": {"example.com": ["id"]}},
+        {"return_bytes": True},
+    ],
+)
+def test_normalizer_pickle_round_trip(options: dict) -> None:
+    """Assert normalizers survive pickling with the same behavior."""
+    normalize = Normalizer(**options)
+
+    restored = pickle.loads(pickle.dumps(normalize))  # noqa: S301
+
+    assert restored.options == normalize.options
+    assert [restored(url) for url in URLS] == [normalize(url) for url in URLS]
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_normalizer_bytes_input(url: str) -> None:
+    """Assert bytes-like URLs are checked and normalized like str."""
+    normalize = Normalizer()
+    data = url.encode("utf-8")
+    expected = normalize(url)
+
+    assert normalize(memoryview(data)) == expected
+    assert Normalizer(return_bytes=True)(data) == expected.encode("utf-8")
+    assert normalize.is_normalized(expected.encode("utf-8"))
+    assert normalize.is_normalized(data) == normalize.is_normalized(url)
+
+
+def test_normalizer_rejects_unknown_charset() -> None:
+    """Assert the charset is validated at construction."""
+    with pytest.raises(LookupError):
+        Normalizer(charset="no-such-charset")
+
+
+def test_normalizer_rejects_sort_param_values_alone() -> None:
+    """Assert sort_param_values needs sort_params."""
+    with pytest.raises(ValueError, match="sort_params"):
+        Normalizer(sort_param_values=True)
+
+
+def test_normalizer_repr() -> None:
+    """Assert the representation lists the options."""
+    assert repr(Normalizer(default_scheme="http")).startswith(
+        "Normalizer(charset='utf-8', default_scheme='http'"
+    )
+
+
+def test_get_normalizer_reuses_instances() -> None:
+    """Assert equal options share one cached Normalizer."""
+    first = get_normalizer(filter_params=True, param_allowlist={"a.com": ["q"]})
+    second = get_normalizer(filter_params=True, param_allowlist={"a.com": ["q"]})
+
+    assert first is second
+    assert get_normalizer(charset="utf-8") is get_normalizer(charset="utf-8")
+
+
+def test_get_normalizer_drops_unused_param_lists() -> None:
+    """Assert lists of disabled filters neither split nor leak into the cache."""
+    first = get_normalizer(sort_params=True, param_allowlist=["a"])
+    second = get_normalizer(sort_params=True, param_denylist=["b"])
+
+    assert first is second
+    assert first.options["param_allowlist"] is None
+    assert first.options["param_denylist"] is None
+    filtering = get_normalizer(filter_params=True, param_allowlist=["a"])
+    assert filtering.options["param_allowlist"] == ["a"]
@@ -0,0 +1,90 @@
+"""Parallel normalization tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from url_normalize import url_normalize, url_normalize_parallel
+from url_normalize.parallel import (
+    _decode_chunk,
+    _encode_chunk,
+    iter_parallel,
+)
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "",
+    None,
+    "www.foo.com:443/foo",
+    "пример.испытание/Служебная",
+    "https://www.google.com/search?q=test&utm_source=test",
+] * 20
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("ordered", [True, False])
+def test_url_normalize_parallel_matches_url_normalize(
+    jobs: int,
+    ordered: bool,  # noqa: FBT001
+) -> None:
+    """Assert parallel results match url_normalize for every input."""
+    results = list(
+        url_normalize_parallel(
+            URLS, jobs=jobs, chunk_size=7, ordered=ordered, filter_params=True
+        )
+    )
+
+    expected = [url_normalize(url, filter_params=True) for url in URLS]
+    if ordered:
+        assert [index for index, _ in results] == list(range(len(URLS)))
+    assert sorted(results, key=lambda item: item[0]) == list(enumerate(expected))
+
+
+def test_url_normalize_parallel_raises_errors() -> None:
+    """Assert the first normalization error is raised to the caller."""
+    with pytest.raises(ValueError, match="Invalid IPv6 URL"):
+        list(url_normalize_parallel(["example.com", "http://[::1/"], jobs=2))
+
+
+def test_url_normalize_parallel_rejects_return_bytes() -> None:
+    """Assert parallel normalization only returns str URLs, checked eagerly."""
+    with pytest.raises(TypeError, match="return_bytes"):
+        url_normalize_parallel(["example.com"], jobs=1, return_bytes=True)
+
+
+def test_iter_parallel_returns_errors_in_place() -> None:
+    """Assert failing URLs do not abort the rest of their chunk."""
+    results = dict(
+        iter_parallel(url_normalize, ["example.com", "http://[::1/", "a.org"], jobs=2)
+    )
+
+    assert results[0] == "https://example.com/"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "https://a.org/"
+
+
+@pytest.mark.parametrize(("jobs", "chunk_size"), [(0, 1), (-1, 10), (2, 0)])
+def test_iter_parallel_rejects_invalid_sizes(jobs: int, chunk_size: int) -> None:
+    """Assert invalid pool settings are rejected before iteration starts."""
+    with pytest.raises(ValueError, match="positive"):
+        iter_parallel(url_normalize, [], jobs=jobs, chunk_size=chunk_size)
+    with pytest.raises(ValueError, match="positive"):
+        url_normalize_parallel([], jobs=jobs, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize(
+    ("chunk", "compact"),
+    [
+        (["a.com", "b.com"], True),
+        (["a.com", ""], False),
+        (["a.com", None], False),
+        (["a\\n.com"], True),
+        (["a\n.com"], False),
+    ],
+)
+def test_chunk_payload_round_trip(chunk: list, compact: bool) -> None:  # noqa: FBT001
+    """Assert chunks are sent as bytes when possible and always round trip."""
+    payload = _encode_chunk(chunk)
+
+    assert isinstance(payload, bytes) is compact
+    assert _decode_chunk(payload) == chunk
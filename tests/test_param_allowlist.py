@@ -0,0 +1,72 @@
+"""Parameter allowlist tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from url_normalize.param_allowlist import (
+    DEFAULT_ALLOWLIST_INDEX,
+    AllowlistIndex,
+    compile_allowlist,
+    get_allowed_params,
+)
+
+
+@pytest.mark.parametrize(
+    ("host", "expected"),
+    [
+        ("google.com", {"q", "ie"}),
+        ("www.google.com", {"q", "ie"}),
+        ("news.google.com", {"q", "ie"}),
+        ("WWW.Google.COM.", {"q", "ie"}),
+        ("google.com:8080", {"q", "ie"}),
+        ("notgoogle.com", set()),
+        ("google.com.evil.org", set()),
+        ("com", set()),
+        ("", set()),
+        (None, set()),
+    ],
+)
+def test_default_allowlist_lookup(host: str | None, expected: set[str]) -> None:
+    """Assert hosts resolve to the rules of their closest listed domain."""
+    assert DEFAULT_ALLOWLIST_INDEX.lookup(host) == expected
+
+
+def test_most_specific_domain_wins() -> None:
+    """Assert subdomain rules override the rules of parent domains."""
+    index = AllowlistIndex({"example.com": ["a"], "api.example.com": ["b"]})
+
+    assert index.lookup("example.com") == {"a"}
+    assert index.lookup("v1.api.example.com") == {"b"}
+    assert index.lookup("www.example.com") == {"a"}
+
+
+def test_list_allowlist_applies_to_every_host() -> None:
+    """Assert list allowlists ignore the host."""
+    index = AllowlistIndex(["q", "id"])
+
+    assert index.lookup("example.com") == {"q", "id"}
+    assert index.lookup(None) == {"q", "id"}
+
+
+def test_lookup_returns_shared_sets() -> None:
+    """Assert resolving a host does not build a new set."""
+    index = AllowlistIndex({"example.com": ["a"]})
+
+    assert index.lookup("a.example.com") is index.lookup("b.example.com")
+
+
+def test_compile_allowlist_reuses_compiled_indexes() -> None:
+    """Assert compiled and default allowlists are not compiled again."""
+    index = AllowlistIndex(["q"])
+
+    assert compile_allowlist(index) is index
+    assert compile_allowlist(None) is DEFAULT_ALLOWLIST_INDEX
+
+
+def test_get_allowed_params_returns_new_set() -> None:
+    """Assert the legacy helper keeps returning a mutable set."""
+    allowed = get_allowed_params("www.bing.com")
+    allowed.add("extra")
+
+    assert get_allowed_params("bing.com") == {"q"}
@@ -0,0 +1,164 @@
+"""Parameter denylist tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from url_normalize import Normalizer, url_normalize
+from url_normalize.param_denylist import (
+    DEFAULT_DENYLIST_INDEX,
+    DeniedParams,
+    DenylistIndex,
+    compile_denylist,
+    is_denied_param,
+)
+
+
+@pytest.mark.parametrize(
+    ("param", "expected"),
+    [
+        ("utm_source", True),
+        ("utm_", True),
+        ("fbclid", True),
+        ("gclid", True),
+        ("mc_eid", True),
+        ("__hssc", True),
+        ("q", False),
+        ("utm", False),
+        ("xutm_source", False),
+        ("FBCLID", False),
+        ("fbclid2", False),
+    ],
+)
+def test_default_denylist(param: str, expected: bool) -> None:  # noqa: FBT001
+    """Assert the default rules match names and prefixes exactly."""
+    assert (param in DEFAULT_DENYLIST_INDEX.lookup("example.com")) is expected
+
+
+@pytest.mark.parametrize(
+    ("rule", "param", "expected"),
+    [
+        ("ref", "ref", True),
+        ("ref", "referrer", False),
+        ("ref*", "referrer", True),
+        ("*_id", "session_id", True),
+        ("*_id", "session_idx", False),
+        ("v?", "v1", True),
+        ("v?", "v", False),
+        ("a.b*", "a.bc", True),
+        ("a.b*", "axbc", False),
+        ("%5B*%5D", "%5Bx%5D", True),
+    ],
+)
+def test_rule_syntax(rule: str, param: str, expected: bool) -> None:  # noqa: FBT001
+    """Assert '*' and '?' are wildcards and other characters are literal."""
+    assert (param in DeniedParams([rule])) is expected
+
+
+def test_exemptions() -> None:
+    """Assert exemptions keep parameters matched by the denylist rules."""
+    denied = DeniedParams(["utm_*", "ref"], ["utm_id", "ref"])
+
+    assert "utm_source" in denied
+    assert "utm_id" not in denied
+    assert "ref" not in denied
+
+
+def test_extend_adds_rules_and_exemptions() -> None:
+    """Assert extending keeps the rules and adds the new ones."""
+    denied = DeniedParams(["utm_*"]).extend(["ref", "!utm_id"])
+
+    assert "utm_source" in denied
+    assert "ref" in denied
+    assert "utm_id" not in denied
+
+
+def test_host_rules_layer_on_defaults() -> None:
+    """Assert domain rules add to the default rules for their subdomains."""
+    index = DenylistIndex(
+        {"example.com": ["ref"], "api.example.com": ["!utm_campaign", "v"]}
+    )
+
+    assert "utm_source" in index.lookup("example.org")
+    assert "ref" not in index.lookup("example.org")
+    assert "ref" in index.lookup("www.Example.com:8080")
+    assert "utm_campaign" in index.lookup("example.com")
+    assert "ref" in index.lookup("v1.api.example.com")
+    assert "v" in index.lookup("api.example.com")
+    assert "utm_campaign" not in index.lookup("api.example.com")
+    assert "utm_source" in index.lookup("api.example.com")
+
+
+def test_global_rules_replace_defaults() -> None:
+    """Assert list denylists and the '*' key replace the default rules."""
+    index = DenylistIndex({"*": ["ref"], "example.com": ["v"]})
+
+    assert "utm_source" not in index.lookup("example.org")
+    assert "ref" in index.lookup("example.org")
+    assert "ref" in index.lookup("example.com")
+    assert "v" in index.lookup("example.com")
+    assert "utm_source" not in DenylistIndex(["ref"]).lookup(None)
+
+
+def test_lookup_returns_shared_matchers() -> None:
+    """Assert resolving a host does not compile rules again."""
+    index = DenylistIndex({"example.com": ["a"]})
+
+    assert index.lookup("a.example.com") is index.lookup("b.example.com")
+    assert index.lookup("example.org") is index.lookup(None)
+
+
+def test_compile_denylist_reuses_compiled_indexes() -> None:
+    """Assert compiled and default denylists are not compiled again."""
+    index = DenylistIndex(["a"])
+
+    assert compile_denylist(index) is index
+    assert compile_denylist(None) is DEFAULT_DENYLIST_INDEX
+
+
+def test_is_denied_param() -> None:
+    """Assert single parameters can be checked against a denylist."""
+    assert is_denied_param("utm_medium")
+    assert not is_denied_param("id")
+    assert is_denied_param("id", "example.com", {"example.com": ["id"]})
+
+
+def test_strip_tracking_params() -> None:
+    """Assert denied parameters are removed on any host, in place."""
+    url = "https://shop.example/item?utm_source=x&id=1&fbclid=y&utm_medium=z&b=2"
+
+    assert url_normalize(url) == url
+    assert url_normalize(url, strip_tracking_params=True) == (
+        "https://shop.example/item?id=1&b=2"
+    )
+
+
+def test_strip_tracking_params_with_allowlist() -> None:
+    """Assert the denylist applies on top of the allowlist."""
+    url = "https://www.google.com/search?q=test&utm_source=x&ie=utf-8"
+
+    result = url_normalize(
+        url,
+        filter_params=True,
+        strip_tracking_params=True,
+        param_denylist={"google.com": ["ie"]},
+    )
+
+    assert result == "https://www.google.com/search?q=test"
+
+
+def test_strip_tracking_params_matches_normalized_keys() -> None:
+    """Assert rules match the normalized, percent-encoded keys."""
+    url = "https://example.com/?utm%5Fsource=x&%66bclid=y&q=1"
+
+    assert url_normalize(url, strip_tracking_params=True) == "https://example.com/?q=1"
+
+
+def test_normalizer_options_round_trip() -> None:
+    """Assert the denylist is frozen and reported like the allowlist."""
+    denylist = {"example.com": ["ref"]}
+    normalize = Normalizer(strip_tracking_params=True, param_denylist=denylist)
+    denylist["example.com"].append("id")
+
+    assert normalize.options["param_denylist"] == {"example.com": ["ref"]}
+    assert normalize("example.com/?ref=1&id=2") == "https://example.com/?id=2"
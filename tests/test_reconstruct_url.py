@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from urllib.parse import urlunsplit
+
 import pytest
 
 from url_normalize.tools import URL, reconstruct_url
@@ -40,3 +42,36 @@ def test_reconstruct_url_result_is_expected(url_obj: URL, expected: str) -> None
     """Assert we got expected results from the reconstruct_url function."""
     result = reconstruct_url(url_obj)
     assert result == expected, url_obj
+
+
+@pytest.mark.parametrize(
+    "url_obj",
+    [
+        URL("http", "", "example.com", "", "/a", "q", "f"),
+        URL("http", "u:p@", "example.com", "81", "a", "", ""),
+        URL("http", "", "", "", "/path", "", ""),
+        URL("http", "", "", "", "", "", ""),
+        URL("mailto", "", "", "", "John.Doe@example.com", "", ""),
+        URL("", "", "", "", "/foo/bar", "a&b", ""),
+        URL("", "", "", "", "-", "", ""),
+        URL("urn", "", "", "", "oasis:names", "", ""),
+        URL("", "", "example.com", "", "", "", "frag"),
+    ],
+)
+def test_reconstruct_url_matches_urlunsplit(url_obj: URL) -> None:
+    """Assert the joiner agrees with urlunsplit on unambiguous components."""
+    auth = url_obj.userinfo + url_obj.host
+    if url_obj.port:
+        auth += ":" + url_obj.port
+    expected = urlunsplit(
+        (url_obj.scheme, auth, url_obj.path, url_obj.query, url_obj.fragment)
+    )
+
+    assert reconstruct_url(url_obj) == expected
+
+
+def test_reconstruct_url_keeps_authority_free_double_slash_paths() -> None:
+    """Assert paths starting with '//' are not mistaken for an authority."""
+    url_obj = URL("http", "", "", "", "//x/y", "", "")
+
+    assert reconstruct_url(url_obj) == "http:////x/y"
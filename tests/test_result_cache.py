@@ -0,0 +1,203 @@
+"""Result cache tests."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from url_normalize import (
+    Normalizer,
+    instrumentation,
+    is_normalized,
+    result_cache,
+    url_normalize,
+)
+from url_normalize.result_cache import ENTRY_OVERHEAD, entry_size
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+URLS = [
+    "http://EXAMPLE.com/./path/../other/",
+    "www.foo.com:80/foo",
+    "https://www.foo.com/foo",
+    "/images/logo.png",
+    "https://www.google.com/search?q=test&utm_source=test",
+    "пример.испытание/Служебная:Search/Test",
+    "http://example.com/?b=2&a=1&b=2",
+]
+
+OPTIONS = [
+    {},
+    {"default_domain": "example.com"},
+    {"filter_params": True},
+    {"strip_tracking_params": True, "sort_params": True},
+    {"skip_normalized": True},
+]
+
+
+@pytest.fixture
+def cache() -> Iterator[object]:
+    """Enable the result cache for one test."""
+    yield result_cache.enable()
+    result_cache.disable()
+
+
+def test_disabled_by_default() -> None:
+    """Assert nothing is cached unless the cache is enabled."""
+    assert not result_cache.is_enabled()
+
+    url_normalize("www.foo.com")
+
+    assert result_cache.info().hits == result_cache.info().misses == 0
+
+
+@pytest.mark.usefixtures("cache")
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("url", URLS)
+def test_cached_results_are_unchanged(url: str, options: dict) -> None:
+    """Assert misses and hits both return the uncached result."""
+    result_cache.disable()
+    expected = url_normalize(url, **options)
+    result_cache.enable()
+
+    assert url_normalize(url, **options) == expected
+    assert url_normalize(url, **options) == expected
+    assert result_cache.info().hits == 1
+    assert result_cache.info().misses == 1
+
+
+@pytest.mark.usefixtures("cache")
+def test_options_are_part_of_the_key() -> None:
+    """Assert normalizers with other options do not share results."""
+    url = "www.foo.com/?utm_source=x"
+
+    assert url_normalize(url) == "https://www.foo.com/?utm_source=x"
+    assert url_normalize(url, strip_tracking_params=True) == "https://www.foo.com/"
+    assert Normalizer(default_scheme="http")(url) == "http://www.foo.com/?utm_source=x"
+    assert result_cache.info().hits == 0
+
+
+@pytest.mark.usefixtures("cache")
+def test_bytes_input_and_output() -> None:
+    """Assert bytes-like input shares str entries and keeps its output type."""
+    assert url_normalize("www.foo.com") == "https://www.foo.com/"
+    assert url_normalize(b"www.foo.com", return_bytes=True) == b"https://www.foo.com/"
+    assert url_normalize(memoryview(b"www.foo.com")) == "https://www.foo.com/"
+    assert result_cache.info().hits == 1
+
+
+@pytest.mark.usefixtures("cache")
+def test_errors_are_not_cached() -> None:
+    """Assert URLs that fail to normalize fail every time."""
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Invalid IPv6 URL"):
+            url_normalize("http://[::1/")
+
+    assert result_cache.info().currsize == 0
+
+
+@pytest.mark.usefixtures("cache")
+def test_is_normalized_uses_cache() -> None:
+    """Assert is_normalized stays exact with cached results."""
+    assert not is_normalized("www.foo.com:80/foo")
+    assert not is_normalized("www.foo.com:80/foo")
+    assert is_normalized("https://www.foo.com:80/foo")
+
+
+def test_memory_is_bounded() -> None:
+    """Assert entries are evicted to stay within the byte limit."""
+    result_cache.enable(max_bytes=50 * ENTRY_OVERHEAD)
+    try:
+        for i in range(200):
+            url_normalize(f"www.foo.com/{i}")
+        info = result_cache.info()
+    finally:
+        result_cache.disable()
+
+    assert 0 < info.currsize < 50  # noqa: PLR2004
+    assert info.currbytes <= info.maxbytes
+    assert info.evictions == 200 - info.currsize
+
+
+def test_entry_size() -> None:
+    """Assert unchanged results are not counted twice."""
+    url = "https://www.foo.com/"
+    normalizer = Normalizer()
+
+    same = entry_size((normalizer, url), url)
+    changed = entry_size((normalizer, url), "https://www.foo.com/x")
+
+    assert same > ENTRY_OVERHEAD
+    assert changed > same + len(url)
+
+
+@pytest.mark.usefixtures("cache")
+def test_hits_are_counted_as_events() -> None:
+    """Assert hits skip the timed pipeline but are counted by instrumentation."""
+    recorder = instrumentation.enable()
+    try:
+        for _ in range(3):
+            url_normalize("www.foo.com/?utm_source=x", strip_tracking_params=True)
+    finally:
+        instrumentation.disable()
+
+    stats = recorder.snapshot()
+    assert stats["calls"] == stats["stages"]["url_normalize"]["count"] == 1
+    assert stats["events"] == {
+        instrumentation.PARAM_DROPPED: 1,
+        instrumentation.RESULT_CACHE_HIT: 2,
+    }
+
+
+def test_hit_ratio_and_clear(cache) -> None:
+    """Assert the hit ratio is reported and reset by clear()."""
+    for _ in range(4):
+        url_normalize("www.foo.com")
+
+    assert result_cache.info().hit_ratio == 0.75  # noqa: PLR2004
+    assert result_cache.info().currbytes > 0
+    result_cache.clear()
+    assert result_cache.info() == cache.info()
+    assert result_cache.info().currbytes == result_cache.info().hits == 0
+
+
+def test_disable_drops_results() -> None:
+    """Assert disabling releases the cache and enabling starts empty."""
+    result_cache.enable()
+    url_normalize("www.foo.com")
+    result_cache.disable()
+
+    assert result_cache.info().currsize == 0
+    result_cache.enable()
+    try:
+        assert result_cache.info().currsize == 0
+    finally:
+        result_cache.disable()
+
+
+def test_concurrent_normalization() -> None:
+    """Assert threads sharing the cache get the uncached results."""
+    urls = [f"WWW.foo.com/{i % 50}/../a?{i % 7}" for i in range(2000)]
+    expected = [url_normalize(url) for url in urls]
+    results: list[list[str | None]] = []
+
+    def worker() -> None:
+        results.append([url_normalize(url) for url in urls])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    result_cache.enable()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = result_cache.info()
+    finally:
+        result_cache.disable()
+
+    assert results == [expected] * 4
+    assert info.hits + info.misses == 8000  # noqa: PLR2004
+    assert info.currsize == 350  # noqa: PLR2004
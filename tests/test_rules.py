@@ -0,0 +1,190 @@
+"""Rules file loading and reloading tests."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+from url_normalize import RulesFile, load_rules
+from url_normalize.rules import Rules, parse_rules
+
+TOML_RULES = b"""\
+denylist = ["utm_*", "ref"]
+
+[allowlist]
+"google.com" = ["q", "ie"]
+"""
+# Hex digits of a rules version
+VERSION_LENGTH = 16
+
+
+def write_rules(path, content: dict, mtime_ns: int | None = None) -> None:
+    """Write JSON rules, optionally setting the modification time."""
+    path.write_text(json.dumps(content))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="tomllib is Python 3.11+")
+def test_parse_toml_rules() -> None:
+    """Assert TOML tables and arrays give the allowlist and denylist."""
+    rules = parse_rules(TOML_RULES, toml=True)
+
+    assert rules.param_allowlist == {"google.com": ["q", "ie"]}
+    assert rules.param_denylist == ["utm_*", "ref"]
+
+
+def test_parse_json_rules() -> None:
+    """Assert JSON rules are parsed and missing lists are None."""
+    rules = parse_rules(b'{"allowlist": ["q", "id"]}')
+
+    assert rules.param_allowlist == ["q", "id"]
+    assert rules.param_denylist is None
+
+
+def test_rules_version_follows_content() -> None:
+    """Assert the version changes with the content only."""
+    first = parse_rules(b'{"denylist": ["a"]}')
+
+    assert parse_rules(b'{"denylist": ["a"]}').version == first.version
+    assert parse_rules(b'{"denylist": ["b"]}').version != first.version
+    assert len(first.version) == VERSION_LENGTH
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b'{"allowlist": ["q"], "extra": []}', "unknown rules keys: extra"),
+        (b'{"allowlist": "q"}', "allowlist must be a list"),
+        (b'{"denylist": {"a.com": [1]}}', "denylist must be a list"),
+        (b"{", "Expecting"),
+    ],
+)
+def test_parse_rules_rejects_invalid(data: bytes, message: str) -> None:
+    """Assert malformed rules raise ValueError."""
+    with pytest.raises(ValueError, match=message):
+        parse_rules(data)
+
+
+def test_parse_rules_rejects_non_tables() -> None:
+    """Assert rules that are not a table raise TypeError."""
+    with pytest.raises(TypeError, match="must be a table"):
+        parse_rules(b"[]")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="tomllib is Python 3.11+")
+def test_load_rules_by_extension(tmp_path) -> None:
+    """Assert .toml files are read as TOML and others as JSON."""
+    toml_path = tmp_path / "rules.toml"
+    toml_path.write_bytes(TOML_RULES)
+    json_path = tmp_path / "rules.json"
+    write_rules(json_path, {"allowlist": {"google.com": ["q", "ie"]}})
+
+    assert load_rules(toml_path).param_allowlist == {"google.com": ["q", "ie"]}
+    assert load_rules(str(json_path)).param_allowlist == {"google.com": ["q", "ie"]}
+
+
+def test_rules_file_normalizer(tmp_path) -> None:
+    """Assert normalizers use the rules and are built once per options."""
+    path = tmp_path / "rules.json"
+    write_rules(path, {"denylist": {"example.com": ["ref"]}})
+    rules = RulesFile(path)
+
+    normalize = rules.normalizer(strip_tracking_params=True)
+
+    assert normalize("example.com/?ref=1&utm_source=2&id=3") == (
+        "https://example.com/?id=3"
+    )
+    assert rules.normalizer(strip_tracking_params=True) is normalize
+    assert rules.normalizer() is not normalize
+
+
+def test_rules_file_reloads_on_change(tmp_path) -> None:
+    """Assert a changed file is reloaded and gets a new version."""
+    path = tmp_path / "rules.json"
+    write_rules(path, {"denylist": ["a"]}, mtime_ns=10**18)
+    rules = RulesFile(path, check_interval=0)
+    version = rules.version
+    first = rules.normalizer(strip_tracking_params=True)
+
+    write_rules(path, {"denylist": ["b"]}, mtime_ns=10**18 + 1)
+
+    assert rules.rules.param_denylist == ["b"]
+    assert rules.version != version
+    second = rules.normalizer(strip_tracking_params=True)
+    assert second is not first
+    assert second("example.com/?a=1&b=2") == "https://example.com/?a=1"
+    # Normalizers of the old rules keep working
+    assert first("example.com/?a=1&b=2") == "https://example.com/?b=2"
+
+
+def test_rules_file_check_interval(tmp_path) -> None:
+    """Assert the file is not checked again before the interval elapses."""
+    path = tmp_path / "rules.json"
+    write_rules(path, {"denylist": ["a"]}, mtime_ns=10**18)
+    rules = RulesFile(path, check_interval=3600)
+
+    write_rules(path, {"denylist": ["b"]}, mtime_ns=10**18 + 1)
+
+    assert rules.rules.param_denylist == ["a"]
+    assert rules.reload()
+    assert rules.rules.param_denylist == ["b"]
+    assert not rules.reload()
+
+
+def test_rules_file_keeps_rules_on_error(tmp_path) -> None:
+    """Assert a broken or missing file keeps the previous rules."""
+    path = tmp_path / "rules.json"
+    write_rules(path, {"denylist": ["a"]}, mtime_ns=10**18)
+    rules = RulesFile(path, check_interval=0)
+
+    path.write_text("{")
+    os.utime(path, ns=(10**18 + 1, 10**18 + 1))
+
+    assert rules.rules.param_denylist == ["a"]
+    assert isinstance(rules.last_error, ValueError)
+    path.write_text("[]")
+    os.utime(path, ns=(10**18 + 2, 10**18 + 2))
+    assert rules.rules.param_denylist == ["a"]
+    assert isinstance(rules.last_error, TypeError)
+    path.unlink()
+    assert rules.rules.param_denylist == ["a"]
+    assert isinstance(rules.last_error, OSError)
+    write_rules(path, {"denylist": ["b"]})
+    assert rules.rules.param_denylist == ["b"]
+    assert rules.last_error is None
+
+
+def test_rules_file_reload_does_not_wait(tmp_path) -> None:
+    """Assert callers use the current rules while a reload is in progress."""
+    path = tmp_path / "rules.json"
+    write_rules(path, {"denylist": ["a"]}, mtime_ns=10**18)
+    rules = RulesFile(path, check_interval=0)
+    write_rules(path, {"denylist": ["b"]}, mtime_ns=10**18 + 1)
+
+    with rules._lock:  # noqa: SLF001
+        assert not rules.reload()
+        assert rules.rules.param_denylist == ["a"]
+    assert rules.rules.param_denylist == ["b"]
+
+
+def test_rules_file_requires_valid_file(tmp_path) -> None:
+    """Assert the first load raises instead of starting without rules."""
+    with pytest.raises(FileNotFoundError):
+        RulesFile(tmp_path / "missing.json")
+    path = tmp_path / "rules.json"
+    path.write_text('{"allowlist": 1}')
+    with pytest.raises(ValueError, match="allowlist"):
+        RulesFile(path)
+
+
+def test_rules_are_a_named_tuple() -> None:
+    """Assert rules unpack into the allowlist, denylist and version."""
+    allowlist, denylist, version = parse_rules(b"{}")
+
+    assert (allowlist, denylist) == (None, None)
+    assert isinstance(parse_rules(b"{}"), Rules)
+    assert version
@@ -2,7 +2,20 @@
 
 from __future__ import annotations
 
-from url_normalize.tools import force_unicode
+from urllib.parse import quote as urllib_quote
+
+import pytest
+
+from url_normalize.tools import (
+    canonical_pattern,
+    force_bytes,
+    force_unicode,
+    is_ascii_compatible,
+    is_canonical,
+    quote,
+    requote,
+    unquote,
+)
 
 
 def test_force_unicode_with_bytes() -> None:
@@ -10,3 +23,144 @@ def test_force_unicode_with_bytes() -> None:
     test_bytes = b"hello world"
     result = force_unicode(test_bytes)
     assert result == "hello world"
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize(
+    ("value", "charset"),
+    [
+        ("hello world", "utf-8"),
+        ("hello world", "cp1252"),
+        ("hello world", "utf-16"),
+        ("café €", "cp1252"),
+        ("café", "latin-1"),
+        ("пример", "utf-8"),
+    ],
+)
+def test_force_unicode_with_bytes_like(wrap: type, value: str, charset: str) -> None:
+    """Assert bytes-like input is decoded with the charset."""
+    assert force_unicode(wrap(value.encode(charset)), charset) == value
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_force_unicode_replaces_invalid_bytes(wrap: type) -> None:
+    """Assert invalid sequences are replaced."""
+    assert force_unicode(wrap(b"a\xffb")) == "a\ufffdb"
+    assert force_unicode(wrap(b"a\x81b"), "cp1252") == "a\ufffdb"
+
+
+@pytest.mark.parametrize(
+    ("value", "charset"),
+    [
+        ("hello world", "utf-8"),
+        ("hello world", "cp1252"),
+        ("hello world", "utf-16"),
+        ("café €", "cp1252"),
+    ],
+)
+def test_force_bytes(value: str, charset: str) -> None:
+    """Assert force_bytes encodes with the charset."""
+    assert force_bytes(value, charset) == value.encode(charset)
+
+
+@pytest.mark.parametrize(
+    ("charset", "expected"),
+    [
+        ("utf-8", True),
+        ("cp1252", True),
+        ("latin-1", True),
+        ("utf-16", False),
+        ("utf-7", False),
+        ("cp037", False),
+    ],
+)
+def test_is_ascii_compatible(charset: str, expected: bool) -> None:  # noqa: FBT001
+    """Assert ASCII-compatible charsets are recognized."""
+    assert is_ascii_compatible(charset) is expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["", "plain", "a b/c?d#e", "Ç/%", "пример", "~!*'()", "\x00\x7f\x80"],
+)
+@pytest.mark.parametrize("safe", ["", "/", "~=", "~:/?[]@!$'()*+,;", "é/"])
+def test_quote_matches_urllib(value: str, safe: str) -> None:
+    """Assert table-driven quoting matches urllib.parse.quote."""
+    assert quote(value, safe) == urllib_quote(value, safe)
+
+
+@pytest.mark.parametrize(
+    ("value", "canonical"),
+    [
+        ("", True),
+        ("/foo/bar-baz_1.html", True),
+        ("/a%20b", True),
+        ("/a%7Cb", True),
+        ("/a%2fb", False),  # lowercase escape
+        ("/a%41b", False),  # unnecessary escape
+        ("/a%2Fb", False),  # escaped safe character
+        ("/a%C3%A9", True),  # escaped UTF-8
+        ("/a%c3%a9", False),  # lowercase escaped UTF-8
+        ("/a%C3", False),  # truncated UTF-8 sequence
+        ("/a%C0%80", False),  # overlong UTF-8 sequence
+        ("/a%ED%A0%80", False),  # escaped surrogate
+        ("/a b", False),
+        ("/%", False),
+        ("/%2", False),
+        ("/é", False),
+    ],
+)
+def test_canonical_pattern(value: str, canonical: bool) -> None:  # noqa: FBT001
+    """Assert canonical_pattern recognizes minimally quoted components."""
+    assert bool(canonical_pattern("/").fullmatch(value)) is canonical
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "/foo",
+        "/a%20b",
+        "/a%2fb",
+        "/a%41b",
+        "/%",
+        "/%zz",
+        "/é",
+        "a%7E~",
+        "%25",
+        "/%D0%A1%D0%BB",
+        "/%E4%BD%A0%F0%9F%98%80",
+        "/%F4%8F%BF%BF",
+        "/%F4%90%80%80",
+        "/e%CC%81",  # decomposed, composed by NFC
+        "/%3D%CC%B8",  # '=' and a combining overlay compose to U+2260
+        "/%C3%A9%2F",
+    ],
+)
+@pytest.mark.parametrize("safe", ["", "/", "~=", "~:/?[]@!$'()*+,;", "%/"])
+def test_requote_matches_round_trip(value: str, safe: str) -> None:
+    """Assert requote matches quote(unquote()) for every input."""
+    assert requote(value, safe) == quote(unquote(value), safe)
+
+
+def test_canonical_pattern_fails_fast() -> None:
+    """Assert a long non-canonical component does not backtrack."""
+    value = "/" + "item/" * 2000 + "página"
+    assert not canonical_pattern("/").fullmatch(value)
+    assert requote(value, "/") == quote(unquote(value), "/")
+
+
+@pytest.mark.parametrize(
+    ("value", "charset"),
+    [("/%C3%A9", "latin-1"), ("/%E4%BD%A0", "ascii")],
+)
+def test_is_canonical_non_utf8_charset(value: str, charset: str) -> None:
+    """Assert escaped text is only trusted for the default charset."""
+    assert is_canonical(value, "/")
+    assert not is_canonical(value, "/", charset)
+
+
+def test_is_canonical_non_ascii_safe_chars() -> None:
+    """Assert escaped text is not trusted when safe has non-ASCII characters."""
+    assert not is_canonical("/%C3%A9", "é/")
+    assert requote("/%C3%A9", "é/") == quote(unquote("/%C3%A9"), "é/")
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import importlib
+
+import idna
 import pytest
 
 import url_normalize as package
+from url_normalize.cache import LRUCache
+
+url_humanize_module = importlib.import_module("url_normalize.url_humanize")
 
 
 @pytest.mark.parametrize(
@@ -120,3 +126,68 @@ def test_url_humanize_skips_failed_round_trip() -> None:
     """Assert parts that break round-trip normalizations are kept as is."""
     value = "https://example.com/a%3Fb"
     assert package.url_humanize(value) == value
+
+
+@pytest.mark.parametrize("value", ["[..%zz:\u216b", "\ufb01)[\u01c5\u0301::1@"])
+def test_url_humanize_rejects_urls_that_do_not_normalize_again(value: str) -> None:
+    """Assert URLs whose normalized form fails to normalize raise like it."""
+    normalized = package.url_normalize(value)
+    with pytest.raises(ValueError, match="Invalid IPv6 URL"):
+        package.url_normalize(normalized)
+
+    with pytest.raises(ValueError, match="Invalid IPv6 URL"):
+        package.url_humanize(value)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        # A trailing space would be stripped from the URL
+        ("https://example.com/?a=%20", "https://example.com/?a=%20"),
+        ("https://example.com/?a=%20#f", "https://example.com/?a= #f"),
+        # Newlines are removed from URLs
+        ("https://example.com/?d=%0Ax", "https://example.com/?d=%0Ax"),
+        (
+            "https://example.com/?q=%D0%BF&r=%FF&s=%C3%A9",
+            "https://example.com/?q=п&r=%EF%BF%BD&s=é",
+        ),
+    ],
+)
+def test_url_humanize_query_edge_cases(value: str, expected: str) -> None:
+    """Assert query edits that could change the URL split are checked fully."""
+    humanized = package.url_humanize(value)
+
+    assert humanized == expected
+    assert package.url_normalize(humanized) == package.url_normalize(value)
+
+
+def test_url_humanize_long_query() -> None:
+    """Assert every parameter of a long query is humanized independently."""
+    params = [f"k{i}=%C3%A9{i}" for i in range(100)]
+    params[50] = "hash=%23"
+
+    humanized = package.url_humanize("https://example.com/?" + "&".join(params))
+
+    assert humanized is not None
+    query = humanized.partition("?")[2].split("&")
+    assert query[0] == "k0=é0"
+    assert query[50] == "hash=%23"
+    assert query[99] == "k99=é99"
+
+
+def test_url_humanize_caches_host_labels(monkeypatch) -> None:
+    """Assert IDNA labels are decoded once."""
+    calls = []
+    decode = idna.decode
+
+    def counting_decode(label: str) -> str:
+        calls.append(label)
+        return decode(label)
+
+    monkeypatch.setattr(url_humanize_module, "_label_cache", LRUCache(16))
+    monkeypatch.setattr(idna, "decode", counting_decode)
+
+    for _ in range(3):
+        assert package.url_humanize("https://xn--fa-hia.de/") == "https://faß.de/"
+
+    assert calls == ["xn--fa-hia", "de"]
@@ -5,10 +5,81 @@ SPDX-License-Identifier: MIT
 
 """
 
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from . import instrumentation, result_cache
+from .batch import url_normalize_enumerate, url_normalize_list, url_normalize_many
+from .normalized_url import NormalizedURL
+from .normalizer import NORMALIZATION_RULES_VERSION, Normalizer
+from .rules import RulesFile, load_rules
 from .url_humanize import url_humanize
-from .url_normalize import url_normalize
+from .url_normalize import (
+    is_normalized,
+    url_normalize,
+    url_normalize_structured,
+    warmup,
+)
+
+if TYPE_CHECKING:
+    from .aio import url_normalize_many_async
+    from .columnar import url_normalize_array
+    from .dedupe import url_dedupe
+    from .fingerprint import url_fingerprint, url_fingerprint_many
+    from .parallel import url_normalize_parallel
 
 __license__ = "MIT"
 __version__ = "3.0.0"
 
-__all__ = ["url_humanize", "url_normalize"]
+__all__ = [
+    "NORMALIZATION_RULES_VERSION",
+    "NormalizedURL",
+    "Normalizer",
+    "RulesFile",
+    "instrumentation",
+    "is_normalized",
+    "load_rules",
+    "result_cache",
+    "url_dedupe",
+    "url_fingerprint",
+    "url_fingerprint_many",
+    "url_humanize",
+    "url_normalize",
+    "url_normalize_array",
+    "url_normalize_enumerate",
+    "url_normalize_list",
+    "url_normalize_many",
+    "url_normalize_many_async",
+    "url_normalize_parallel",
+    "url_normalize_structured",
+    "warmup",
+]
+
+# Public names whose modules import asyncio, concurrent.futures or hashlib,
+# loaded on first access to keep `import url_normalize` fast
+_LAZY_ATTRIBUTES = {
+    "url_dedupe": ".dedupe",
+    "url_fingerprint": ".fingerprint",
+    "url_fingerprint_many": ".fingerprint",
+    "url_normalize_array": ".columnar",
+    "url_normalize_many_async": ".aio",
+    "url_normalize_parallel": ".parallel",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the module of a lazily loaded public name."""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names, including the lazily loaded ones."""
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
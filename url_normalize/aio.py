@@ -0,0 +1,152 @@
+"""Asynchronous batch URL normalization."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from .url_normalize import get_str_normalizer
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+    from concurrent.futures import Executor
+
+DEFAULT_ASYNC_CHUNK_SIZE = 500
+DEFAULT_CONCURRENCY = 2
+
+
+def _normalize_chunk(normalizer: Callable[[Any], str | None], chunk: list) -> list:
+    """Normalize a chunk of URLs in an executor."""
+    return list(map(normalizer, chunk))
+
+
+async def _chunks(
+    urls: Iterable[str | None] | AsyncIterable[str | None],
+    chunk_size: int,
+) -> AsyncIterator[list]:
+    """Group a sync or async iterable of URLs into lists."""
+    chunk: list = []
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:
+            chunk.append(url)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for url in urls:
+            chunk.append(url)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+                # Let other tasks run between chunks of a long sync iterable
+                await asyncio.sleep(0)
+    if chunk:
+        yield chunk
+
+
+async def _submit_chunks(  # noqa: PLR0913
+    normalizer: Callable[[Any], str | None],
+    urls: Iterable[str | None] | AsyncIterable[str | None],
+    queue: asyncio.Queue[asyncio.Future | None],
+    slots: asyncio.Semaphore,
+    chunk_size: int,
+    executor: Executor | None,
+) -> None:
+    """Submit chunks to the executor and queue their futures in input order.
+
+    At most as many chunks as the semaphore allows are submitted before the
+    consumer collects them. Errors raised by the input iterable are queued as
+    a failed future, and a final None marks the end of the input.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        async for chunk in _chunks(urls, chunk_size):
+            await slots.acquire()
+            await queue.put(
+                loop.run_in_executor(executor, _normalize_chunk, normalizer, chunk)
+            )
+    except Exception as e:  # noqa: BLE001
+        failed = loop.create_future()
+        failed.set_exception(e)
+        await queue.put(failed)
+    await queue.put(None)
+
+
+async def _normalize_async(
+    normalizer: Callable[[Any], str | None],
+    urls: Iterable[str | None] | AsyncIterable[str | None],
+    *,
+    chunk_size: int,
+    concurrency: int,
+    executor: Executor | None,
+) -> AsyncIterator[str | None]:
+    """Yield normalized URLs while chunks are normalized in the background."""
+    queue: asyncio.Queue[asyncio.Future | None] = asyncio.Queue(concurrency + 1)
+    slots = asyncio.Semaphore(concurrency)
+    producer = asyncio.ensure_future(
+        _submit_chunks(normalizer, urls, queue, slots, chunk_size, executor)
+    )
+    try:
+        while (future := await queue.get()) is not None:
+            try:
+                results = await future
+            finally:
+                slots.release()
+            for url in results:
+                yield url
+        await producer
+    finally:
+        producer.cancel()
+        while not queue.empty():
+            pending = queue.get_nowait()
+            if pending is not None:
+                pending.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def url_normalize_many_async(
+    urls: Iterable[str | None] | AsyncIterable[str | None],
+    *,
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    executor: Executor | None = None,
+    **options: Any,  # noqa: ANN401
+) -> AsyncIterator[str | None]:
+    """Normalize URLs off the event loop, yielding results in input order.
+
+    URLs are read from a sync or async iterable and grouped in chunks, and
+    each chunk is normalized in one executor call, which amortizes the
+    executor overhead over many URLs. At most `concurrency` chunks are
+    submitted ahead of the consumer, so a slow consumer applies
+    backpressure to the input. Close the iterator (e.g. with
+    contextlib.aclosing) when not consuming it to the end.
+
+    Params:
+        urls: Sync or async iterable of URLs to normalize
+        chunk_size: Number of URLs normalized per executor call; smaller
+            chunks lower latency, larger ones raise throughput
+        concurrency: Maximum number of chunks submitted ahead of the consumer
+        executor: Executor running the chunks, defaults to the event loop's
+            default executor; a ProcessPoolExecutor uses several CPU cores
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        Async iterator over normalized URLs, one per input URL
+
+    Raises:
+        ValueError: If chunk_size or concurrency is not positive
+        TypeError: If an unknown option or return_bytes is given
+        LookupError: If the charset is not a known codec
+
+    """
+    if chunk_size < 1 or concurrency < 1:
+        msg = "chunk_size and concurrency must be positive integers"
+        raise ValueError(msg)
+    normalizer = get_str_normalizer(**options)
+    return _normalize_async(
+        normalizer,
+        urls,
+        chunk_size=chunk_size,
+        concurrency=concurrency,
+        executor=executor,
+    )
@@ -0,0 +1,69 @@
+"""Batch URL normalization."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .url_normalize import get_str_normalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+def url_normalize_many(
+    urls: Iterable[str | None],
+    **options: Any,  # noqa: ANN401
+) -> Iterator[str | None]:
+    """Normalize URLs lazily, in input order.
+
+    Options are validated once and a single Normalizer is shared by the whole
+    batch. The input is consumed one URL at a time, so unbounded iterables can
+    be processed with flat memory.
+
+    Params:
+        urls: Iterable of URLs to normalize
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        Iterator over normalized URLs, one per input URL
+
+    Raises:
+        TypeError: If an unknown option or return_bytes is given
+        LookupError: If the charset is not a known codec
+
+    """
+    return map(get_str_normalizer(**options), urls)
+
+
+def url_normalize_enumerate(
+    urls: Iterable[str | None],
+    **options: Any,  # noqa: ANN401
+) -> Iterator[tuple[int, str | None]]:
+    """Normalize URLs lazily, yielding results tagged with their input index.
+
+    Params:
+        urls: Iterable of URLs to normalize
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        Iterator over (index, normalized URL) pairs in input order
+
+    """
+    return enumerate(url_normalize_many(urls, **options))
+
+
+def url_normalize_list(
+    urls: Iterable[str | None],
+    **options: Any,  # noqa: ANN401
+) -> list[str | None]:
+    """Normalize URLs and return the results as a list.
+
+    Params:
+        urls: Iterable of URLs to normalize
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        List of normalized URLs, one per input URL
+
+    """
+    return list(url_normalize_many(urls, **options))
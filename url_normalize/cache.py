@@ -0,0 +1,204 @@
+"""Thread-safe LRU caches used by normalization stages."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics snapshot.
+
+    Hit, miss and eviction counters accumulated since the last clear,
+    together with the configured and current number of entries.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class _WeightedLRUCache(Generic[K, V]):
+    """Least-recently-used mapping bounded by the total weight of its entries.
+
+    Each entry weighs 1 unless a subclass overrides _weigh; its weight is
+    computed once, when it is stored, and entries heavier than the limit
+    are not stored. Safe for concurrent use.
+    """
+
+    __slots__ = (
+        "_data",
+        "_evictions",
+        "_hits",
+        "_limit",
+        "_lock",
+        "_misses",
+        "_weight",
+    )
+
+    # Name of the limit in error messages
+    _limit_name = "maxsize"
+
+    _data: OrderedDict[K, tuple[V, int]]
+    _evictions: int
+    _hits: int
+    _limit: int
+    _lock: threading.Lock
+    _misses: int
+    _weight: int
+
+    def __init__(self, limit: int) -> None:
+        """Create an empty cache holding entries of at most limit in total."""
+        self._check_limit(limit)
+        self._limit = limit
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._weight = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _check_limit(self, limit: int) -> None:
+        if limit < 0:
+            msg = f"{self._limit_name} must be a non-negative integer"
+            raise ValueError(msg)
+
+    def _weigh(self, key: K, value: V) -> int:  # noqa: ARG002
+        """Return the weight of an entry towards the limit."""
+        return 1
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for key, or None if it is not cached."""
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        weight = self._weigh(key, value)
+        if weight > self._limit:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[1]
+            self._data[key] = (value, weight)
+            self._weight += weight
+            self._evict(self._limit)
+
+    def resize(self, limit: int) -> None:
+        """Change the maximum total weight of the entries, evicting as needed."""
+        self._check_limit(limit)
+        with self._lock:
+            self._limit = limit
+            self._evict(limit)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics counters."""
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def _evict(self, limit: int) -> None:
+        while self._weight > limit:
+            _, (_, weight) = self._data.popitem(last=False)
+            self._weight -= weight
+            self._evictions += 1
+
+
+class LRUCache(_WeightedLRUCache[K, V]):
+    """Bounded least-recently-used mapping safe for concurrent use.
+
+    A maxsize of 0 disables caching: lookups always miss and nothing is stored.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache holding at most maxsize entries."""
+        super().__init__(maxsize)
+
+    def info(self) -> CacheInfo:
+        """Return a snapshot of the cache statistics."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self._limit,
+                currsize=len(self._data),
+            )
+
+
+class SizedCacheInfo(NamedTuple):
+    """Statistics snapshot of a cache bounded by size in bytes.
+
+    Hit, miss and eviction counters accumulated since the last clear,
+    together with the configured and current approximate size in bytes and
+    the current number of entries.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxbytes: int
+    currbytes: int
+    currsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups that were hits, 0.0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SizedLRUCache(_WeightedLRUCache[K, V]):
+    """Least-recently-used mapping bounded by the size of its entries.
+
+    The size of each entry is estimated once, when it is stored, by the
+    sizeof function; entries larger than maxbytes are not stored. Safe for
+    concurrent use.
+    """
+
+    __slots__ = ("_sizeof",)
+
+    _limit_name = "maxbytes"
+
+    _sizeof: Callable[[K, V], int]
+
+    def __init__(self, maxbytes: int, sizeof: Callable[[K, V], int]) -> None:
+        """Create an empty cache holding entries of at most maxbytes in total."""
+        super().__init__(maxbytes)
+        self._sizeof = sizeof
+
+    def _weigh(self, key: K, value: V) -> int:
+        """Return the estimated size of an entry in bytes."""
+        return self._sizeof(key, value)
+
+    def info(self) -> SizedCacheInfo:
+        """Return a snapshot of the cache statistics."""
+        with self._lock:
+            return SizedCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxbytes=self._limit,
+                currbytes=self._weight,
+                currsize=len(self._data),
+            )
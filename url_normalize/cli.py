@@ -1,28 +1,153 @@
 #!/usr/bin/env python
 """Command line interface for url-normalize."""
 
+from __future__ import annotations
+
 import argparse
+import os
 import sys
-from importlib.metadata import version
+from functools import partial
+from itertools import tee
+from typing import IO, TYPE_CHECKING, Any
 
+from . import instrumentation
+from .rules import load_rules
+from .tools import force_unicode
 from .url_humanize import url_humanize
-from .url_normalize import url_normalize
+from .url_normalize import (
+    get_normalizer,
+    get_str_normalizer,
+    is_normalized,
+    url_normalize,
+)
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .dedupe import Deduplicator
+    from .normalizer import Normalizer
+
+# Flush bulk output once this many characters are buffered
+OUTPUT_BUFFER_SIZE = 1 << 16
+# Read NUL-delimited input in chunks of this many bytes
+INPUT_CHUNK_SIZE = 1 << 16
 
-def main() -> None:
-    """Parse arguments and run url_normalize."""
-    # Force UTF-8 output to prevent UnicodeEncodeError on Windows
-    if hasattr(sys.stdout, "reconfigure"):
-        sys.stdout.reconfigure(encoding="utf-8", errors="backslashreplace")
 
+class _VersionAction(argparse.Action):
+    """Print the installed version, looked up only when requested."""
+
+    def __init__(
+        self,
+        option_strings: list[str],
+        dest: str,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Accept no argument, like the built-in version action."""
+        kwargs.setdefault("help", "show program's version number and exit")
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,  # noqa: ARG002
+        values: object,  # noqa: ARG002
+        option_string: str | None = None,  # noqa: ARG002
+    ) -> None:
+        """Print the version and exit."""
+        # importlib.metadata is slow to import, which matters for a CLI
+        from importlib.metadata import version
+
+        print(f"{parser.prog} {version('url-normalize')}")  # noqa: T201
+        parser.exit()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
     parser = argparse.ArgumentParser(description="Normalize a URL.")
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"%(prog)s {version('url-normalize')}",
+        action=_VersionAction,
+    )
+    parser.add_argument("url", nargs="?", help="The URL to normalize.")
+    parser.add_argument(
+        "-i",
+        "--input",
+        metavar="FILE",
+        help="Normalize newline-delimited URLs read from FILE ('-' for stdin).",
+    )
+    parser.add_argument(
+        "-0",
+        "--null",
+        action="store_true",
+        help="With --input, read and write NUL-delimited URLs instead of lines.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "With --input, normalize on N worker processes (0: one per CPU). "
+            "A regular FILE is memory-mapped and split into one range of "
+            "lines per worker."
+        ),
+    )
+    parser.add_argument(
+        "--shard-dir",
+        metavar="DIR",
+        help=(
+            "With --input FILE and --jobs, write the results of each worker "
+            "to its own file DIR/part-NNNNN instead of stdout."
+        ),
+    )
+    parser.add_argument(
+        "-u",
+        "--dedupe",
+        action="store_true",
+        help=(
+            "With --input, only print the first URL of each normalized form, "
+            "as given, and report the number of duplicates on stderr."
+        ),
+    )
+    parser.add_argument(
+        "--bloom",
+        type=int,
+        metavar="N",
+        help=(
+            "With --dedupe, remember URLs in a Bloom filter sized for N distinct "
+            "URLs instead of an exact set, bounding memory at the cost of rare "
+            "false duplicates."
+        ),
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        metavar="P",
+        help="With --bloom, the target false-positive rate. Default: 0.001",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-stage call counts and latencies on stderr when done.",
+    )
+    parser.add_argument(
+        "--stats-sample",
+        type=int,
+        default=instrumentation.DEFAULT_SAMPLE_RATE,
+        metavar="N",
+        help="With --stats, only time 1 in N URLs. Default: 1",
+    )
+    parser.add_argument(
+        "-C",
+        "--check",
+        action="store_true",
+        help=(
+            "Print the URLs that are not normalized instead of normalizing them, "
+            "and exit with status 1 if there are any."
+        ),
     )
-    parser.add_argument("url", help="The URL to normalize.")
     parser.add_argument(
         "-c",
         "--charset",
@@ -53,32 +178,446 @@ def main() -> None:
         type=str,
         help="Comma-separated list of query parameters to allow (e.g., 'q,id').",
     )
+    parser.add_argument(
+        "-t",
+        "--strip-tracking",
+        action="store_true",
+        help="Remove known tracking parameters (utm_*, fbclid, ...) on any host.",
+    )
+    parser.add_argument(
+        "--param-denylist",
+        type=str,
+        help=(
+            "Comma-separated list of query parameters to remove with "
+            "--strip-tracking instead of the default ones; 'name*' removes "
+            "parameters starting with 'name' (e.g., 'utm_*,ref')."
+        ),
+    )
+    parser.add_argument(
+        "--rules",
+        metavar="FILE",
+        type=str,
+        help=(
+            "JSON or TOML file with the 'allowlist' and 'denylist' used by "
+            "--filter-params and --strip-tracking."
+        ),
+    )
+    parser.add_argument(
+        "--sort-params",
+        action="store_true",
+        help=(
+            "Sort query parameters by key, keeping the order of the values of "
+            "a repeated key."
+        ),
+    )
+    parser.add_argument(
+        "--sort-param-values",
+        action="store_true",
+        help="With --sort-params, also sort the values of a repeated key.",
+    )
+    parser.add_argument(
+        "--collapse-params",
+        action="store_true",
+        help="Keep only the first of identical query parameters.",
+    )
     parser.add_argument(
         "-H",
         "--humanize",
         action="store_true",
         help="Print a human-readable URL that normalizes to the same value.",
     )
+    return parser
 
-    args = parser.parse_args()
 
-    allowlist = args.param_allowlist.split(",") if args.param_allowlist else None
-    transform_url = url_humanize if args.humanize else url_normalize
+def _build_deduplicator(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> Deduplicator | None:
+    """Validate the deduplication arguments and build the deduplicator."""
+    if not args.dedupe:
+        if args.bloom is not None:
+            parser.error("argument --bloom: requires -u/--dedupe")
+        return None
+    if args.input is None:
+        parser.error("argument -u/--dedupe: requires -i/--input")
+    if args.check:
+        parser.error("argument -u/--dedupe: not allowed with argument -C/--check")
+    # hashlib is slow to import, only load it when deduplicating
+    from .dedupe import DEFAULT_ERROR_RATE, Deduplicator
+
+    if args.bloom is None:
+        return Deduplicator("exact")
+    error_rate = DEFAULT_ERROR_RATE if args.error_rate is None else args.error_rate
+    try:
+        return Deduplicator("bloom", capacity=args.bloom, error_rate=error_rate)
+    except ValueError as e:
+        parser.error(f"argument --bloom: {e}")
+
+
+def _check_shard_dir(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Validate --shard-dir against the input and the other arguments."""
+    if args.dedupe:
+        parser.error("argument --shard-dir: not allowed with argument -u/--dedupe")
+    regular_file = args.input is not None and os.path.isfile(args.input)  # noqa: PTH113
+    if args.jobs == 1 or not regular_file:
+        parser.error(
+            "argument --shard-dir: requires -j/--jobs and a regular -i/--input FILE"
+        )
+    if not os.path.isdir(args.shard_dir):  # noqa: PTH112
+        parser.error(f"argument --shard-dir: not a directory: {args.shard_dir}")
+
+
+def _check_url(url: str, **options: object) -> str | None:
+    """Return the URL if it is not normalized, None otherwise."""
+    return None if is_normalized(url, **options) else url
+
 
+def _check_normalized(normalizer: Normalizer, url: str) -> str | None:
+    """Return the URL if normalizer changes it, None otherwise."""
+    return None if normalizer.is_normalized(url) else url
+
+
+def _param_lists(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> tuple[Any, Any]:
+    """Return the parameter allowlist and denylist given on the command line.
+
+    They come from -p/--param-allowlist and --param-denylist, or from the
+    --rules file, which cannot be combined with them.
+    """
+    allowlist = args.param_allowlist.split(",") if args.param_allowlist else None
+    denylist = args.param_denylist.split(",") if args.param_denylist else None
+    if args.rules is None:
+        return allowlist, denylist
+    if allowlist is not None:
+        parser.error("argument --rules: not allowed with argument -p/--param-allowlist")
+    if denylist is not None:
+        parser.error("argument --rules: not allowed with argument --param-denylist")
     try:
-        output_url = transform_url(
-            args.url,
+        rules = load_rules(args.rules)
+    except (OSError, TypeError, ValueError) as e:
+        parser.error(f"argument --rules: {e}")
+    return rules.param_allowlist, rules.param_denylist
+
+
+def _read_records(stream: IO[bytes], delimiter: bytes) -> Iterator[bytes]:
+    r"""Split a binary stream into delimiter-separated records.
+
+    Params:
+        stream: Binary input stream
+        delimiter: Record delimiter, b"\n" or b"\0"
+
+    Returns:
+        Iterator over records without their delimiters
+
+    """
+    if delimiter == b"\n":
+        for line in stream:
+            yield line.rstrip(b"\r\n")
+        return
+    pending = b""
+    while chunk := stream.read(INPUT_CHUNK_SIZE):
+        *records, pending = (pending + chunk).split(delimiter)
+        yield from records
+    if pending:
+        yield pending
+
+
+def _transform_records(
+    transform_url: Callable[[str], str | None],
+    urls: Iterable[str],
+) -> Iterator[tuple[int, str | None | Exception]]:
+    """Transform URLs one by one, returning errors in place of results."""
+    for index, url in enumerate(urls):
+        try:
+            yield index, transform_url(url)
+        except Exception as e:  # noqa: BLE001, PERF203
+            yield index, e
+
+
+def _normalize_stream(  # noqa: PLR0913
+    transform_url: Callable[[str], str | None],
+    stream: IO[bytes],
+    *,
+    name: str,
+    charset: str,
+    delimiter: str,
+    jobs: int = 1,
+    check: bool = False,
+    deduplicator: Deduplicator | None = None,
+) -> bool:
+    """Normalize every record of a stream and write the results to stdout.
+
+    Records that fail to normalize are reported on stderr as name:line and
+    skipped; processing continues with the next record.
+
+    Params:
+        transform_url: Function normalizing a single URL
+        stream: Binary input stream
+        name: Input name used in error messages
+        charset: Charset used to decode the input
+        delimiter: Record delimiter for both input and output
+        jobs: Number of worker processes, 0 for one per CPU
+        check: Only write the records transform_url returns, i.e. those
+            that are not normalized
+        deduplicator: Write the records whose results it has not seen
+            before, as given, instead of the results
+
+    Returns:
+        True if every record was normalized, or already normalized when
+        checking
+
+    """
+    urls: Iterator[str] = (
+        force_unicode(record, charset)
+        for record in _read_records(stream, delimiter.encode())
+    )
+    originals = None
+    if deduplicator is not None:
+        urls, originals = tee(urls)
+    if jobs == 1:
+        results = _transform_records(transform_url, urls)
+    else:
+        from .parallel import iter_parallel
+
+        results = iter_parallel(transform_url, urls, jobs=jobs or None)
+
+    ok = True
+    buffer: list[str] = []
+    buffered = 0
+    for index, output_url in results:
+        original = None if originals is None else next(originals)
+        if isinstance(output_url, Exception):
+            message = f"{name}:{index + 1}: Error normalizing URL: {output_url}"
+            print(message, file=sys.stderr)  # noqa: T201
+            ok = False
+            continue
+        if deduplicator is not None and not deduplicator.add(output_url):
+            continue
+        if check:
+            if output_url is None:
+                continue
+            ok = False
+        # Deduplicated records are written as given, like url_dedupe does
+        line = (output_url if original is None else original) or ""
+        buffer.append(line)
+        buffer.append(delimiter)
+        buffered += len(line) + 1
+        if buffered >= OUTPUT_BUFFER_SIZE:
+            sys.stdout.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+    sys.stdout.write("".join(buffer))
+    sys.stdout.flush()
+    return ok
+
+
+def _uses_file_ranges(
+    args: argparse.Namespace,
+    deduplicator: Deduplicator | None,
+) -> bool:
+    """Check whether the input is normalized one file range per worker."""
+    return (
+        args.jobs != 1
+        and deduplicator is None
+        and args.input != "-"
+        and os.path.isfile(args.input)  # noqa: PTH113
+    )
+
+
+def _normalize_file_ranges(
+    transform_url: Callable[[str], str | None],
+    args: argparse.Namespace,
+    delimiter: str,
+) -> bool:
+    """Normalize a regular file on worker processes, one range each.
+
+    Results go to the shards in --shard-dir, or are merged to stdout in
+    input order. Records that fail are reported on stderr as file:line.
+
+    Returns:
+        True if every record was normalized, or already normalized when
+        checking
+
+    """
+    import tempfile
+
+    from .file_ranges import copy_shard, normalize_file_ranges
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = normalize_file_ranges(
+            transform_url,
+            args.input,
+            args.shard_dir or temp_dir,
+            jobs=args.jobs or None,
             charset=args.charset,
-            default_scheme=args.default_scheme,
-            default_domain=args.default_domain,
-            filter_params=args.filter_params,
-            param_allowlist=allowlist,
+            delimiter=delimiter.encode(),
+            check=args.check,
         )
+        ok = True
+        sys.stdout.flush()
+        for result in results:
+            for line, message in result.errors:
+                print(  # noqa: T201
+                    f"{args.input}:{line}: Error normalizing URL: {message}",
+                    file=sys.stderr,
+                )
+            ok = ok and not result.errors and not (args.check and result.written)
+            if args.shard_dir is None:
+                copy_shard(result.path, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    return ok
+
+
+def _normalize_input(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    transform_url: Callable[[str], str | None],
+    deduplicator: Deduplicator | None,
+) -> bool:
+    """Transform the records of the -i/--input file or stdin.
+
+    Returns:
+        True if every record was normalized, or already normalized when
+        checking
+
+    """
+    delimiter = "\0" if args.null else "\n"
+    if args.input == "-":
+        return _normalize_stream(
+            transform_url,
+            sys.stdin.buffer,
+            name="<stdin>",
+            charset=args.charset,
+            delimiter=delimiter,
+            jobs=args.jobs,
+            check=args.check,
+            deduplicator=deduplicator,
+        )
+    try:
+        if _uses_file_ranges(args, deduplicator):
+            return _normalize_file_ranges(transform_url, args, delimiter)
+        with open(args.input, "rb") as stream:  # noqa: PTH123
+            return _normalize_stream(
+                transform_url,
+                stream,
+                name=args.input,
+                charset=args.charset,
+                delimiter=delimiter,
+                jobs=args.jobs,
+                check=args.check,
+                deduplicator=deduplicator,
+            )
+    except OSError as e:
+        parser.error(f"argument -i/--input: {e}")
+
+
+def _run(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    transform_url: Callable[[str], str | None],
+    deduplicator: Deduplicator | None,
+) -> None:
+    """Transform the URL argument or the input records, exiting on failure."""
+    if args.input is not None:
+        ok = _normalize_input(parser, args, transform_url, deduplicator)
+        if deduplicator is not None:
+            stats = deduplicator.stats
+            print(  # noqa: T201
+                f"{stats.total} URLs, {stats.unique} unique, "
+                f"{stats.duplicates} duplicates removed",
+                file=sys.stderr,
+            )
+        if not ok:
+            sys.exit(1)
+        return
+
+    try:
+        output_url = transform_url(args.url)
     except Exception as e:  # noqa: BLE001
         print(f"Error normalizing URL: {e}", file=sys.stderr)  # noqa: T201
         sys.exit(1)
     else:
+        if args.check and output_url is None:
+            return
         print(output_url)  # noqa: T201
+        if args.check:
+            sys.exit(1)
+
+
+def _check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Validate the arguments that depend on each other."""
+    if args.url is None and args.input is None:
+        parser.error("the following arguments are required: url")
+    if args.url is not None and args.input is not None:
+        parser.error("argument url: not allowed with argument -i/--input")
+    if args.jobs < 0:
+        parser.error("argument -j/--jobs: must not be negative")
+    if args.shard_dir is not None:
+        _check_shard_dir(parser, args)
+    if args.check and args.humanize:
+        parser.error("argument -C/--check: not allowed with argument -H/--humanize")
+    if args.sort_param_values and not args.sort_params:
+        parser.error("argument --sort-param-values: requires --sort-params")
+    if args.stats_sample < 1:
+        parser.error("argument --stats-sample: must be a positive integer")
+    if args.stats and args.jobs != 1:
+        parser.error("argument --stats: not allowed with argument -j/--jobs")
+
+
+def _build_transform(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> Callable[[str], str | None]:
+    """Build the URL transform selected by the arguments."""
+    allowlist, denylist = _param_lists(parser, args)
+    options: dict[str, Any] = {
+        "charset": args.charset,
+        "default_scheme": args.default_scheme,
+        "default_domain": args.default_domain,
+        "filter_params": args.filter_params,
+        "param_allowlist": allowlist,
+        "strip_tracking_params": args.strip_tracking,
+        "param_denylist": denylist,
+        "sort_params": args.sort_params,
+        "sort_param_values": args.sort_param_values,
+        "collapse_params": args.collapse_params,
+    }
+    if args.rules is not None and not args.humanize:
+        # Rules files can be large: look up their normalizer once, not per URL
+        if args.check:
+            return partial(_check_normalized, get_normalizer(**options))
+        return get_str_normalizer(**options)
+    if args.check:
+        return partial(_check_url, **options)
+    if args.humanize:
+        return partial(url_humanize, **options)
+    return partial(url_normalize, **options)
+
+
+def main() -> None:
+    """Parse arguments and run url_normalize."""
+    # Force UTF-8 output to prevent UnicodeEncodeError on Windows
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8", errors="backslashreplace")
+
+    parser = _build_parser()
+    args = parser.parse_args()
+    _check_args(parser, args)
+    deduplicator = _build_deduplicator(parser, args)
+    transform_url = _build_transform(parser, args)
+    if args.stats:
+        instrumentation.enable(sample_rate=args.stats_sample)
+
+    try:
+        _run(parser, args, transform_url, deduplicator)
+    finally:
+        if args.stats:
+            print(  # noqa: T201
+                instrumentation.format_snapshot(instrumentation.snapshot()),
+                file=sys.stderr,
+            )
+            instrumentation.disable()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""URL normalization of NumPy and PyArrow arrays.
+
+NumPy and PyArrow are optional dependencies, installed with the `numpy` and
+`arrow` extras. They are imported when an array of theirs is normalized.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .url_normalize import get_str_normalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# NumPy dtype kinds of Python objects, fixed-width and variable-width strings
+NUMPY_STRING_KINDS = frozenset("OUT")
+
+
+def _normalize_unique(normalizer: Callable[[Any], str | None], uniques: list) -> list:
+    """Normalize each distinct value once."""
+    return [normalizer(value) for value in uniques]
+
+
+def _normalize_numpy(normalizer: Callable[[Any], str | None], values: Any) -> Any:  # noqa: ANN401
+    """Normalize a NumPy array of strings or Python objects.
+
+    Object arrays are factorized with a dict, so None and other hashable
+    values are kept apart from strings; string arrays are factorized with
+    numpy.unique. The output has the shape of the input and the same dtype
+    kind; fixed-width string arrays are widened to the longest result.
+    """
+    import numpy as np
+
+    kind = values.dtype.kind
+    if kind not in NUMPY_STRING_KINDS:
+        msg = f"expected a string or object array, got dtype {values.dtype}"
+        raise TypeError(msg)
+    flat = values.ravel()
+    if kind == "O":
+        index: dict = {}
+        codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in flat),
+            dtype=np.intp,
+            count=flat.size,
+        )
+        uniques = list(index)
+    else:
+        unique_values, codes = np.unique(flat, return_inverse=True)
+        uniques = unique_values.tolist()
+    normalized = np.empty(len(uniques), dtype=object)
+    normalized[:] = _normalize_unique(normalizer, uniques)
+    result = normalized[codes.ravel()].reshape(values.shape)
+    if kind == "U":
+        return result.astype(str)
+    if kind == "T":
+        return result.astype(values.dtype)
+    return result
+
+
+def _normalize_arrow(normalizer: Callable[[Any], str | None], values: Any) -> Any:  # noqa: ANN401
+    """Normalize a PyArrow string Array or ChunkedArray.
+
+    Dictionary-encoded arrays only have their dictionary normalized. Other
+    arrays are factorized with pyarrow.compute.unique and index_in, and the
+    normalized values are gathered back with take. Nulls stay null.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    value_type = values.type
+    if pa.types.is_dictionary(value_type):
+        if isinstance(values, pa.ChunkedArray):
+            return pa.chunked_array(
+                [_normalize_arrow(normalizer, chunk) for chunk in values.chunks],
+                type=value_type,
+            )
+        dictionary = _normalize_arrow(normalizer, values.dictionary)
+        return pa.DictionaryArray.from_arrays(values.indices, dictionary)
+    if not (
+        pa.types.is_string(value_type)
+        or pa.types.is_large_string(value_type)
+        or pa.types.is_string_view(value_type)
+    ):
+        msg = f"expected a string array, got type {value_type}"
+        raise TypeError(msg)
+    if pa.types.is_string_view(value_type):
+        # index_in has no string_view kernel
+        result = _normalize_arrow(normalizer, values.cast(pa.large_string()))
+        return result.cast(value_type)
+    uniques = pc.unique(values)
+    normalized = pa.array(
+        _normalize_unique(normalizer, uniques.to_pylist()), type=value_type
+    )
+    return pc.take(normalized, pc.index_in(values, value_set=uniques))
+
+
+def url_normalize_array(values: Any, **options: Any) -> Any:  # noqa: ANN401
+    """Normalize an array of URLs, normalizing each distinct URL once.
+
+    The array is factorized into its distinct values, which are normalized
+    and scattered back into a new array of the same type, so columns with
+    repeated URLs cost one normalization per distinct URL. Missing values
+    are handled like url_normalize does: None and nulls stay missing, and
+    empty strings stay empty.
+
+    Params:
+        values: NumPy array of strings or Python objects, or PyArrow string
+            Array, ChunkedArray or dictionary-encoded array
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        Array of normalized URLs of the same type as the input
+
+    Raises:
+        TypeError: If the array type is not supported, or an unknown option
+            or return_bytes is given
+        LookupError: If the charset is not a known codec
+
+    """
+    normalizer = get_str_normalizer(**options)
+    module = type(values).__module__.partition(".")[0]
+    if module == "pyarrow":
+        return _normalize_arrow(normalizer, values)
+    if module == "numpy":
+        return _normalize_numpy(normalizer, values)
+    msg = f"expected a NumPy or PyArrow array, got {type(values).__name__}"
+    raise TypeError(msg)
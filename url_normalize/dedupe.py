@@ -0,0 +1,245 @@
+"""Streaming URL deduplication by normalized form."""
+
+from __future__ import annotations
+
+import math
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any
+
+from .url_normalize import get_str_normalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+DEDUPE_MODES = ("exact", "bloom")
+DEFAULT_BLOOM_CAPACITY = 10_000_000
+DEFAULT_ERROR_RATE = 0.001
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+class DedupeStats:
+    """Running counts of a deduplication.
+
+    In Bloom filter mode, a URL seen for the first time is counted as a
+    duplicate when it is a false positive of the filter.
+    """
+
+    __slots__ = ("total", "unique")
+
+    def __init__(self) -> None:
+        """Start with no URLs seen."""
+        self.total = 0
+        self.unique = 0
+
+    @property
+    def duplicates(self) -> int:
+        """Number of URLs dropped as duplicates."""
+        return self.total - self.unique
+
+    def __repr__(self) -> str:
+        """Return the counts for debugging."""
+        return (
+            f"DedupeStats(total={self.total}, unique={self.unique}, "
+            f"duplicates={self.duplicates})"
+        )
+
+
+class ExactFilter:
+    """Set of keys, remembering every key exactly."""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self) -> None:
+        """Create an empty filter."""
+        self._keys: set[str] = set()
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys added."""
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key was added."""
+        return key in self._keys
+
+    def add(self, key: str) -> bool:
+        """Add a key, returning True if it was not added before."""
+        size = len(self._keys)
+        self._keys.add(key)
+        return len(self._keys) != size
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of keys.
+
+    Memory is bounded by the capacity given up front: about 1.8 bytes per
+    key at a 0.1% false-positive rate. Keys never added can be reported as
+    present (false positives), at about the configured rate as long as at
+    most capacity keys are added; keys added are always reported present.
+    Bit positions come from a 128-bit BLAKE2b digest of the key, split in
+    two 64-bit hashes combined by double hashing.
+    """
+
+    __slots__ = ("_bits", "capacity", "count", "error_rate", "hash_count", "size")
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_BLOOM_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        """Create an empty filter sized for capacity keys.
+
+        Params:
+            capacity: Expected number of distinct keys
+            error_rate: Target false-positive rate once capacity keys are
+                added, between 0 and 1
+
+        Raises:
+            ValueError: If capacity is not positive or error_rate is not
+                between 0 and 1
+
+        """
+        if capacity < 1:
+            msg = "capacity must be a positive integer"
+            raise ValueError(msg)
+        if not 0 < error_rate < 1:
+            msg = "error_rate must be between 0 and 1"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal number of bits and hash functions for the target rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __len__(self) -> int:
+        """Return the number of keys added and reported as new."""
+        return self.count
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key was probably added."""
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array, in bytes."""
+        return len(self._bits)
+
+    def false_positive_rate(self) -> float:
+        """Estimate the current false-positive rate from the number of keys."""
+        fill = 1 - math.exp(-self.hash_count * self.count / self.size)
+        return fill**self.hash_count
+
+    def _positions(self, key: str) -> Iterator[int]:
+        """Return the bit positions of a key."""
+        digest = blake2b(key.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        value = int.from_bytes(digest, "little")
+        first = value & _HASH_MASK
+        second = (value >> _HASH_BITS) | 1
+        size = self.size
+        return ((first + index * second) % size for index in range(self.hash_count))
+
+    def add(self, key: str) -> bool:
+        """Add a key, returning True if it was probably not added before."""
+        bits = self._bits
+        new = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        self.count += new
+        return new
+
+
+class Deduplicator:
+    """Track which keys were seen, with exact or bounded-memory storage."""
+
+    __slots__ = ("_seen", "stats")
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        *,
+        capacity: int = DEFAULT_BLOOM_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        """Create a deduplicator that has seen nothing.
+
+        Params:
+            mode: "exact" to remember every key in a set, or "bloom" to use
+                a Bloom filter of bounded size
+            capacity: Expected number of distinct keys in "bloom" mode
+            error_rate: Target false-positive rate in "bloom" mode
+
+        Raises:
+            ValueError: If the mode or the Bloom filter parameters are invalid
+
+        """
+        self._seen: ExactFilter | BloomFilter
+        if mode == "exact":
+            self._seen = ExactFilter()
+        elif mode == "bloom":
+            self._seen = BloomFilter(capacity, error_rate)
+        else:
+            msg = f"mode must be one of {', '.join(DEDUPE_MODES)}, got {mode!r}"
+            raise ValueError(msg)
+        self.stats = DedupeStats()
+
+    def add(self, key: str | None) -> bool:
+        """Record a key, returning True if it was not seen before.
+
+        None and the empty string count as the same empty key.
+        """
+        new = self._seen.add(key or "")
+        self.stats.total += 1
+        self.stats.unique += new
+        return new
+
+
+def url_dedupe(
+    urls: Iterable[str | None],
+    *,
+    mode: str = "exact",
+    capacity: int = DEFAULT_BLOOM_CAPACITY,
+    error_rate: float = DEFAULT_ERROR_RATE,
+    stats: DedupeStats | None = None,
+    **options: Any,  # noqa: ANN401
+) -> Iterator[str | None]:
+    """Yield the URLs whose normalized form was not seen before.
+
+    URLs are normalized lazily, and each one is yielded as given if it is
+    the first with its normalized form. In "exact" mode every normalized
+    URL is kept in a set. In "bloom" mode memory is bounded by a Bloom
+    filter sized for capacity distinct URLs, at the cost of dropping about
+    error_rate of the distinct URLs as false duplicates.
+
+    Params:
+        urls: Iterable of URLs to deduplicate
+        mode: "exact" or "bloom"
+        capacity: Expected number of distinct URLs in "bloom" mode
+        error_rate: Target false-positive rate in "bloom" mode
+        stats: DedupeStats updated as the URLs are consumed
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        Iterator over the first URL of each normalized form, in input order
+
+    Raises:
+        ValueError: If the mode or the Bloom filter parameters are invalid
+        TypeError: If an unknown option or return_bytes is given
+        LookupError: If the charset is not a known codec
+
+    """
+    normalizer = get_str_normalizer(**options)
+    deduplicator = Deduplicator(mode, capacity=capacity, error_rate=error_rate)
+    if stats is not None:
+        deduplicator.stats = stats
+    return (url for url in urls if deduplicator.add(normalizer(url)))
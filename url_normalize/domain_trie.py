@@ -0,0 +1,114 @@
+"""Trie of per-domain values shared by the parameter allowlist and denylist."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+V = TypeVar("V")
+W = TypeVar("W")
+
+
+def _domain_labels(host: str) -> list[str]:
+    """Split a host, optionally with a port, into labels from the last one."""
+    domain = host.lower().partition(":")[0].strip(".")
+    return domain.split(".")[::-1]
+
+
+class _DomainNode(Generic[V]):
+    """Trie node of a domain, keyed by its last label in its parent node."""
+
+    __slots__ = ("children", "value")
+
+    children: dict[str, _DomainNode[V]]
+    # Value of the domain, None if it is not listed
+    value: V | None
+
+    def __init__(self) -> None:
+        """Create a node without a value or subdomains."""
+        self.children = {}
+        self.value = None
+
+
+class DomainTrie(Generic[V]):
+    """Values of domains, keyed by reversed host labels.
+
+    A host gets the value of its closest listed parent domain, e.g.
+    'news.google.com' gets the value of 'google.com'. Looking a host up
+    walks the trie once, one label at a time.
+    """
+
+    __slots__ = ("_root",)
+
+    _root: _DomainNode[V]
+
+    def __init__(self) -> None:
+        """Create a trie without domains."""
+        self._root = _DomainNode()
+
+    def __bool__(self) -> bool:
+        """Check whether any domain is listed."""
+        return bool(self._root.children)
+
+    def add(self, domain: str, value: V) -> None:
+        """Set the value of a domain, replacing its previous one."""
+        node = self._root
+        for label in _domain_labels(domain):
+            node = node.children.setdefault(label, _DomainNode())
+        node.value = value
+
+    def lookup(self, host: str) -> V | None:
+        """Get the value of the closest listed parent domain of a host.
+
+        Params:
+            host: Host name, optionally with a port (e.g. 'www.google.com:80')
+
+        Returns:
+            The value of the host or its closest listed parent domain, or
+            None if none is listed
+
+        """
+        node = self._root
+        value = None
+        for label in _domain_labels(host):
+            child = node.children.get(label)
+            if child is None:
+                break
+            node = child
+            if node.value is not None:
+                value = node.value
+        return value
+
+    def inherit(self, combine: Callable[[W, V], W], root: W) -> DomainTrie[W]:
+        """Combine the value of each domain with those of its parent domains.
+
+        Params:
+            combine: Function of the combined value of the closest listed
+                parent domain and the value of a domain, returning the
+                combined value of the domain
+            root: Combined value of the domains without listed parents
+
+        Returns:
+            DomainTrie of the same domains with their combined values
+
+        """
+        trie: DomainTrie[W] = DomainTrie()
+        _inherit(self._root, trie._root, combine, root)
+        return trie
+
+
+def _inherit(
+    node: _DomainNode[V],
+    target: _DomainNode[W],
+    combine: Callable[[W, V], W],
+    inherited: W,
+) -> None:
+    """Copy the subdomains of node into target, combining their values."""
+    for label, child in node.children.items():
+        target_child = target.children[label] = _DomainNode()
+        child_inherited = inherited
+        if child.value is not None:
+            child_inherited = target_child.value = combine(inherited, child.value)
+        _inherit(child, target_child, combine, child_inherited)
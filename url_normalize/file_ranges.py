@@ -0,0 +1,266 @@
+"""Parallel normalization of a memory-mapped file, one byte range per worker.
+
+The file is split into byte ranges that end on a record delimiter, and each
+range is read from the memory map and normalized by its own worker process,
+which writes the results to its own output shard. No single process reads
+the whole input, and only record counts and errors are sent back.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, TYPE_CHECKING, NamedTuple
+
+from .tools import force_unicode
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+# Records are read from the memory map in blocks of about this many bytes
+BLOCK_SIZE = 1 << 20
+# Flush shard output once this many bytes are buffered
+OUTPUT_BUFFER_SIZE = 1 << 16
+SHARD_NAME = "part-{:05d}"
+
+
+class RangeResult(NamedTuple):
+    """Outcome of normalizing one byte range of a file.
+
+    Attributes:
+        range_index: Position of the range in the file
+        path: Output shard the results were written to
+        first_line: Line number of the first record of the range, from 1
+        records: Number of records in the range
+        written: Number of results written to the shard
+        errors: (line number, message) of each record that failed
+
+    """
+
+    range_index: int
+    path: str
+    first_line: int
+    records: int
+    written: int
+    errors: list[tuple[int, str]]
+
+
+def split_ranges(
+    data: mmap.mmap | bytes,
+    parts: int,
+    delimiter: bytes = b"\n",
+) -> list[tuple[int, int]]:
+    r"""Split a buffer into about equal byte ranges ending on a delimiter.
+
+    Params:
+        data: Memory-mapped file or bytes
+        parts: Maximum number of ranges
+        delimiter: Record delimiter, b"\n" or b"\0"
+
+    Returns:
+        Non-empty (start, end) ranges covering the buffer, in order; there
+        are fewer than parts when records are too long to split further
+
+    Raises:
+        ValueError: If parts is not positive
+
+    """
+    if parts < 1:
+        msg = "parts must be a positive integer"
+        raise ValueError(msg)
+    size = len(data)
+    ranges = []
+    start = 0
+    for part in range(1, parts + 1):
+        if start >= size:
+            break
+        end = size * part // parts
+        if end < size:
+            # Extend the range to the end of the record it cuts
+            end = data.find(delimiter, max(end, start + 1) - 1) + 1 or size
+        if end > start:
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_records(
+    data: mmap.mmap | bytes,
+    start: int,
+    end: int,
+    delimiter: bytes = b"\n",
+) -> Iterator[bytes]:
+    r"""Iterate over the records of a byte range, without their delimiters.
+
+    Records are split like the CLI reads streams: trailing carriage returns
+    are stripped from lines, and a final record is only yielded if it is not
+    empty.
+
+    Params:
+        data: Memory-mapped file or bytes
+        start: Offset of the first record
+        end: Offset just past the last record, as given by split_ranges
+        delimiter: Record delimiter, b"\n" or b"\0"
+
+    Returns:
+        Iterator over records
+
+    """
+    position = start
+    while position < end:
+        stop = min(position + BLOCK_SIZE, end)
+        if stop < end:
+            # Only copy whole records out of the map
+            cut = data.rfind(delimiter, position, stop)
+            stop = cut + 1 if cut >= 0 else data.find(delimiter, stop, end) + 1 or end
+        records = data[position:stop].split(delimiter)
+        if not records[-1]:
+            records.pop()
+        if delimiter == b"\n":
+            records = [record.rstrip(b"\r") for record in records]
+        yield from records
+        position = stop
+
+
+def _process_range(  # noqa: PLR0913
+    transform: Callable[[str], str | None],
+    path: str,
+    start: int,
+    end: int,
+    output: str,
+    *,
+    charset: str,
+    delimiter: bytes,
+    check: bool,
+) -> tuple[int, int, list[tuple[int, str]]]:
+    """Normalize the records of a byte range into an output shard.
+
+    Returns:
+        Number of records, number of results written, and the
+        (record index, message) of each record that failed
+
+    """
+    records = written = 0
+    errors: list[tuple[int, str]] = []
+    buffer: list[bytes] = []
+    buffered = 0
+    with (
+        open(path, "rb") as stream,  # noqa: PTH123
+        mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        open(output, "wb") as out,  # noqa: PTH123
+    ):
+        for index, record in enumerate(iter_records(data, start, end, delimiter)):
+            records += 1
+            try:
+                result = transform(force_unicode(record, charset))
+            except Exception as e:  # noqa: BLE001
+                errors.append((index, str(e)))
+                continue
+            if check and result is None:
+                continue
+            encoded = (result or "").encode("utf-8", "backslashreplace")
+            buffer.append(encoded)
+            buffer.append(delimiter)
+            buffered += len(encoded) + 1
+            written += 1
+            if buffered >= OUTPUT_BUFFER_SIZE:
+                out.write(b"".join(buffer))
+                buffer.clear()
+                buffered = 0
+        out.write(b"".join(buffer))
+    return records, written, errors
+
+
+def normalize_file_ranges(  # noqa: PLR0913
+    transform: Callable[[str], str | None],
+    path: str,
+    output_dir: str,
+    *,
+    jobs: int | None = None,
+    charset: str = "utf-8",
+    delimiter: bytes = b"\n",
+    check: bool = False,
+) -> Iterator[RangeResult]:
+    """Transform the records of a file on a process pool, one range per worker.
+
+    The file is memory-mapped and split with split_ranges into one range per
+    worker. Each worker maps the file itself, transforms the records of its
+    range and writes the results, each followed by the delimiter, to the
+    shard output_dir/part-NNNNN of its range, encoded in UTF-8. Records that
+    fail are skipped and reported with their line number in the file.
+
+    Params:
+        transform: Picklable function transforming one URL
+        path: Regular file to read
+        output_dir: Existing directory for the output shards
+        jobs: Number of worker processes, defaults to the number of CPUs
+        charset: Charset used to decode the records
+        delimiter: Record delimiter for both input and output
+        check: Only write the results that are not None
+
+    Returns:
+        Iterator over the RangeResult of each range, in file order, yielded
+        as soon as the range and all those before it are done
+
+    Raises:
+        ValueError: If jobs is not positive
+        OSError: If the file cannot be read or a shard cannot be written
+
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        msg = "jobs must be a positive integer"
+        raise ValueError(msg)
+    with open(path, "rb") as stream:  # noqa: PTH123
+        if os.fstat(stream.fileno()).st_size == 0:
+            return
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            ranges = split_ranges(data, jobs, delimiter)
+
+    outputs = [
+        os.path.join(output_dir, SHARD_NAME.format(index))  # noqa: PTH118
+        for index in range(len(ranges))
+    ]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges))) as executor:
+        futures = [
+            executor.submit(
+                _process_range,
+                transform,
+                path,
+                start,
+                end,
+                output,
+                charset=charset,
+                delimiter=delimiter,
+                check=check,
+            )
+            for (start, end), output in zip(ranges, outputs, strict=True)
+        ]
+        try:
+            first_line = 1
+            for index, (future, output) in enumerate(
+                zip(futures, outputs, strict=True)
+            ):
+                records, written, errors = future.result()
+                yield RangeResult(
+                    index,
+                    output,
+                    first_line,
+                    records,
+                    written,
+                    [(first_line + line, message) for line, message in errors],
+                )
+                first_line += records
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def copy_shard(path: str, out: IO[bytes]) -> None:
+    """Append an output shard to a binary stream and delete it."""
+    with open(path, "rb") as shard:  # noqa: PTH123
+        while chunk := shard.read(BLOCK_SIZE):
+            out.write(chunk)
+    os.unlink(path)  # noqa: PTH108
@@ -0,0 +1,291 @@
+"""Opt-in per-stage timing and event counters for URL normalization.
+
+Instrumentation is off by default. Every hook reads the module's `active`
+Recorder and does nothing when it is None: Normalizer does so once per URL
+before timing it, and the stages that count events once per event, e.g.
+per parameter dropped by filter_params.
+
+>>> from url_normalize import instrumentation, url_normalize
+>>> recorder = instrumentation.enable()
+>>> url_normalize("www.foo.com:80/foo")
+'https://www.foo.com:80/foo'
+>>> instrumentation.snapshot()["stages"]["deconstruct_url"]["count"]
+1
+>>> instrumentation.disable()
+"""
+
+from __future__ import annotations
+
+import threading
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import random
+
+DEFAULT_SAMPLE_RATE = 1
+DEFAULT_RESERVOIR_SIZE = 1024
+PERCENTILES = (50, 90, 99)
+# Name of the whole-pipeline pseudo-stage
+TOTAL_STAGE = "url_normalize"
+
+# Events recorded by the pipeline
+IDNA2003_FALLBACK = "idna2003_fallback"
+PARAM_DROPPED = "param_dropped"
+# URL answered by the result cache, without running the pipeline
+RESULT_CACHE_HIT = "result_cache_hit"
+
+T = TypeVar("T")
+
+
+class _StageStats:
+    """Call count, total and a reservoir sample of latencies of one stage."""
+
+    __slots__ = ("count", "max_ns", "reservoir", "total_ns")
+
+    count: int
+    total_ns: int
+    max_ns: int
+    reservoir: list[int]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.reservoir = []
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the latencies in microseconds."""
+        samples = sorted(self.reservoir)
+        summary: dict[str, Any] = {
+            "count": self.count,
+            "total_s": self.total_ns / 1e9,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+        }
+        for percentile in PERCENTILES:
+            # Nearest-rank percentile of the reservoir
+            rank = max(0, -(-percentile * len(samples) // 100) - 1)
+            summary[f"p{percentile}_us"] = samples[rank] / 1e3 if samples else 0.0
+        summary["max_us"] = self.max_ns / 1e3
+        return summary
+
+
+class Recorder:
+    """Collector of stage latencies and event counts.
+
+    Only 1 in sample_rate normalizations are timed, stage by stage; events
+    are counted every time they happen. Latency percentiles are estimated
+    from a uniform reservoir sample of reservoir_size timings per stage.
+    Recording is thread-safe.
+    """
+
+    __slots__ = (
+        "_lock",
+        "_random",
+        "_stages",
+        "calls",
+        "events",
+        "reservoir_size",
+        "sample_rate",
+    )
+
+    calls: int
+    events: dict[str, int]
+    reservoir_size: int
+    sample_rate: int
+    _lock: threading.Lock
+    _random: random.Random
+    _stages: dict[str, _StageStats]
+
+    def __init__(
+        self,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+    ) -> None:
+        """Create an empty recorder.
+
+        Params:
+            sample_rate: Time 1 in sample_rate normalizations
+            reservoir_size: Number of latencies kept per stage for percentiles
+
+        Raises:
+            ValueError: If sample_rate or reservoir_size is not positive
+
+        """
+        if sample_rate < 1 or reservoir_size < 1:
+            msg = "sample_rate and reservoir_size must be positive integers"
+            raise ValueError(msg)
+        self.sample_rate = sample_rate
+        self.reservoir_size = reservoir_size
+        self.calls = 0
+        self.events = {}
+        self._stages = {}
+        self._lock = threading.Lock()
+        import random
+
+        self._random = random.Random(0)  # noqa: S311
+
+    def sample(self) -> bool:
+        """Count a normalization and decide whether to time it."""
+        with self._lock:
+            sampled = self.calls % self.sample_rate == 0
+            self.calls += 1
+            return sampled
+
+    def record(self, timings: list[tuple[str, int]]) -> None:
+        """Add the stage latencies of one normalization, in nanoseconds."""
+        with self._lock:
+            for stage, elapsed in timings:
+                stats = self._stages.get(stage)
+                if stats is None:
+                    stats = self._stages[stage] = _StageStats()
+                stats.count += 1
+                stats.total_ns += elapsed
+                stats.max_ns = max(stats.max_ns, elapsed)
+                if len(stats.reservoir) < self.reservoir_size:
+                    stats.reservoir.append(elapsed)
+                else:
+                    index = self._random.randrange(stats.count)
+                    if index < self.reservoir_size:
+                        stats.reservoir[index] = elapsed
+
+    def event(self, name: str) -> None:
+        """Count one occurrence of an event."""
+        with self._lock:
+            self.events[name] = self.events.get(name, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the collected statistics as plain data.
+
+        Returns:
+            Dict with the number of normalizations ("calls"), the sample
+            rate, per-stage summaries ("stages": count, total seconds, mean,
+            percentiles and maximum in microseconds) in pipeline order, and
+            event counts ("events")
+
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "sample_rate": self.sample_rate,
+                "stages": {
+                    stage: stats.summary() for stage, stats in self._stages.items()
+                },
+                "events": dict(self.events),
+            }
+
+
+class StageTimer:
+    """Time consecutive pipeline stages of one normalization."""
+
+    __slots__ = ("_last", "_recorder", "_start", "_timings")
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Start timing the first stage."""
+        self._recorder = recorder
+        self._timings: list[tuple[str, int]] = []
+        self._start = self._last = perf_counter_ns()
+
+    def lap(self, stage: str, value: T) -> T:
+        """Record the time since the previous lap as stage, returning value.
+
+        Called as timer.lap("stage", stage_function(...)), so the lap covers
+        the evaluation of the stage.
+        """
+        now = perf_counter_ns()
+        self._timings.append((stage, now - self._last))
+        self._last = now
+        return value
+
+    def finish(self, stage: str) -> None:
+        """Record the total time as stage and send the timings to the recorder."""
+        self._timings.append((stage, perf_counter_ns() - self._start))
+        self._recorder.record(self._timings)
+
+
+# The active recorder, None while instrumentation is disabled
+active: Recorder | None = None
+# The recorder that was active before disable()
+_last: Recorder | None = None
+
+
+def enable(
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+) -> Recorder:
+    """Start recording into a new Recorder, replacing the active one.
+
+    Params:
+        sample_rate: Time 1 in sample_rate normalizations
+        reservoir_size: Number of latencies kept per stage for percentiles
+
+    Returns:
+        The active Recorder
+
+    """
+    global active  # noqa: PLW0603
+    active = Recorder(sample_rate, reservoir_size)
+    return active
+
+
+def disable() -> None:
+    """Stop recording. The last snapshot() stays available until enable()."""
+    global active, _last  # noqa: PLW0603
+    if active is not None:
+        _last = active
+    active = None
+
+
+def is_enabled() -> bool:
+    """Check whether instrumentation is recording."""
+    return active is not None
+
+
+def snapshot() -> dict[str, Any]:
+    """Return the statistics of the active or last recorder.
+
+    Returns:
+        Recorder.snapshot() of the active recorder, or of the last one if
+        instrumentation was disabled; empty statistics if it never ran
+
+    """
+    recorder = active or _last or Recorder()
+    return recorder.snapshot()
+
+
+def record_event(name: str) -> None:
+    """Count an event if instrumentation is enabled.
+
+    Hot paths check `active` themselves instead, to skip the call.
+    """
+    recorder = active
+    if recorder is not None:
+        recorder.event(name)
+
+
+def format_snapshot(stats: dict[str, Any]) -> str:
+    """Format a snapshot as a human-readable table."""
+    header = ["stage", "count", "total ms", "mean us"]
+    header += [f"p{percentile} us" for percentile in PERCENTILES]
+    header.append("max us")
+    rows = [header]
+    for stage, summary in stats["stages"].items():
+        row = [stage, str(summary["count"]), f"{summary['total_s'] * 1e3:.1f}"]
+        row.append(f"{summary['mean_us']:.1f}")
+        row += [f"{summary[f'p{percentile}_us']:.1f}" for percentile in PERCENTILES]
+        row.append(f"{summary['max_us']:.1f}")
+        rows.append(row)
+    widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+    lines = [f"{stats['calls']} URLs, 1 in {stats['sample_rate']} timed"]
+    lines += [
+        "  ".join(
+            [row[0].ljust(widths[0])]
+            + [
+                cell.rjust(width)
+                for cell, width in zip(row[1:], widths[1:], strict=True)
+            ]
+        )
+        for row in rows
+    ]
+    lines += [f"{name}: {count}" for name, count in sorted(stats["events"].items())]
+    return "\n".join(lines)
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from .tools import quote, unquote
+from .tools import is_canonical, requote
+
+FRAGMENT_SAFE_CHARS = "~="
 
 
 def normalize_fragment(fragment: str) -> str:
@@ -24,4 +26,17 @@ def normalize_fragment(fragment: str) -> str:
         Other sub-delimiters could potentially be added to the `safe` list if needed.
 
     """
-    return quote(unquote(fragment), safe="~=")
+    return requote(fragment, FRAGMENT_SAFE_CHARS)
+
+
+def is_normalized_fragment(fragment: str) -> bool:
+    """Check that a fragment is already normalized, without rebuilding it.
+
+    Params:
+        fragment : string : url fragment, e.g., 'fragment'
+
+    Returns:
+        bool : True if normalize_fragment(fragment) returns fragment unchanged.
+
+    """
+    return is_canonical(fragment, FRAGMENT_SAFE_CHARS)
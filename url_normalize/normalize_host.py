@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
-import idna
+from typing import NamedTuple
 
+from . import instrumentation
+from .cache import CacheInfo, LRUCache
 from .tools import force_unicode
 
 DEFAULT_CHARSET = "utf-8"
+DEFAULT_HOST_CACHE_SIZE = 4096
+MAX_LABEL_LENGTH = 63
+
+# Letters, digits and hyphen (LDH) labels are already in their final form
+LDH_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789-")
+
+
+class _Fallback(NamedTuple):
+    """Outcome of a host that IDNA2008 processing rejected.
+
+    The IDNA2003 fallback is the slowest path, and hosts it also fails on
+    would run it on every call, so both its result and its error are cached.
+    """
+
+    host: str
+    error: UnicodeError | None
+
+
+_host_cache: LRUCache[tuple[str | bytes, str], str | _Fallback] = LRUCache(
+    DEFAULT_HOST_CACHE_SIZE
+)
 
 
 def normalize_host(host: str, charset: str = DEFAULT_CHARSET) -> str:
@@ -14,6 +37,8 @@ def normalize_host(host: str, charset: str = DEFAULT_CHARSET) -> str:
 
     Lowercase and strip of final dot.
     Also, handle IDN domains using IDNA2008 with UTS46 processing.
+    Results, and errors of hosts that fail IDNA processing, are kept in a
+    bounded LRU cache, see host_cache_info().
 
     Params:
         host : string : url host, e.g., 'site.com'
@@ -22,17 +47,93 @@ def normalize_host(host: str, charset: str = DEFAULT_CHARSET) -> str:
     Returns:
         string : normalized host data.
 
+    Raises:
+        UnicodeError: If the host fails both IDNA2008 and IDNA2003 processing
+
     """
+    key = (host, charset)
+    result = _host_cache.get(key)
+    if result is None:
+        result = _normalize_host(host, charset)
+        _host_cache.put(key, result)
+    if isinstance(result, str):
+        return result
+    # Counted for cached hosts too, so counts follow the input, not the cache
+    recorder = instrumentation.active
+    if recorder is not None:
+        recorder.event(instrumentation.IDNA2003_FALLBACK)
+    if result.error is not None:
+        raise result.error.with_traceback(None)
+    return result.host
+
+
+def _normalize_host(host: str, charset: str) -> str | _Fallback:
     host = force_unicode(host, charset)
     host = host.lower()
+    if host.startswith("[") and host.find("]") == len(host) - 1:
+        # IP literals such as '[2001:db8::1]' are not domain names
+        return host
     host = host.strip(".")
 
     # Split domain into parts to handle each label separately
-    parts = host.split(".")
+    parts = [p for p in host.split(".") if p]
+    if all(map(_is_ldh_label, parts)):
+        return ".".join(parts)
+
+    # idna and its UTS46 tables are only loaded for hosts that need them
+    import idna
+
     try:
         # Process each label separately to handle mixed unicode/ascii domains
-        parts = [idna.encode(p, uts46=True).decode(charset) for p in parts if p]
+        parts = [
+            p if _is_ldh_label(p) else idna.encode(p, uts46=True).decode(charset)
+            for p in parts
+        ]
         return ".".join(parts)
     except idna.IDNAError:
         # Fallback to direct encoding if IDNA2008 processing fails
-        return host.encode("idna").decode(charset)
+        try:
+            return _Fallback(host.encode("idna").decode(charset), None)
+        except UnicodeError as e:
+            return _Fallback("", e)
+
+
+def _is_ldh_label(label: str) -> bool:
+    """Check whether a lowercased label is a valid ASCII LDH label.
+
+    Such labels are returned unchanged by IDNA processing, so they can skip it.
+    Reserved "??--" labels (including "xn--" A-labels) are left to idna.
+    """
+    return (
+        len(label) <= MAX_LABEL_LENGTH
+        and label.isascii()
+        and label[0] != "-"
+        and label[-1] != "-"
+        and label[2:4] != "--"
+        and LDH_CHARS.issuperset(label)
+    )
+
+
+def host_cache_info() -> CacheInfo:
+    """Return hit, miss and eviction statistics of the host cache.
+
+    Returns:
+        CacheInfo : cache statistics snapshot
+
+    """
+    return _host_cache.info()
+
+
+def host_cache_clear() -> None:
+    """Remove all cached hosts and reset the statistics counters."""
+    _host_cache.clear()
+
+
+def set_host_cache_size(maxsize: int) -> None:
+    """Change the maximum number of cached hosts.
+
+    Params:
+        maxsize : int : number of hosts to keep, 0 disables the cache
+
+    """
+    _host_cache.resize(maxsize)
@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from .tools import quote, unquote
+import re
+
+from .tools import is_canonical, requote
+
+PATH_SAFE_CHARS = "~:/#[]@!$&'()*+,;="
+# Schemes whose paths are hierarchical and have dot-segments removed
+DOT_SEGMENT_SCHEMES = frozenset(["", "http", "https", "ftp", "file"])
+# Schemes for which an empty path is equivalent to "/"
+ROOT_PATH_SCHEMES = frozenset(["http", "https", "ftp", "file"])
+
+_dot_segment = re.compile(r"(?:^|/)\.\.?(?:/|$)")
 
 
 def normalize_path(path: str, scheme: str) -> str:
@@ -21,9 +31,9 @@ def normalize_path(path: str, scheme: str) -> str:
     # Only perform percent-encoding where it is essential.
     # Always use uppercase A-through-F characters when percent-encoding.
     # All portions of the URI must be utf-8 encoded NFC from Unicode strings
-    path = quote(unquote(path), "~:/#[]@!$&'()*+,;=")
+    path = requote(path, PATH_SAFE_CHARS)
     # Prevent dot-segments appearing in non-relative URI paths.
-    if scheme in {"", "http", "https", "ftp", "file"}:
+    if scheme in DOT_SEGMENT_SCHEMES:
         output: list[str] = []
         for part in path.split("/"):
             if part == "":
@@ -43,6 +53,25 @@ def normalize_path(path: str, scheme: str) -> str:
         path = "/".join(output)
     # For schemes that define an empty path to be equivalent to a path of "/",
     # use "/".
-    if not path and scheme in {"http", "https", "ftp", "file"}:
+    if not path and scheme in ROOT_PATH_SCHEMES:
         path = "/"
     return path
+
+
+def is_normalized_path(path: str, scheme: str) -> bool:
+    """Check that a path is already normalized, without rebuilding it.
+
+    Params:
+        path : string : url path, e.g., '/section/page.html'
+        scheme : string : normalized url scheme, e.g., 'http'
+
+    Returns:
+        bool : True if normalize_path(path, scheme) returns path unchanged.
+
+    """
+    if not is_canonical(path, PATH_SAFE_CHARS):
+        return False
+    if scheme in DOT_SEGMENT_SCHEMES:
+        # Empty segments collapse and dot-segments are removed
+        return bool(path) and "//" not in path and not _dot_segment.search(path)
+    return bool(path) or scheme not in ROOT_PATH_SCHEMES
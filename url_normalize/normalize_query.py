@@ -2,12 +2,45 @@
 
 from __future__ import annotations
 
-from .param_allowlist import get_allowed_params
-from .tools import quote, unquote
+import re
+from functools import cache
+from itertools import pairwise
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from . import instrumentation
+from .param_allowlist import compile_allowlist
+from .param_denylist import compile_denylist
+from .tools import canonical_pattern, has_canonical_escapes, requote
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+    from .param_allowlist import AllowlistIndex
+    from .param_denylist import DeniedParams, DenylistIndex
 
 QUERY_PARAM_SAFE_CHARS = "~:/?[]@!$'()*+,;"
 
 
+@cache
+def normalized_query_pattern() -> re.Pattern[str]:
+    """Build the regex matching queries that normalize_query() leaves as is.
+
+    Compiled on first use, since the pattern is large.
+
+    Returns:
+        re.Pattern : pattern to fullmatch() against a query
+
+    """
+    canonical_param = canonical_pattern(QUERY_PARAM_SAFE_CHARS).pattern
+    # 'key', 'key=value' or '=value', with canonical, non-empty keys and values
+    normalized_param = (
+        f"(?:(?!$|[&=]){canonical_param}(?:=(?!$|&){canonical_param})?"
+        f"|=(?!$|&){canonical_param})"
+    )
+    return re.compile(f"{normalized_param}(?:&{normalized_param})*")
+
+
 def process_query_param(param: str) -> str:
     """Process a single query parameter.
 
@@ -23,42 +56,173 @@ def process_query_param(param: str) -> str:
     """
     if not param:
         return ""
-    return quote(unquote(param), QUERY_PARAM_SAFE_CHARS)
+    return requote(param, QUERY_PARAM_SAFE_CHARS)
 
 
-def normalize_query(
+def normalize_query(  # noqa: PLR0913
     query: str,
     *,  # Force keyword-only arguments
     host: str | None = None,
     filter_params: bool = False,
-    param_allowlist: list | dict | None = None,
+    param_allowlist: AllowlistIndex | Mapping | Collection | None = None,
+    strip_tracking_params: bool = False,
+    param_denylist: DenylistIndex | Mapping | Collection | None = None,
+    sort_params: bool = False,
+    sort_param_values: bool = False,
+    collapse_params: bool = False,
 ) -> str:
-    """Normalize query while preserving parameter order.
+    """Normalize query, preserving parameter order by default.
+
+    Sorting and collapsing are done on the normalized parameters gathered
+    by the single pass over the query, so '?b=2&a=1' and '?a=1&b=2', or
+    '?a=%7e' and '?a=~', sort and collapse the same way.
 
     Params:
         query: URL query string (e.g. 'param1=val1&param2')
         host: Domain for allowlist checks
         filter_params: If True, removes non-allowlisted parameters
-        param_allowlist: Optional override for default allowlist
+        param_allowlist: Optional override for default allowlist, raw or
+            precompiled with compile_allowlist()
+        strip_tracking_params: If True, removes denylisted parameters
+        param_denylist: Optional override for default denylist, raw or
+            precompiled with compile_denylist()
+        sort_params: If True, sorts parameters by key; the sort is stable,
+            so values of a repeated key keep their order
+        sort_param_values: With sort_params, also sorts the values of a
+            repeated key
+        collapse_params: If True, keeps only the first of identical
+            key/value pairs
 
     Returns:
-        Normalized query string with original parameter order
+        Normalized query string
 
     """
     if not query:
         return ""
 
-    processed = []
-    for param in query.split("&"):
-        if not param:
+    # Resolve the allowed parameters once per URL, not once per parameter
+    allowed_params = (
+        compile_allowlist(param_allowlist).lookup(host) if filter_params else None
+    )
+    denied_params = (
+        compile_denylist(param_denylist).lookup(host) if strip_tracking_params else None
+    )
+    processed: list[str] = []
+    # (key, parameter) pairs, gathered instead of processed for sorting
+    keyed: list[tuple[str, str]] = []
+    for raw_param in query.split("&"):
+        if not raw_param:
             continue
-        key, _, value = param.partition("=")
+        key, _, value = raw_param.partition("=")
         key = process_query_param(key)
-        if filter_params:
-            allowed_params = get_allowed_params(host, param_allowlist)
-            if key not in allowed_params:
-                continue
+        if (allowed_params is not None and key not in allowed_params) or (
+            denied_params is not None and key in denied_params
+        ):
+            recorder = instrumentation.active
+            if recorder is not None:
+                recorder.event(instrumentation.PARAM_DROPPED)
+            continue
         value = process_query_param(value)
-        processed.append(f"{key}={value}" if value else key)
-
+        param = f"{key}={value}" if value else key
+        if sort_params:
+            keyed.append((key, param))
+        else:
+            processed.append(param)
+
+    if sort_params:
+        # 'key' sorts before 'key=value', and values compare after the '='
+        keyed.sort(key=None if sort_param_values else itemgetter(0))
+        processed = [param for _, param in keyed]
+    if collapse_params:
+        processed = list(dict.fromkeys(processed))
     return "&".join(processed)
+
+
+def _is_canonical_query(query: str) -> bool:
+    """Check that no parameter of a non-empty query is re-quoted or dropped."""
+    return bool(normalized_query_pattern().fullmatch(query)) and (
+        has_canonical_escapes(query, QUERY_PARAM_SAFE_CHARS)
+    )
+
+
+def _keeps_params(
+    keys: list[str],
+    allowed_params: frozenset[str] | None,
+    denied_params: DeniedParams | None,
+) -> bool:
+    """Check that parameters pass the allowlist and the denylist, if any."""
+    if denied_params is not None and any(key in denied_params for key in keys):
+        return False
+    return allowed_params is None or all(key in allowed_params for key in keys)
+
+
+def _is_sorted(keys: list[str], params: list[str], *, by_value: bool) -> bool:
+    """Check that parameters are in the order given by sort_params.
+
+    Params:
+        keys: Keys of the parameters
+        params: The parameters, in query order
+        by_value: Whether the values of a repeated key must be sorted too
+
+    Returns:
+        True if sorting the parameters leaves them in place
+
+    """
+    if by_value:
+        pairs = zip(keys, params, strict=True)
+        return all(left <= right for left, right in pairwise(pairs))
+    return all(left <= right for left, right in pairwise(keys))
+
+
+def is_normalized_query(  # noqa: PLR0913
+    query: str,
+    *,  # Force keyword-only arguments
+    host: str | None = None,
+    filter_params: bool = False,
+    param_allowlist: AllowlistIndex | Mapping | Collection | None = None,
+    strip_tracking_params: bool = False,
+    param_denylist: DenylistIndex | Mapping | Collection | None = None,
+    sort_params: bool = False,
+    sort_param_values: bool = False,
+    collapse_params: bool = False,
+) -> bool:
+    """Check that a query is already normalized, without rebuilding it.
+
+    Params:
+        query: URL query string (e.g. 'param1=val1&param2')
+        host: Domain for allowlist checks
+        filter_params: If True, non-allowlisted parameters are not normalized
+        param_allowlist: Optional override for default allowlist, raw or
+            precompiled with compile_allowlist()
+        strip_tracking_params: If True, denylisted parameters are not
+            normalized
+        param_denylist: Optional override for default denylist, raw or
+            precompiled with compile_denylist()
+        sort_params: If True, parameters must be sorted by key
+        sort_param_values: With sort_params, values of a repeated key must
+            be sorted too
+        collapse_params: If True, key/value pairs must be unique
+
+    Returns:
+        True if normalize_query() with the same options returns query unchanged
+
+    """
+    if not query:
+        return True
+    if not _is_canonical_query(query):
+        return False
+    if not (filter_params or strip_tracking_params or sort_params or collapse_params):
+        return True
+    params = query.split("&")
+    if collapse_params and len(set(params)) != len(params):
+        return False
+    keys = [param.partition("=")[0] for param in params]
+    if sort_params and not _is_sorted(keys, params, by_value=sort_param_values):
+        return False
+    denied_params = (
+        compile_denylist(param_denylist).lookup(host) if strip_tracking_params else None
+    )
+    allowed_params = (
+        compile_allowlist(param_allowlist).lookup(host) if filter_params else None
+    )
+    return _keeps_params(keys, allowed_params, denied_params)
@@ -0,0 +1,136 @@
+"""Structured result of URL normalization."""
+
+from __future__ import annotations
+
+from typing import NoReturn
+
+from .tools import URL, deconstruct_url, reconstruct_url
+
+
+class NormalizedURL:
+    """Immutable components of a normalized URL.
+
+    The seven components are those of tools.URL, as the pipeline produced
+    them, so reading one does not parse the URL again. The string form is
+    built on first use of str() and kept.
+
+    >>> from url_normalize import url_normalize_structured
+    >>> url = url_normalize_structured("www.foo.com:80/foo?b=2&a")
+    >>> url.host
+    'www.foo.com'
+    >>> url.query_params
+    [('b', '2'), ('a', '')]
+    >>> str(url)
+    'https://www.foo.com:80/foo?b=2&a'
+    """
+
+    __slots__ = (
+        "_string",
+        "fragment",
+        "host",
+        "path",
+        "port",
+        "query",
+        "scheme",
+        "userinfo",
+    )
+
+    scheme: str
+    userinfo: str
+    host: str
+    port: str
+    path: str
+    query: str
+    fragment: str
+    _string: str | None
+
+    def __init__(self, url: URL, string: str | None = None) -> None:
+        """Wrap the components of an already normalized URL.
+
+        Params:
+            url: Normalized components, not normalized again
+            string: The URL the components reconstruct to, if already known
+
+        """
+        set_slot = object.__setattr__
+        for name, value in zip(URL._fields, url, strict=True):
+            set_slot(self, name, value)
+        set_slot(self, "_string", string)
+
+    @classmethod
+    def from_string(cls, url: str) -> NormalizedURL:
+        """Split a URL that is already normalized, keeping it as the string form.
+
+        Params:
+            url: Normalized URL, e.g. as returned by url_normalize
+
+        Returns:
+            NormalizedURL : components of the URL
+
+        Raises:
+            ValueError: If the authority is invalid
+
+        """
+        return cls(deconstruct_url(url), url)
+
+    @property
+    def components(self) -> URL:
+        """The seven components as a tools.URL named tuple."""
+        return URL(
+            self.scheme,
+            self.userinfo,
+            self.host,
+            self.port,
+            self.path,
+            self.query,
+            self.fragment,
+        )
+
+    @property
+    def query_params(self) -> list[tuple[str, str]]:
+        """Query parameters as (key, value) pairs, in order.
+
+        Keys and values stay percent-encoded as in the URL. Parameters
+        without a value, e.g. 'a' in '?a&b=1', have an empty value; the
+        normalized query does not distinguish them from 'a='.
+        """
+        if not self.query:
+            return []
+        params = (param.partition("=") for param in self.query.split("&"))
+        return [(key, value) for key, _, value in params]
+
+    def __str__(self) -> str:
+        """Return the normalized URL, reconstructing it on first use."""
+        string = self._string
+        if string is None:
+            string = reconstruct_url(self.components)
+            object.__setattr__(self, "_string", string)
+        return string
+
+    def __repr__(self) -> str:
+        """Return a representation showing the URL."""
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the components with another NormalizedURL."""
+        if not isinstance(other, NormalizedURL):
+            return NotImplemented
+        return self.components == other.components
+
+    def __hash__(self) -> int:
+        """Hash the components."""
+        return hash(self.components)
+
+    def __reduce__(self) -> tuple[type[NormalizedURL], tuple[URL, str | None]]:
+        """Pickle the components and the string form if it was built."""
+        return type(self), (self.components, self._string)
+
+    def __setattr__(self, name: str, value: object) -> NoReturn:
+        """Reject attribute assignment, the components are frozen."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> NoReturn:
+        """Reject attribute deletion, the components are frozen."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
@@ -0,0 +1,455 @@
+"""Reusable URL normalizer with a frozen configuration."""
+
+from __future__ import annotations
+
+import codecs
+from functools import partial
+from types import MappingProxyType
+from typing import Any, NoReturn
+
+from . import instrumentation, result_cache
+from .generic_url_cleanup import generic_url_cleanup
+from .normalize_fragment import is_normalized_fragment, normalize_fragment
+from .normalize_host import DEFAULT_CHARSET, normalize_host
+from .normalize_path import is_normalized_path, normalize_path
+from .normalize_port import normalize_port
+from .normalize_query import is_normalized_query, normalize_query
+from .normalize_scheme import DEFAULT_SCHEME, normalize_scheme
+from .normalize_userinfo import normalize_userinfo
+from .normalized_url import NormalizedURL
+from .param_allowlist import AllowlistIndex, compile_allowlist
+from .param_denylist import DenylistIndex, compile_denylist
+from .provide_url_domain import provide_url_domain
+from .provide_url_scheme import AUTHORITY_SCHEMES, provide_url_scheme
+from .tools import (
+    URL,
+    deconstruct_url,
+    force_bytes,
+    force_unicode,
+    reconstruct_url,
+)
+
+# Bump whenever a change makes any URL normalize differently, so that stored
+# normalized URLs and their fingerprints can be invalidated
+NORMALIZATION_RULES_VERSION = 1
+
+
+def _freeze_allowlist(
+    allowlist: dict | list | None,
+) -> MappingProxyType[str, frozenset[str]] | frozenset[str] | None:
+    """Copy a parameter allowlist or denylist into an immutable structure.
+
+    Params:
+        allowlist: Parameter allowlist or denylist as accepted by url_normalize
+
+    Returns:
+        Read-only mapping of domains to parameter sets, a parameter set,
+        or None for the default list
+
+    """
+    if allowlist is None:
+        return None
+    if isinstance(allowlist, dict):
+        return MappingProxyType(
+            {domain: frozenset(params) for domain, params in allowlist.items()}
+        )
+    return frozenset(allowlist)
+
+
+def _thaw_allowlist(
+    allowlist: MappingProxyType[str, frozenset[str]] | frozenset[str] | None,
+) -> dict | list | None:
+    """Copy a frozen parameter allowlist or denylist back to plain containers."""
+    if isinstance(allowlist, MappingProxyType):
+        return {domain: list(params) for domain, params in allowlist.items()}
+    if allowlist is not None:
+        return list(allowlist)
+    return None
+
+
+def is_prepared(url: str) -> bool:
+    """Check that the URL preparation stages leave a non-empty URL unchanged.
+
+    The preparation stages are provide_url_domain, provide_url_scheme and
+    generic_url_cleanup. A True result is always correct; False may be
+    returned for some unchanged URLs, e.g. scheme-less paths.
+
+    Params:
+        url : str : non-empty URL
+
+    Returns:
+        bool : True if the URL is passed to deconstruct_url() as is
+
+    """
+    colon = url.find(":", 0, 7)
+    if colon < 0 or url[0] == "/" or url[-1] in "&? " or "#!" in url:
+        return False
+    return url[:colon].lower() not in AUTHORITY_SCHEMES or (
+        url.startswith("//", colon + 1) and not url.startswith("/", colon + 3)
+    )
+
+
+class Normalizer:
+    """URL normalizer bound to a fixed set of options.
+
+    Everything derivable from the configuration is computed once at
+    construction, so calling the instance only runs the per-URL pipeline.
+    Instances are immutable and cheap to pickle: only the options are sent,
+    and the derived state is rebuilt on the receiving side.
+
+    >>> normalize = Normalizer(default_scheme="http")
+    >>> normalize("www.foo.com:80/foo")
+    'http://www.foo.com/foo'
+    """
+
+    __slots__ = (
+        "_allowlist_index",
+        "_charset",
+        "_collapse_params",
+        "_default_domain",
+        "_default_scheme",
+        "_denylist_index",
+        "_filter_params",
+        "_param_allowlist",
+        "_param_denylist",
+        "_return_bytes",
+        "_skip_normalized",
+        "_sort_param_values",
+        "_sort_params",
+        "_strip_tracking_params",
+    )
+
+    _charset: str
+    _default_scheme: str
+    _default_domain: str | None
+    _filter_params: bool
+    _param_allowlist: MappingProxyType[str, frozenset[str]] | frozenset[str] | None
+    _allowlist_index: AllowlistIndex
+    _strip_tracking_params: bool
+    _param_denylist: MappingProxyType[str, frozenset[str]] | frozenset[str] | None
+    _denylist_index: DenylistIndex
+    _sort_params: bool
+    _sort_param_values: bool
+    _collapse_params: bool
+    _skip_normalized: bool
+    _return_bytes: bool
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,  # Force keyword-only arguments
+        charset: str = DEFAULT_CHARSET,
+        default_scheme: str = DEFAULT_SCHEME,
+        default_domain: str | None = None,
+        filter_params: bool = False,
+        param_allowlist: dict | list | None = None,
+        strip_tracking_params: bool = False,
+        param_denylist: dict | list | None = None,
+        sort_params: bool = False,
+        sort_param_values: bool = False,
+        collapse_params: bool = False,
+        skip_normalized: bool = False,
+        return_bytes: bool = False,
+    ) -> None:
+        """Validate the options and precompute the normalization state.
+
+        Params:
+            charset : str : optional
+                The target charset for the URL if the url was given as unicode
+            default_scheme : str : default scheme to use if none present
+            default_domain : str | None : optional
+                Default domain to use for absolute paths (starting with '/')
+            filter_params : bool : optional
+                Whether to filter non-allowlisted parameters (False by default)
+            param_allowlist : dict | list | None : optional
+                Override for the parameter allowlist
+            strip_tracking_params : bool : optional
+                Whether to remove denylisted tracking parameters on any host
+                (False by default)
+            param_denylist : dict | list | None : optional
+                Override for the parameter denylist, see DenylistIndex
+            sort_params : bool : optional
+                Whether to sort query parameters by key, keeping the order
+                of the values of a repeated key (False by default)
+            sort_param_values : bool : optional
+                Whether to also sort the values of a repeated key; requires
+                sort_params (False by default)
+            collapse_params : bool : optional
+                Whether to keep only the first of identical query key/value
+                pairs (False by default)
+            skip_normalized : bool : optional
+                Whether to return URLs that pass the is_normalized() fast check
+                as is (False by default). Results are the same either way; this
+                speeds up mostly normalized input and slows down the rest.
+            return_bytes : bool : optional
+                Whether to return normalized URLs encoded with charset
+                instead of str (False by default)
+
+        Raises:
+            LookupError: If charset is not a known codec
+            ValueError: If sort_param_values is set without sort_params
+
+        """
+        codecs.lookup(charset)
+        if sort_param_values and not sort_params:
+            msg = "sort_param_values requires sort_params"
+            raise ValueError(msg)
+        set_slot = object.__setattr__
+        set_slot(self, "_charset", charset)
+        set_slot(self, "_default_scheme", default_scheme)
+        set_slot(self, "_default_domain", default_domain)
+        set_slot(self, "_filter_params", filter_params)
+        set_slot(self, "_param_allowlist", _freeze_allowlist(param_allowlist))
+        set_slot(self, "_allowlist_index", compile_allowlist(self._param_allowlist))
+        set_slot(self, "_strip_tracking_params", strip_tracking_params)
+        set_slot(self, "_param_denylist", _freeze_allowlist(param_denylist))
+        set_slot(self, "_denylist_index", compile_denylist(self._param_denylist))
+        set_slot(self, "_sort_params", sort_params)
+        set_slot(self, "_sort_param_values", sort_param_values)
+        set_slot(self, "_collapse_params", collapse_params)
+        set_slot(self, "_skip_normalized", skip_normalized)
+        set_slot(self, "_return_bytes", return_bytes)
+
+    def __call__(
+        self, url: str | bytes | bytearray | memoryview | None
+    ) -> str | bytes | None:
+        """Normalize a single URL.
+
+        Bytes-like URLs are decoded with the charset first; ASCII ones
+        without going through the codec.
+
+        Params:
+            url : str | bytes | bytearray | memoryview | None : URL to normalize
+
+        Returns:
+            str | bytes | None : a normalized url, as bytes encoded with the
+                charset if return_bytes is set; None for None
+
+        """
+        if url.__class__ is str and not self._return_bytes:
+            # The class check is faster than isinstance() but does not narrow
+            return self._normalize(url) if url else url  # type: ignore[arg-type]
+        if url is None:
+            return None
+        url = force_unicode(url, self._charset)
+        if url:
+            url = self._normalize(url)
+        return force_bytes(url, self._charset) if self._return_bytes else url
+
+    def _normalize(self, url: str) -> str:
+        """Normalize a non-empty URL string, through the result cache if enabled."""
+        cache = result_cache.active
+        if cache is not None:
+            key = (self, url)
+            result = cache.get(key)
+            if result is not None:
+                recorder = instrumentation.active
+                if recorder is not None:
+                    recorder.event(instrumentation.RESULT_CACHE_HIT)
+                return result
+        recorder = instrumentation.active
+        if recorder is not None and recorder.sample():
+            result = self._timed_call(url, instrumentation.StageTimer(recorder))
+        elif self._skip_normalized and self._is_unchanged(url):
+            result = url
+        else:
+            result = reconstruct_url(self._components(url))
+        if cache is not None:
+            cache.put(key, result)
+        return result
+
+    def structured(
+        self, url: str | bytes | bytearray | memoryview | None
+    ) -> NormalizedURL | None:
+        """Normalize a single URL, returning its components.
+
+        Bytes-like URLs are decoded like in __call__; the components are
+        always str, whatever the return_bytes option.
+
+        Params:
+            url : str | bytes | bytearray | memoryview | None : URL to normalize
+
+        Returns:
+            NormalizedURL | None : components of the normalized url, whose
+                str() is what calling the normalizer returns; None for None
+
+        """
+        if url is None:
+            return None
+        url = force_unicode(url, self._charset)
+        if not url:
+            return NormalizedURL(URL("", "", "", "", "", "", ""), url)
+        recorder = instrumentation.active
+        if recorder is not None and recorder.sample():
+            timer = instrumentation.StageTimer(recorder)
+            url_elements = self._timed_components(url, timer)
+            timer.finish(instrumentation.TOTAL_STAGE)
+            if url_elements is None:
+                return NormalizedURL.from_string(url)
+            return NormalizedURL(url_elements)
+        if self._skip_normalized and self._is_unchanged(url):
+            return NormalizedURL.from_string(url)
+        return NormalizedURL(self._components(url))
+
+    def _components(self, url: str) -> URL:
+        """Run the pipeline on a non-empty URL, up to the normalized components."""
+        url = provide_url_domain(url, self._default_domain)
+        url = provide_url_scheme(url, self._default_scheme)
+        url = generic_url_cleanup(url)
+        url_elements = deconstruct_url(url)
+        scheme = normalize_scheme(url_elements.scheme)
+        return url_elements._replace(
+            scheme=scheme,
+            userinfo=normalize_userinfo(url_elements.userinfo),
+            host=normalize_host(url_elements.host, self._charset),
+            port=normalize_port(url_elements.port, scheme),
+            path=normalize_path(url_elements.path, scheme),
+            query=normalize_query(
+                url_elements.query,
+                host=url_elements.host,
+                filter_params=self._filter_params,
+                param_allowlist=self._allowlist_index,
+                strip_tracking_params=self._strip_tracking_params,
+                param_denylist=self._denylist_index,
+                sort_params=self._sort_params,
+                sort_param_values=self._sort_param_values,
+                collapse_params=self._collapse_params,
+            ),
+            fragment=normalize_fragment(url_elements.fragment),
+        )
+
+    def _timed_call(self, url: str, timer: instrumentation.StageTimer) -> str:
+        """Normalize a non-empty URL like __call__, timing every stage."""
+        url_elements = self._timed_components(url, timer)
+        if url_elements is not None:
+            url = timer.lap("reconstruct_url", reconstruct_url(url_elements))
+        timer.finish(instrumentation.TOTAL_STAGE)
+        return url
+
+    def _timed_components(
+        self, url: str, timer: instrumentation.StageTimer
+    ) -> URL | None:
+        """Time the stages of _components(), None if the URL is unchanged."""
+        lap = timer.lap
+        if self._skip_normalized and lap("is_normalized", self._is_unchanged(url)):
+            return None
+        url = lap("provide_url_domain", provide_url_domain(url, self._default_domain))
+        url = lap("provide_url_scheme", provide_url_scheme(url, self._default_scheme))
+        url = lap("generic_url_cleanup", generic_url_cleanup(url))
+        url_elements = lap("deconstruct_url", deconstruct_url(url))
+        scheme = lap("normalize_scheme", normalize_scheme(url_elements.scheme))
+        return url_elements._replace(
+            scheme=scheme,
+            userinfo=lap(
+                "normalize_userinfo", normalize_userinfo(url_elements.userinfo)
+            ),
+            host=lap(
+                "normalize_host", normalize_host(url_elements.host, self._charset)
+            ),
+            port=lap("normalize_port", normalize_port(url_elements.port, scheme)),
+            path=lap("normalize_path", normalize_path(url_elements.path, scheme)),
+            query=lap(
+                "normalize_query",
+                normalize_query(
+                    url_elements.query,
+                    host=url_elements.host,
+                    filter_params=self._filter_params,
+                    param_allowlist=self._allowlist_index,
+                    strip_tracking_params=self._strip_tracking_params,
+                    param_denylist=self._denylist_index,
+                    sort_params=self._sort_params,
+                    sort_param_values=self._sort_param_values,
+                    collapse_params=self._collapse_params,
+                ),
+            ),
+            fragment=lap(
+                "normalize_fragment", normalize_fragment(url_elements.fragment)
+            ),
+        )
+
+    def is_normalized(self, url: str | bytes | bytearray | memoryview | None) -> bool:
+        """Check whether a URL is already in normal form.
+
+        Each component is scanned in place and the check stops at the first
+        one that would change. URLs that do not pass this fast check are
+        normalized and compared, so the result is always exact. Bytes-like
+        URLs are decoded with the charset first.
+
+        Params:
+            url : str | bytes | bytearray | memoryview | None : URL to check
+
+        Returns:
+            bool : True if normalizing the URL returns it unchanged
+
+        """
+        if not url:
+            return True
+        url = force_unicode(url, self._charset)
+        return self._is_unchanged(url) or self._normalize(url) == url
+
+    def _is_unchanged(self, url: str) -> bool:
+        """Check that every pipeline stage leaves a URL unchanged.
+
+        A True result is always correct; False may be returned for some
+        normalized URLs, e.g. scheme-less paths.
+        """
+        if not is_prepared(url):
+            return False
+        url_elements = deconstruct_url(url)
+        scheme = url_elements.scheme
+        return (
+            url_elements.userinfo not in {"@", ":@"}
+            and normalize_host(url_elements.host, self._charset) == url_elements.host
+            and normalize_port(url_elements.port, scheme) == url_elements.port
+            and is_normalized_path(url_elements.path, scheme)
+            and is_normalized_query(
+                url_elements.query,
+                host=url_elements.host,
+                filter_params=self._filter_params,
+                param_allowlist=self._allowlist_index,
+                strip_tracking_params=self._strip_tracking_params,
+                param_denylist=self._denylist_index,
+                sort_params=self._sort_params,
+                sort_param_values=self._sort_param_values,
+                collapse_params=self._collapse_params,
+            )
+            and is_normalized_fragment(url_elements.fragment)
+            # The split is lossless, e.g. the scheme was already lowercase
+            and reconstruct_url(url_elements) == url
+        )
+
+    @property
+    def options(self) -> dict[str, Any]:
+        """Keyword options this normalizer was built with."""
+        return {
+            "charset": self._charset,
+            "default_scheme": self._default_scheme,
+            "default_domain": self._default_domain,
+            "filter_params": self._filter_params,
+            "param_allowlist": _thaw_allowlist(self._param_allowlist),
+            "strip_tracking_params": self._strip_tracking_params,
+            "param_denylist": _thaw_allowlist(self._param_denylist),
+            "sort_params": self._sort_params,
+            "sort_param_values": self._sort_param_values,
+            "collapse_params": self._collapse_params,
+            "skip_normalized": self._skip_normalized,
+            "return_bytes": self._return_bytes,
+        }
+
+    def __repr__(self) -> str:
+        """Return a representation listing the options."""
+        options = ", ".join(f"{key}={value!r}" for key, value in self.options.items())
+        return f"{type(self).__name__}({options})"
+
+    def __reduce__(self) -> tuple[partial[Normalizer], tuple[()]]:
+        """Pickle only the options; derived state is rebuilt on load."""
+        return partial(type(self), **self.options), ()
+
+    def __setattr__(self, name: str, value: object) -> NoReturn:
+        """Reject attribute assignment, the configuration is frozen."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> NoReturn:
+        """Reject attribute deletion, the configuration is frozen."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
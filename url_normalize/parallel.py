@@ -0,0 +1,229 @@
+"""Parallel URL normalization with a process pool."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .url_normalize import get_str_normalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 2000
+# Chunks in flight per worker, bounds memory on unbounded inputs
+CHUNKS_PER_WORKER = 2
+PAYLOAD_SEPARATOR = "\n"
+
+Payload = bytes | tuple[Any, ...]
+# URL type of a transform, str or str | None
+U = TypeVar("U", bound="str | None")
+
+_worker_transform: Callable[[Any], str | None] | None = None
+
+
+def _encode_chunk(chunk: list) -> Payload:
+    """Pack a chunk of URLs into a compact payload for a worker.
+
+    URLs are sent as one separator-joined UTF-8 buffer. Chunks that cannot be
+    represented that way (empty values or URLs containing the separator) are
+    sent as a plain tuple instead.
+    """
+    if all(
+        isinstance(url, str) and url and PAYLOAD_SEPARATOR not in url for url in chunk
+    ):
+        return PAYLOAD_SEPARATOR.join(chunk).encode("utf-8", "surrogatepass")
+    return tuple(chunk)
+
+
+def _decode_chunk(payload: Payload | list) -> list:
+    """Unpack a payload produced by _encode_chunk, or a list of results."""
+    if isinstance(payload, bytes):
+        return payload.decode("utf-8", "surrogatepass").split(PAYLOAD_SEPARATOR)
+    return list(payload)
+
+
+def _init_worker(transform: Callable[[Any], str | None]) -> None:
+    """Store the per-process URL transform, sent once per worker."""
+    global _worker_transform  # noqa: PLW0603
+    _worker_transform = transform
+
+
+def _process_chunk(
+    payload: Payload,
+    transform: Callable[[Any], str | None] | None = None,
+) -> Payload | list:
+    """Normalize a chunk of URLs.
+
+    Failures do not abort the chunk: the exception is returned in place of
+    the URL result so the caller can decide how to handle it.
+
+    Params:
+        payload: Chunk of URLs as produced by _encode_chunk
+        transform: URL transform, defaults to the one set by _init_worker
+
+    Returns:
+        Results encoded like the input when every URL succeeded, otherwise
+        a list of results and exceptions
+
+    """
+    transform = transform or _worker_transform
+    results: list = []
+    failed = False
+    for url in _decode_chunk(payload):
+        try:
+            results.append(transform(url))  # type: ignore[misc]
+        except Exception as e:  # noqa: BLE001, PERF203
+            results.append(e)
+            failed = True
+    if failed:
+        return results
+    return _encode_chunk(results)
+
+
+def _chunks(urls: Iterable, chunk_size: int) -> Iterator[tuple[int, list]]:
+    """Split URLs into chunks tagged with the index of their first URL."""
+    iterator = iter(urls)
+    start = 0
+    while chunk := list(islice(iterator, chunk_size)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def _collect(
+    pending: dict[Future, int],
+    *,
+    ordered: bool,
+) -> Iterator[tuple[int, Any]]:
+    """Wait for pending chunks and yield their indexed results.
+
+    Params:
+        pending: Submitted futures mapped to their chunk offset, in
+            submission order; collected futures are removed
+        ordered: Wait for the oldest chunk instead of the first completed one
+
+    """
+    if ordered:
+        done: Iterable[Future] = [next(iter(pending))]
+    else:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        start = pending.pop(future)
+        yield from enumerate(_decode_chunk(future.result()), start=start)
+
+
+def iter_parallel(
+    transform: Callable[[U], str | None],
+    urls: Iterable[U],
+    *,
+    jobs: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = True,
+) -> Iterator[tuple[int, str | None | Exception]]:
+    """Apply a picklable URL transform to URLs across a process pool.
+
+    Params:
+        transform: Picklable function transforming one URL, sent once per worker
+        urls: Iterable of URLs
+        jobs: Number of worker processes, defaults to the number of CPUs;
+            1 runs in the current process
+        chunk_size: Number of URLs sent to a worker at once
+        ordered: Yield results in input order, or in completion order if False
+
+    Returns:
+        Iterator over (index, result) pairs; a result is the exception raised
+        by the transform if the URL failed
+
+    Raises:
+        ValueError: If jobs or chunk_size is not positive
+
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1 or chunk_size < 1:
+        msg = "jobs and chunk_size must be positive integers"
+        raise ValueError(msg)
+    return _iter_parallel(transform, urls, jobs, chunk_size, ordered=ordered)
+
+
+def _iter_parallel(
+    transform: Callable[[U], str | None],
+    urls: Iterable[U],
+    jobs: int,
+    chunk_size: int,
+    *,
+    ordered: bool,
+) -> Iterator[tuple[int, str | None | Exception]]:
+    """Transform URLs with validated arguments, see iter_parallel."""
+    if jobs == 1:
+        for start, chunk in _chunks(urls, chunk_size):
+            payload = _process_chunk(_encode_chunk(chunk), transform)
+            yield from enumerate(_decode_chunk(payload), start=start)
+        return
+
+    max_pending = jobs * CHUNKS_PER_WORKER
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(transform,)
+    )
+    try:
+        pending: dict[Future, int] = {}
+        for start, chunk in _chunks(urls, chunk_size):
+            pending[executor.submit(_process_chunk, _encode_chunk(chunk))] = start
+            if len(pending) >= max_pending:
+                yield from _collect(pending, ordered=ordered)
+        while pending:
+            yield from _collect(pending, ordered=ordered)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def url_normalize_parallel(
+    urls: Iterable[str | None],
+    *,
+    jobs: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = True,
+    **options: Any,  # noqa: ANN401
+) -> Iterator[tuple[int, str | None]]:
+    """Normalize URLs on several CPU cores.
+
+    URLs are grouped in chunks and each chunk is sent to a worker process as
+    a single newline-joined UTF-8 buffer. The normalizer itself is sent once
+    per worker. At most a few chunks per worker are in flight, so unbounded
+    inputs are processed with bounded memory.
+
+    Params:
+        urls: Iterable of URLs to normalize
+        jobs: Number of worker processes, defaults to the number of CPUs
+        chunk_size: Number of URLs sent to a worker at once
+        ordered: Yield results in input order, or in completion order if False
+        **options: Keyword options accepted by url_normalize
+
+    Returns:
+        Iterator over (index, normalized URL) pairs
+
+    Raises:
+        ValueError: If jobs or chunk_size is not positive
+        TypeError: If an unknown option or return_bytes is given
+        Exception: The first error raised while normalizing a URL, when its
+            result is reached
+
+    """
+    normalizer = get_str_normalizer(**options)
+    return _raise_errors(
+        iter_parallel(
+            normalizer, urls, jobs=jobs, chunk_size=chunk_size, ordered=ordered
+        )
+    )
+
+
+def _raise_errors(
+    results: Iterator[tuple[int, str | None | Exception]],
+) -> Iterator[tuple[int, str | None]]:
+    """Yield transform results, raising the first error instead."""
+    for index, result in results:
+        if isinstance(result, Exception):
+            raise result
+        yield index, result
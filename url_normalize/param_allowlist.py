@@ -3,6 +3,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from .domain_trie import DomainTrie
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
 DEFAULT_ALLOWLIST = {
     "google.com": ["q", "ie"],
     "baidu.com": ["wd", "ie"],
@@ -10,39 +18,99 @@ DEFAULT_ALLOWLIST = {
     "youtube.com": ["v", "search_query"],
 }
 
+NO_PARAMS: frozenset[str] = frozenset()
+
+
+class AllowlistIndex:
+    """Compiled parameter allowlist.
+
+    Domain rules are stored in a DomainTrie keyed by reversed host labels, so
+    subdomains inherit the rules of their closest listed parent domain
+    (e.g. 'news.google.com' uses the 'google.com' rules). Resolving a host
+    walks the trie once and returns a shared frozenset, so per-parameter
+    checks are plain set membership tests.
+    """
+
+    __slots__ = ("_params", "_trie")
+
+    def __init__(self, allowlist: Mapping | Collection | None = None) -> None:
+        """Compile an allowlist.
+
+        Params:
+            allowlist: Optional override for default allowlist
+                If provided as a list (or another collection), it applies to
+                every host. If provided as a dictionary, it should map domain
+                names to lists of allowed parameters.
+                If None, the default allowlist will be used.
+
+        """
+        if allowlist is None:
+            allowlist = DEFAULT_ALLOWLIST
+        self._params: frozenset[str] | None = None
+        self._trie: DomainTrie[frozenset[str]] = DomainTrie()
+        if not isinstance(allowlist, Mapping):
+            self._params = frozenset(allowlist)
+            return
+        for domain, params in allowlist.items():
+            self._trie.add(domain, frozenset(params))
+
+    def lookup(self, host: str | None) -> frozenset[str]:
+        """Get allowed parameters for a host.
+
+        Params:
+            host: Host name, optionally with a port (e.g. 'www.google.com:80')
+
+        Returns:
+            Frozen set of allowed parameter names for the host
+
+        """
+        if self._params is not None:
+            return self._params
+        if not host:
+            return NO_PARAMS
+        params = self._trie.lookup(host)
+        return NO_PARAMS if params is None else params
+
+
+DEFAULT_ALLOWLIST_INDEX = AllowlistIndex(DEFAULT_ALLOWLIST)
+
+
+def compile_allowlist(
+    allowlist: AllowlistIndex | Mapping | Collection | None = None,
+) -> AllowlistIndex:
+    """Compile an allowlist, reusing already compiled and default ones.
+
+    Params:
+        allowlist: Allowlist as accepted by AllowlistIndex, or a compiled one
+
+    Returns:
+        Compiled allowlist index
+
+    """
+    if isinstance(allowlist, AllowlistIndex):
+        return allowlist
+    if allowlist is None:
+        return DEFAULT_ALLOWLIST_INDEX
+    return AllowlistIndex(allowlist)
+
 
 def get_allowed_params(
     host: str | None = None,
-    allowlist: dict | list | None = None,
+    allowlist: AllowlistIndex | Mapping | Collection | None = None,
 ) -> set[str]:
     """Get allowed parameters for a given domain.
 
     Params:
         host: Domain name to check (e.g. 'google.com')
         allowlist: Optional override for default allowlist
-            If provided as a list, it will be used as is.
+            If provided as a list (or another collection), it will be used as is.
             If provided as a dictionary, it should map domain names to
-            lists of allowed parameters.
+            lists of allowed parameters. Subdomains inherit the parameters
+            of their closest listed parent domain.
             If None, the default allowlist will be used.
 
     Returns:
         Set of allowed parameter names for the domain
 
     """
-    if isinstance(allowlist, list):
-        return set(allowlist)
-
-    if not host:
-        return set()
-
-    # Normalize host by removing www and port
-    domain = host.lower()
-    domain = domain.removeprefix("www.")
-    domain = domain.split(":")[0]
-
-    # Use default allowlist if none provided
-    if allowlist is None:
-        allowlist = DEFAULT_ALLOWLIST
-
-    # Return allowed parameters for the domain, or an empty set if not found
-    return set(allowlist.get(domain, []))
+    return set(compile_allowlist(allowlist).lookup(host))
@@ -0,0 +1,260 @@
+"""URL query parameter denylist module."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from .domain_trie import DomainTrie
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+# Tracking parameters added by analytics, advertising and mailing tools
+DEFAULT_DENYLIST = [
+    # Google Analytics and Urchin campaign parameters
+    "utm_*",
+    "_ga",
+    "_gl",
+    # Ad click identifiers
+    "gclid",
+    "gclsrc",
+    "dclid",
+    "gbraid",
+    "wbraid",
+    "fbclid",
+    "msclkid",
+    "yclid",
+    "twclid",
+    "ttclid",
+    "li_fat_id",
+    "igshid",
+    # Mailing and marketing automation
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "__hs*",
+    "hsa_*",
+    "mkt_tok",
+    "vero_conv",
+    "vero_id",
+    "oly_anon_id",
+    "oly_enc_id",
+    "rb_clickid",
+    "s_cid",
+    "wickedid",
+    "_openstat",
+    # Piwik and Matomo campaign parameters
+    "pk_*",
+    "mtm_*",
+]
+
+# Key of the rules that apply to every host in a denylist mapping
+ALL_HOSTS = "*"
+# Prefix of the rules that exempt parameters from the denylist
+EXEMPT_PREFIX = "!"
+
+_WILDCARDS = re.compile(r"[*?]")
+
+
+def _rule_pattern(rule: str) -> str:
+    """Translate a glob rule to a regex; '*' matches any characters, '?' one."""
+    return "".join(
+        ".*" if part == "*" else "." if part == "?" else re.escape(part)
+        for part in re.split(r"([*?])", rule)
+        if part
+    )
+
+
+class _RuleSet:
+    """Parameter names, prefixes and globs compiled for membership tests.
+
+    Exact names go into a frozenset; prefix ('utm_*') and glob rules are
+    joined into one regex, which is only tried for names not in the set.
+    """
+
+    __slots__ = ("_match", "names", "rules")
+
+    def __init__(self, rules: Iterable[str]) -> None:
+        self.rules = tuple(rules)
+        names = set()
+        patterns = []
+        for rule in self.rules:
+            if _WILDCARDS.search(rule):
+                patterns.append(_rule_pattern(rule))
+            else:
+                names.add(rule)
+        self.names = frozenset(names)
+        # Sorted so equal rule sets compile to the same regex
+        self._match = (
+            re.compile("|".join(sorted(set(patterns))), re.DOTALL).fullmatch
+            if patterns
+            else None
+        )
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a parameter name matches any rule."""
+        if name in self.names:
+            return True
+        match = self._match
+        return match is not None and match(name) is not None
+
+    def __bool__(self) -> bool:
+        """Check whether there is any rule."""
+        return bool(self.names) or self._match is not None
+
+
+class DeniedParams:
+    """Parameters denied on one host: denylist rules minus exemptions.
+
+    Supports 'name in denied' in about constant time: a set lookup, then one
+    regex match for names that may match a prefix or glob rule.
+    """
+
+    __slots__ = ("_denied", "_exempt")
+
+    def __init__(self, denied: Iterable[str], exempt: Iterable[str] = ()) -> None:
+        """Compile denylist rules and exemptions.
+
+        Params:
+            denied: Parameter names, prefixes ('utm_*') or globs ('*_id?')
+            exempt: Rules of the same form for parameters that are kept
+
+        """
+        self._denied = _RuleSet(denied)
+        self._exempt = _RuleSet(exempt)
+
+    def extend(self, rules: Collection[str]) -> DeniedParams:
+        """Add denylist rules and '!' exemptions to these ones.
+
+        Params:
+            rules: Rules as listed for a domain in a denylist
+
+        Returns:
+            DeniedParams of the combined rules
+
+        """
+        denied, exempt = _split_rules(rules)
+        return DeniedParams(
+            [*self._denied.rules, *denied], [*self._exempt.rules, *exempt]
+        )
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a parameter is denied."""
+        return name in self._denied and name not in self._exempt
+
+    def __bool__(self) -> bool:
+        """Check whether any parameter can be denied."""
+        return bool(self._denied)
+
+
+def _split_rules(rules: Collection[str]) -> tuple[list[str], list[str]]:
+    """Split rules into denylist rules and exemptions, without the '!'."""
+    denied = []
+    exempt = []
+    for rule in rules:
+        if rule.startswith(EXEMPT_PREFIX):
+            exempt.append(rule[len(EXEMPT_PREFIX) :])
+        else:
+            denied.append(rule)
+    return denied, exempt
+
+
+class DenylistIndex:
+    """Compiled parameter denylist.
+
+    Rules for every host are layered with per-domain rules, which are
+    stored in a DomainTrie keyed by reversed host labels, like AllowlistIndex:
+    a host gets the rules of all its listed parent domains on top of the
+    global ones. The combined rules of each listed domain are compiled once,
+    so resolving a host walks the trie and returns a shared DeniedParams.
+    """
+
+    __slots__ = ("_default", "_trie")
+
+    def __init__(self, denylist: Mapping | Collection | None = None) -> None:
+        """Compile a denylist.
+
+        Params:
+            denylist: Optional override for default denylist
+                Rules are parameter names, prefixes such as 'utm_*' or globs
+                where '*' matches any characters and '?' one character;
+                rules starting with '!' exempt matching parameters.
+                If provided as a list (or another collection), it replaces
+                the default rules for every host. If provided as a
+                dictionary, it maps domain names to rules added to the
+                default ones for the domain and its subdomains, and the
+                '*' key, if any, replaces the default rules.
+                If None, the default denylist will be used.
+
+        """
+        if denylist is None:
+            denylist = DEFAULT_DENYLIST
+        if not isinstance(denylist, Mapping):
+            denylist = {ALL_HOSTS: denylist}
+        denied, exempt = _split_rules(denylist.get(ALL_HOSTS, DEFAULT_DENYLIST))
+        self._default = DeniedParams(denied, exempt)
+        rules_trie: DomainTrie[Collection[str]] = DomainTrie()
+        for domain, rules in denylist.items():
+            if domain != ALL_HOSTS:
+                rules_trie.add(domain, rules)
+        self._trie = rules_trie.inherit(DeniedParams.extend, self._default)
+
+    def lookup(self, host: str | None) -> DeniedParams:
+        """Get denied parameters for a host.
+
+        Params:
+            host: Host name, optionally with a port (e.g. 'www.google.com:80')
+
+        Returns:
+            DeniedParams supporting 'name in denied' checks
+
+        """
+        if not host or not self._trie:
+            return self._default
+        denied = self._trie.lookup(host)
+        return self._default if denied is None else denied
+
+
+DEFAULT_DENYLIST_INDEX = DenylistIndex(DEFAULT_DENYLIST)
+
+
+def compile_denylist(
+    denylist: DenylistIndex | Mapping | Collection | None = None,
+) -> DenylistIndex:
+    """Compile a denylist, reusing already compiled and default ones.
+
+    Params:
+        denylist: Denylist as accepted by DenylistIndex, or a compiled one
+
+    Returns:
+        Compiled denylist index
+
+    """
+    if isinstance(denylist, DenylistIndex):
+        return denylist
+    if denylist is None:
+        return DEFAULT_DENYLIST_INDEX
+    return DenylistIndex(denylist)
+
+
+def is_denied_param(
+    param: str,
+    host: str | None = None,
+    denylist: DenylistIndex | Mapping | Collection | None = None,
+) -> bool:
+    """Check whether a parameter is denied on a host.
+
+    Params:
+        param: Normalized parameter name (e.g. 'utm_source')
+        host: Domain name to check (e.g. 'google.com')
+        denylist: Optional override for default denylist, as accepted by
+            DenylistIndex
+
+    Returns:
+        True if the parameter is stripped on the host
+
+    """
+    return param in compile_denylist(denylist).lookup(host)
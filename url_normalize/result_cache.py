@@ -0,0 +1,108 @@
+"""Opt-in cache of whole normalization results.
+
+Traffic often repeats whole URLs, e.g. home pages and popular articles.
+While the result cache is enabled, every Normalizer, and so url_normalize(),
+looks a URL up by (normalizer, URL) before running the pipeline. Entries
+are evicted least recently used first once their approximate size in bytes
+exceeds the limit. Results are always those of the pipeline: normalizers
+are immutable, so an entry is never stale.
+
+Cache hits skip the pipeline, so instrumentation neither times them nor
+counts them as calls or pipeline events; it counts each one as a
+result_cache_hit event instead.
+
+Nothing is cached until enable() is called. Disabled, the cache is the None
+value of the module's `active` attribute, which Normalizer tests before
+looking a URL up; disable() drops the cached results at once.
+
+>>> from url_normalize import result_cache, url_normalize
+>>> cache = result_cache.enable(max_bytes=1 << 20)
+>>> url_normalize("www.foo.com:80/foo")
+'https://www.foo.com:80/foo'
+>>> url_normalize("www.foo.com:80/foo")
+'https://www.foo.com:80/foo'
+>>> result_cache.info().hits
+1
+>>> result_cache.disable()
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+from .cache import SizedCacheInfo, SizedLRUCache
+
+if TYPE_CHECKING:
+    from .normalizer import Normalizer
+
+DEFAULT_MAX_BYTES = 64 << 20
+# Approximate bytes of the dict entry, key tuple and size of a cached result
+ENTRY_OVERHEAD = 240
+
+_sizeof = sys.getsizeof
+
+
+def entry_size(key: tuple[Normalizer, str], result: str) -> int:
+    """Estimate the memory held by a cached result, in bytes.
+
+    The URL and result strings are counted once each, the result not at
+    all when it is the URL itself; the normalizer is shared by all entries.
+    """
+    url = key[1]
+    size = _sizeof(url) + ENTRY_OVERHEAD
+    return size if result is url else size + _sizeof(result)
+
+
+# The active cache, None while the result cache is disabled
+active: SizedLRUCache[tuple[Normalizer, str], str] | None = None
+
+
+def enable(max_bytes: int = DEFAULT_MAX_BYTES) -> SizedLRUCache:
+    """Start caching results in a new, empty cache, replacing the active one.
+
+    Params:
+        max_bytes: Approximate memory limit of the cached results
+
+    Returns:
+        The active cache
+
+    Raises:
+        ValueError: If max_bytes is negative
+
+    """
+    global active  # noqa: PLW0603
+    active = SizedLRUCache(max_bytes, entry_size)
+    return active
+
+
+def disable() -> None:
+    """Stop caching results and release the cached ones."""
+    global active  # noqa: PLW0603
+    active = None
+
+
+def is_enabled() -> bool:
+    """Check whether results are cached."""
+    return active is not None
+
+
+def info() -> SizedCacheInfo:
+    """Return the statistics of the active cache.
+
+    Returns:
+        SizedCacheInfo with hit and miss counts, hit_ratio, and the
+        approximate memory used; all zero while the cache is disabled
+
+    """
+    cache = active
+    if cache is None:
+        return SizedCacheInfo(0, 0, 0, 0, 0, 0)
+    return cache.info()
+
+
+def clear() -> None:
+    """Remove the cached results and reset the statistics, if enabled."""
+    cache = active
+    if cache is not None:
+        cache.clear()
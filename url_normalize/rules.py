@@ -0,0 +1,259 @@
+"""Parameter allowlist and denylist rules loaded from JSON or TOML files.
+
+A rules file holds an optional allowlist and an optional denylist, in the
+forms accepted by the param_allowlist and param_denylist options:
+
+    # rules.toml
+    denylist = ["utm_*", "fbclid", "ref"]
+
+    [allowlist]
+    "google.com" = ["q", "ie"]
+    "example.com" = ["page", "id"]
+
+Files ending in '.toml' are read as TOML, with tomllib (Python 3.11+), and
+other files as JSON. RulesFile reloads a file when it changes, for
+long-running processes.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from time import monotonic
+from typing import Any, NamedTuple
+
+from .normalizer import Normalizer
+
+RULE_KEYS = ("allowlist", "denylist")
+# Seconds between checks of the file modification time
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+class Rules(NamedTuple):
+    """Parameter rules of one version of a rules file.
+
+    Attributes:
+        param_allowlist: Allowlist for the param_allowlist option, or None
+        param_denylist: Denylist for the param_denylist option, or None
+        version: Hex digest of the file content, which changes whenever the
+            rules may have; use it in the keys of caches of normalized URLs
+
+    """
+
+    param_allowlist: dict[str, list[str]] | list[str] | None
+    param_denylist: dict[str, list[str]] | list[str] | None
+    version: str
+
+
+def _check_params(name: str, params: Any) -> dict | list:  # noqa: ANN401
+    """Validate a list of parameters or a mapping of domains to lists."""
+    if isinstance(params, list) and all(isinstance(param, str) for param in params):
+        return params
+    if isinstance(params, dict) and all(
+        isinstance(rules, list) and all(isinstance(rule, str) for rule in rules)
+        for rules in params.values()
+    ):
+        return params
+    msg = f"{name} must be a list of strings or a table of lists of strings"
+    raise ValueError(msg)
+
+
+def parse_rules(data: bytes, *, toml: bool = False) -> Rules:
+    """Parse the content of a rules file.
+
+    Params:
+        data: File content, UTF-8 encoded
+        toml: Parse data as TOML instead of JSON
+
+    Returns:
+        Rules : the allowlist and denylist, and the version of data
+
+    Raises:
+        TypeError: If data does not hold a table
+        ValueError: If data is not valid JSON or TOML, or the rules are not
+            lists of strings or tables of them
+
+    """
+    from hashlib import blake2b
+
+    if toml:
+        if sys.version_info < (3, 11):
+            msg = "TOML rules files require Python 3.11 or later"
+            raise ValueError(msg)
+        import tomllib
+
+        content = tomllib.loads(data.decode("utf-8"))
+    else:
+        import json
+
+        content = json.loads(data)
+    if not isinstance(content, dict):
+        msg = "rules must be a table with 'allowlist' and 'denylist' keys"
+        raise TypeError(msg)
+    unknown = sorted(set(content) - set(RULE_KEYS))
+    if unknown:
+        msg = f"unknown rules keys: {', '.join(unknown)}"
+        raise ValueError(msg)
+    allowlist, denylist = (
+        None if content.get(key) is None else _check_params(key, content[key])
+        for key in RULE_KEYS
+    )
+    version = blake2b(data, digest_size=8).hexdigest()
+    return Rules(allowlist, denylist, version)
+
+
+def load_rules(path: str | os.PathLike[str]) -> Rules:
+    """Load a rules file.
+
+    Params:
+        path: JSON file, or TOML file if its name ends in '.toml'
+
+    Returns:
+        Rules : the allowlist and denylist of the file, and their version
+
+    Raises:
+        OSError: If the file cannot be read
+        TypeError: If the file does not hold a table
+        ValueError: If the file is not a valid rules file
+
+    """
+    with open(path, "rb") as stream:  # noqa: PTH123
+        data = stream.read()
+    return parse_rules(data, toml=os.fspath(path).endswith(".toml"))
+
+
+class _State(NamedTuple):
+    """Rules loaded from one version of a file, swapped as a whole."""
+
+    stamp: tuple[int, int, int]
+    rules: Rules
+    normalizers: dict[tuple, Normalizer]
+
+
+def _stamp(path: str | os.PathLike[str]) -> tuple[int, int, int]:
+    """Identify a version of a file by its inode, size and mtime."""
+    stat = os.stat(path)  # noqa: PTH116
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class RulesFile:
+    """Rules file reloaded when its modification time changes.
+
+    The rules and the normalizers built from them are held in one state
+    object, replaced by a single assignment on reload, so normalizations in
+    progress keep using the rules they started with. The file is checked at
+    most once per check_interval seconds, by the first caller after the
+    interval; callers arriving while a reload is in progress use the
+    current rules instead of waiting. A file that fails to load is reported
+    in last_error and the previous rules stay in use.
+
+    >>> rules = RulesFile("rules.toml")  # doctest: +SKIP
+    >>> normalize = rules.normalizer(strip_tracking_params=True)  # doctest: +SKIP
+    """
+
+    __slots__ = (
+        "_check_interval",
+        "_lock",
+        "_next_check",
+        "_state",
+        "last_error",
+        "path",
+    )
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ) -> None:
+        """Load a rules file.
+
+        Params:
+            path: JSON file, or TOML file if its name ends in '.toml'
+            check_interval: Minimum number of seconds between checks of the
+                file modification time; 0 checks on every access
+
+        Raises:
+            OSError: If the file cannot be read
+            TypeError: If the file does not hold a table
+            ValueError: If the file is not a valid rules file
+
+        """
+        self.path = path
+        self.last_error: Exception | None = None
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        stamp = _stamp(path)
+        self._state = _State(stamp, load_rules(path), {})
+        self._next_check = monotonic() + check_interval
+
+    def reload(self) -> bool:
+        """Reload the file now if it changed since it was last loaded.
+
+        Returns:
+            bool : True if new rules were loaded; False if the file did not
+                change, failed to load, or another thread is reloading it
+
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = monotonic() + self._check_interval
+            try:
+                stamp = _stamp(self.path)
+                if stamp == self._state.stamp:
+                    return False
+                rules = load_rules(self.path)
+            except (OSError, TypeError, ValueError) as e:
+                self.last_error = e
+                return False
+            self.last_error = None
+            self._state = _State(stamp, rules, {})
+            return True
+        finally:
+            self._lock.release()
+
+    def _current(self) -> _State:
+        """Return the current state, reloading the file if it is time to."""
+        if monotonic() >= self._next_check:
+            self.reload()
+        return self._state
+
+    @property
+    def rules(self) -> Rules:
+        """The current rules, reloaded if the file changed."""
+        return self._current().rules
+
+    @property
+    def version(self) -> str:
+        """Version of the current rules, see Rules.version."""
+        return self._current().rules.version
+
+    def normalizer(self, **options: Any) -> Normalizer:  # noqa: ANN401
+        """Return a Normalizer bound to the current rules and options.
+
+        Normalizers are built once per version of the file and set of
+        options; keep calling this rather than keeping the result to pick
+        up new rules.
+
+        Params:
+            **options: Keyword options accepted by Normalizer, except
+                param_allowlist and param_denylist
+
+        Returns:
+            Normalizer : normalizer using the allowlist and denylist of the
+                file
+
+        """
+        state = self._current()
+        key = tuple(sorted(options.items()))
+        normalizer = state.normalizers.get(key)
+        if normalizer is None:
+            rules = state.rules
+            normalizer = state.normalizers[key] = Normalizer(
+                param_allowlist=rules.param_allowlist,
+                param_denylist=rules.param_denylist,
+                **options,
+            )
+        return normalizer
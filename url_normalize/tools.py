@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from functools import cache
 from typing import NamedTuple
-from urllib.parse import quote as quote_orig
 from urllib.parse import unquote as unquote_orig
-from urllib.parse import urlsplit, urlunsplit
+from urllib.parse import uses_netloc
 
 
 class URL(NamedTuple):
@@ -26,33 +26,126 @@ class URL(NamedTuple):
     fragment: str
 
 
+# Characters stripped from the start of a URL and removed anywhere in it,
+# as in urllib.parse.urlsplit
+C0_CONTROL_OR_SPACE = "".join(map(chr, range(0x21)))
+UNSAFE_URL_CHARS = ("\t", "\r", "\n")
+SCHEME_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-."
+)
+# Schemes whose empty or absolute paths are written with an empty authority
+USES_NETLOC = frozenset(uses_netloc)
+
+_authority_end = re.compile("[/?#]")
+
+
+def _check_authority(authority: str) -> None:
+    """Reject authorities that urllib.parse.urlsplit rejects.
+
+    Raises:
+        ValueError: On unbalanced or invalid brackets, or characters that
+            change meaning under NFKC normalization
+
+    """
+    if "[" in authority or "]" in authority:
+        if "[" not in authority or "]" not in authority:
+            msg = "Invalid IPv6 URL"
+            raise ValueError(msg)
+        bracketed = authority.partition("[")[2].partition("]")[0]
+        if bracketed.startswith("v"):
+            if not re.match(r"\Av[a-fA-F0-9]+\..+\Z", bracketed):
+                msg = "IPvFuture address is invalid"
+                raise ValueError(msg)
+        else:
+            import ipaddress
+
+            if isinstance(ipaddress.ip_address(bracketed), ipaddress.IPv4Address):
+                msg = "An IPv4 address cannot be in brackets"
+                raise ValueError(msg)
+    if not authority.isascii():
+        # Look for characters like \u2100 that expand to 'a/c'
+        chars = authority.translate({ord(c): None for c in "@:#?"})
+        normalized = unicodedata.normalize("NFKC", chars)
+        if normalized != chars and any(c in normalized for c in "/?#@:"):
+            msg = (
+                f"netloc '{authority}' contains invalid characters "
+                "under NFKC normalization"
+            )
+            raise ValueError(msg)
+
+
 def deconstruct_url(url: str) -> URL:
     """Transform the url into URL structure.
 
+    Splits the url into its seven components in a single left-to-right pass,
+    with the same component boundaries as urllib.parse.urlsplit. Bracketed
+    IPv6 hosts are kept whole, e.g. '[::1]:8080' gives host '[::1]' and
+    port '8080'.
+
     Params:
         url : string : the URL
 
     Returns:
         URL
 
+    Raises:
+        ValueError: If the authority is invalid
+
     """
-    scheme, auth, path, query, fragment = urlsplit(url.strip())
-    match = re.search(r"([^@]*@)?([^:]*):?(.*)", auth)
-    (userinfo, host, port) = match.groups()  # type: ignore  # noqa: PGH003
-    return URL(
-        fragment=fragment,
-        host=host,
-        path=path,
-        port=port or "",
-        query=query,
-        scheme=scheme,
-        userinfo=userinfo or "",
-    )
+    url = url.strip().lstrip(C0_CONTROL_OR_SPACE)
+    for char in UNSAFE_URL_CHARS:
+        if char in url:
+            url = url.replace(char, "")
+
+    scheme = ""
+    start = 0
+    colon = url.find(":")
+    if (
+        colon > 0
+        and url[0].isascii()
+        and url[0].isalpha()
+        and SCHEME_CHARS.issuperset(url[:colon])
+    ):
+        scheme = url[:colon].lower()
+        start = colon + 1
+
+    userinfo = host = port = ""
+    if url.startswith("//", start):
+        match = _authority_end.search(url, start + 2)
+        end = match.start() if match else len(url)
+        authority = url[start + 2 : end]
+        start = end
+        if not authority.isascii() or "[" in authority or "]" in authority:
+            _check_authority(authority)
+        at = authority.find("@") + 1
+        userinfo = authority[:at]
+        host_port = authority[at:]
+        # Keep bracketed IPv6 hosts whole, e.g. '[::1]:8080'
+        bracket = host_port.find("]") + 1 if host_port.startswith("[") else 0
+        if bracket and host_port[bracket : bracket + 1] in {"", ":"}:
+            host, port = host_port[:bracket], host_port[bracket + 1 :]
+        else:
+            host, _, port = host_port.partition(":")
+
+    fragment = ""
+    end = url.find("#", start)
+    if end >= 0:
+        fragment = url[end + 1 :]
+    else:
+        end = len(url)
+    query = ""
+    question = url.find("?", start, end)
+    if question >= 0:
+        query = url[question + 1 : end]
+        end = question
+    return URL(scheme, userinfo, host, port, url[start:end], query, fragment)
 
 
 def reconstruct_url(url: URL) -> str:
     """Reconstruct string url from URL.
 
+    Joins the components the way urllib.parse.urlunsplit does.
+
     Params:
         url : URL object instance
 
@@ -60,28 +153,113 @@ def reconstruct_url(url: URL) -> str:
         string : reconstructed url string
 
     """
-    auth = (url.userinfo or "") + url.host
-    if url.port:
-        auth += ":" + url.port
-    return urlunsplit((url.scheme, auth, url.path, url.query, url.fragment))
+    scheme, userinfo, host, port, path, query, fragment = url
+    if userinfo or host or port:
+        if path and path[0] != "/":
+            path = "/" + path
+        port = ":" + port if port else ""
+        result = f"//{userinfo}{host}{port}{path}"
+    elif path[:2] == "//" or (
+        scheme and scheme in USES_NETLOC and (not path or path[0] == "/")
+    ):
+        result = "//" + path
+    else:
+        result = path
+    if scheme:
+        result = f"{scheme}:{result}"
+    if query:
+        result = f"{result}?{query}"
+    if fragment:
+        result = f"{result}#{fragment}"
+    return result
+
+
+# Codecs that already skip ASCII text in C, used as is by force_unicode()
+FAST_ASCII_CODECS = frozenset(
+    {"utf-8", "utf8", "UTF-8", "ascii", "latin-1", "latin1", "iso-8859-1"}
+)
+
+
+@cache
+def is_ascii_compatible(charset: str) -> bool:
+    """Check that a charset encodes ASCII text as the same ASCII bytes.
+
+    Params:
+        charset : str : codec name
+
+    Returns:
+        bool : True for e.g. UTF-8 and Latin-1, False for e.g. UTF-16
+
+    """
+    ascii_bytes = bytes(range(128))
+    try:
+        return ascii_bytes.decode(charset) == ascii_bytes.decode("ascii")
+    except UnicodeDecodeError:
+        return False
 
 
-def force_unicode(string: str | bytes, charset: str = "utf-8") -> str:
+def force_unicode(
+    string: str | bytes | bytearray | memoryview, charset: str = "utf-8"
+) -> str:
     """Ensure string is properly encoded (Python 3 only).
 
+    Bytes-like input is decoded with charset, replacing invalid sequences.
+    ASCII input in other ASCII-compatible charsets than FAST_ASCII_CODECS
+    is decoded as ASCII, which skips slow codecs like cp1252.
+
     Params:
-        string : str : an input string
-        charset : str : optional : output encoding
+        string : str | bytes | bytearray | memoryview : an input string
+        charset : str : optional : input encoding
 
     Returns:
         str
 
     """
-    if isinstance(string, bytes):
+    if isinstance(string, (bytes, bytearray)):
+        if (
+            charset not in FAST_ASCII_CODECS
+            and string.isascii()
+            and is_ascii_compatible(charset)
+        ):
+            return string.decode("ascii")
         return string.decode(charset, "replace")
+    if isinstance(string, memoryview):
+        if charset not in FAST_ASCII_CODECS and is_ascii_compatible(charset):
+            # Decode the buffer in place, without copying it to bytes first
+            try:
+                return str(string, "ascii")
+            except UnicodeDecodeError:
+                pass
+        return str(string, charset, "replace")
     return string
 
 
+def force_bytes(string: str, charset: str = "utf-8") -> bytes:
+    """Encode a string with charset, the inverse of force_unicode().
+
+    ASCII text in other ASCII-compatible charsets than FAST_ASCII_CODECS
+    is encoded as ASCII.
+
+    Params:
+        string : str : an input string
+        charset : str : optional : output encoding
+
+    Returns:
+        bytes
+
+    Raises:
+        UnicodeEncodeError: If the string cannot be encoded with charset
+
+    """
+    if (
+        charset not in FAST_ASCII_CODECS
+        and string.isascii()
+        and is_ascii_compatible(charset)
+    ):
+        return string.encode("ascii")
+    return string.encode(charset)
+
+
 def unquote(string: str, charset: str = "utf-8") -> str:
     """Unquote and normalize unicode string.
 
@@ -95,13 +273,144 @@ def unquote(string: str, charset: str = "utf-8") -> str:
     """
     string = unquote_orig(string)
     string = force_unicode(string, charset)
-    encoded_str = unicodedata.normalize("NFC", string).encode(charset)
-    return encoded_str.decode(charset)
+    if not string.isascii():
+        # ASCII text is always NFC
+        string = unicodedata.normalize("NFC", string)
+    return string.encode(charset).decode(charset)
+
+
+# Characters never quoted, as in urllib.parse.quote
+ALWAYS_SAFE = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~"
+)
+
+
+@cache
+def quote_table(safe: str) -> dict[int, str]:
+    """Build the translation table used to quote UTF-8 bytes.
+
+    The table maps every byte that is neither always safe nor listed in safe
+    to its uppercase percent-escape. Non-ASCII characters in safe are ignored.
+
+    Params:
+        safe : string of safe characters
+
+    Returns:
+        dict : str.translate() table keyed by byte value
+
+    """
+    safe_chars = ALWAYS_SAFE.union(char for char in safe if char.isascii())
+    return {byte: f"%{byte:02X}" for byte in range(256) if chr(byte) not in safe_chars}
+
+
+# Percent-encoded well-formed UTF-8 sequences of two to four bytes (RFC 3629)
+_CONTINUATION = "%[89AB][0-9A-F]"
+UTF8_ESCAPES = (
+    f"%(?:C[2-9A-F]|D[0-9A-F]){_CONTINUATION}"
+    f"|%E0%[AB][0-9A-F]{_CONTINUATION}"
+    f"|%E[1-9A-CEF]{_CONTINUATION}{_CONTINUATION}"
+    f"|%ED%[89][0-9A-F]{_CONTINUATION}"
+    f"|%F0%(?:9[0-9A-F]|[AB][0-9A-F]){_CONTINUATION}{_CONTINUATION}"
+    f"|%F[1-3]{_CONTINUATION}{_CONTINUATION}{_CONTINUATION}"
+    f"|%F4%8[0-9A-F]{_CONTINUATION}{_CONTINUATION}"
+)
+_non_ascii_escape = re.compile("%[C-F]")
+
+
+@cache
+def canonical_pattern(safe: str) -> re.Pattern[str]:
+    """Build a regex matching strings already quoted with the given safe set.
+
+    A string matches when it is ASCII, its literal characters are all safe
+    (a literal '%' never is), and every percent-escape is uppercase and
+    encodes either an ASCII character that is not safe or a well-formed UTF-8
+    sequence. Escaped UTF-8 text must also pass has_canonical_escapes().
+
+    Params:
+        safe : string of safe characters
+
+    Returns:
+        re.Pattern : pattern to fullmatch() against a component
+
+    """
+    safe_chars = ALWAYS_SAFE.union(c for c in safe if c.isascii())
+    literals = "".join(map(re.escape, sorted(safe_chars - {"%"})))
+    ascii_escapes = "|".join(
+        f"{byte:02X}" for byte in range(128) if chr(byte) not in safe_chars
+    )
+    # Unambiguous form: every repetition starts with '%', so mismatches fail
+    # in linear time instead of backtracking over runs of literals
+    escape = f"%(?:{ascii_escapes})|{UTF8_ESCAPES}"
+    return re.compile(f"[{literals}]*(?:(?:{escape})[{literals}]*)*")
+
+
+def has_canonical_escapes(string: str, safe: str, charset: str = "utf-8") -> bool:
+    """Check that the escaped UTF-8 text of a quoted string is normalized.
+
+    Complements canonical_pattern(): escaped text must be NFC and encoded in
+    UTF-8, and must not contain safe characters, to survive re-quoting.
+
+    Params:
+        string : string matched by canonical_pattern(safe)
+        safe : string of safe characters
+        charset : string : optional : charset used to unquote the string
+
+    Returns:
+        bool : True if quote(unquote(string, charset), safe) returns string
+
+    """
+    if not _non_ascii_escape.search(string):
+        return True
+    return (
+        charset == "utf-8"
+        and safe.isascii()
+        and unicodedata.is_normalized("NFC", unquote_orig(string))
+    )
+
+
+def is_canonical(string: str, safe: str, charset: str = "utf-8") -> bool:
+    """Check that a string is already minimally quoted with uppercase escapes.
+
+    Params:
+        string : string to check
+        safe : string of safe characters
+        charset : string : optional : charset used to unquote the string
+
+    Returns:
+        bool : True if quote(unquote(string, charset), safe) returns string
+
+    """
+    return canonical_pattern(safe).fullmatch(string) is not None and (
+        has_canonical_escapes(string, safe, charset)
+    )
+
+
+def requote(string: str, safe: str, charset: str = "utf-8") -> str:
+    """Normalize the percent-encoding of a string.
+
+    Equivalent to quote(unquote(string, charset), safe), but returns canonical
+    input (see is_canonical) as is, without the decode/encode round trip.
+
+    Params:
+        string : string to be normalized
+        safe : string of safe characters
+        charset : string : optional : output encoding
+
+    Returns:
+        string : minimally quoted string with uppercase escapes
+
+    """
+    if is_canonical(string, safe, charset):
+        return string
+    return quote(unquote(string, charset), safe)
 
 
 def quote(string: str, safe: str = "/") -> str:
     """Quote string.
 
+    Equivalent to urllib.parse.quote(string, safe), but uses a precomputed
+    translation table per safe set instead of quoting byte by byte.
+
     Params:
         string : string to be quoted
         safe : string of safe characters
@@ -110,4 +419,4 @@ def quote(string: str, safe: str = "/") -> str:
         string : quoted string
 
     """
-    return quote_orig(string, safe)
+    return string.encode("utf-8").decode("latin-1").translate(quote_table(safe))
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+from itertools import chain
+from typing import TYPE_CHECKING
 from urllib.parse import unquote
 
-import idna
+from .cache import LRUCache
+from .normalize_fragment import normalize_fragment
+from .normalize_host import DEFAULT_CHARSET, normalize_host
+from .normalize_path import normalize_path
+from .normalize_port import normalize_port
+from .normalize_query import normalize_query
+from .normalize_scheme import DEFAULT_SCHEME, normalize_scheme
+from .normalize_userinfo import normalize_userinfo
+from .normalizer import is_prepared
+from .tools import UNSAFE_URL_CHARS, URL, deconstruct_url, reconstruct_url
+from .url_normalize import url_normalize, url_normalize_structured
 
-from .normalize_host import DEFAULT_CHARSET
-from .normalize_scheme import DEFAULT_SCHEME
-from .tools import URL, deconstruct_url, reconstruct_url
-from .url_normalize import url_normalize
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .normalized_url import NormalizedURL
 
 UNICODE_REPLACEMENT_CHARACTER = "\ufffd"
+DEFAULT_LABEL_CACHE_SIZE = 4096
+
+_label_cache: LRUCache[str, str] = LRUCache(DEFAULT_LABEL_CACHE_SIZE)
 
 
 def _humanize_host(host: str) -> str:
@@ -19,17 +34,16 @@ def _humanize_host(host: str) -> str:
 
 
 def _humanize_host_label(label: str) -> str:
-    try:
-        return idna.decode(label)
-    except idna.IDNAError:
-        return label
+    result = _label_cache.get(label)
+    if result is None:
+        import idna
 
-
-def _replace_if_round_trips(url: URL, normalized: str, **changes: str) -> URL:
-    candidate = url._replace(**changes)
-    if url_normalize(reconstruct_url(candidate)) == normalized:
-        return candidate
-    return url
+        try:
+            result = idna.decode(label)
+        except idna.IDNAError:
+            result = label
+        _label_cache.put(label, result)
+    return result
 
 
 def _safe_unquote(value: str) -> str:
@@ -43,43 +57,177 @@ def _format_query_param(key: str, separator: str, value: str) -> str:
     return f"{key}{separator}{value}" if separator else key
 
 
-def _replace_query_part_if_round_trips(
-    url: URL,
-    normalized: str,
-    parts: list[str],
-    index: int,
-    part: str,
-) -> tuple[URL, list[str]]:
-    candidate_parts = [*parts]
-    candidate_parts[index] = part
-    candidate = url._replace(query="&".join(candidate_parts))
-    if url_normalize(reconstruct_url(candidate)) == normalized:
-        return candidate, candidate_parts
-    return url, parts
-
-
-def _humanize_query(url: URL, normalized: str) -> URL:
-    parts = url.query.split("&")
-    for index, param in enumerate(parts):
-        key, separator, value = param.partition("=")
-
-        url, parts = _replace_query_part_if_round_trips(
-            url,
-            normalized,
-            parts,
-            index,
-            _format_query_param(_safe_unquote(key), separator, value),
-        )
-        key, separator, value = parts[index].partition("=")  # noqa: PLR1736
-        url, parts = _replace_query_part_if_round_trips(
-            url,
-            normalized,
-            parts,
-            index,
-            _format_query_param(key, separator, _safe_unquote(value)),
-        )
-
-    return url
+# Default normalization of each component, given its value and the scheme
+_COMPONENT_NORMALIZERS: dict[str, Callable[[str, str], str]] = {
+    "scheme": lambda value, _: normalize_scheme(value),
+    "userinfo": lambda value, _: normalize_userinfo(value),
+    "host": lambda value, _: normalize_host(value),
+    "port": normalize_port,
+    "path": normalize_path,
+    "query": lambda value, _: normalize_query(value),
+    "fragment": lambda value, _: normalize_fragment(value),
+}
+
+
+def _normalize_component(url: URL, component: str) -> str:
+    """Normalize one component the way url_normalize does by default."""
+    return _COMPONENT_NORMALIZERS[component](getattr(url, component), url.scheme)
+
+
+def _normalize_query_part(part: str) -> list[str]:
+    """Normalize an '&'-separated query part into its normalized parameters."""
+    return normalize_query(part).split("&") if part.strip("&") else []
+
+
+def _keeps_query_split(part: str, *, last: bool) -> bool:
+    """Check that a query part cannot move the component boundaries of a URL.
+
+    Params:
+        part: Query part, between '&' separators
+        last: Whether the part ends the URL
+
+    Returns:
+        True if the URL splits back into the same components
+
+    """
+    if "#" in part or any(char in part for char in UNSAFE_URL_CHARS):
+        return False
+    # Trailing '&', '?' and whitespace are stripped from URLs
+    return not last or (part[-1:] not in {"", "&", "?"} and not part[-1].isspace())
+
+
+class _RoundTrip:
+    """Apply edits to a normalized URL as long as it normalizes the same.
+
+    The normalized components of the current URL are kept, so checking an
+    edit only re-normalizes the edited component, or the edited query
+    parameter. Edits that could move component boundaries are checked by
+    normalizing the whole URL instead.
+    """
+
+    __slots__ = ("_normalized", "_parts", "url")
+
+    def __init__(self, normalized: NormalizedURL) -> None:
+        """Start from the components of a normalized URL.
+
+        Raises:
+            ValueError, UnicodeError: If the normalized URL fails to
+                normalize again, like every edit would
+
+        """
+        self._normalized = str(normalized)
+        self.url = normalized.components
+        # Normalized components of self.url, None if they are not known
+        self._parts: URL | None = None
+        if is_prepared(self._normalized) and (
+            deconstruct_url(self._normalized) == self.url
+        ):
+            parts = URL._make(
+                _normalize_component(self.url, component) for component in URL._fields
+            )
+            if reconstruct_url(parts) == self._normalized:
+                self._parts = parts
+        if self._parts is None:
+            url_normalize(self._normalized)
+
+    def _splits_back(self, url: URL) -> bool:
+        """Check that url_normalize would split a URL into these components."""
+        string = reconstruct_url(url)
+        try:
+            return is_prepared(string) and deconstruct_url(string) == url
+        except ValueError:
+            return False
+
+    def replace(self, component: str, value: str) -> None:
+        """Change a component if the URL still normalizes the same.
+
+        Params:
+            component: URL field name
+            value: New value of the component
+
+        """
+        if value == getattr(self.url, component):
+            return
+        candidate = self.url._replace(**{component: value})
+        if self._parts is not None and self._splits_back(candidate):
+            parts = self._parts._replace(
+                **{component: _normalize_component(candidate, component)}
+            )
+            if reconstruct_url(parts) == self._normalized:
+                self.url = candidate
+                self._parts = parts
+            return
+        if url_normalize(reconstruct_url(candidate)) == self._normalized:
+            self.url = candidate
+            self._parts = None
+
+    def humanize_query(self) -> None:
+        """Unquote query keys and values that normalize back the same."""
+        parts = self.url.query.split("&")
+        normalized_parts = None
+        if self._parts is not None:
+            normalized_parts = [_normalize_query_part(part) for part in parts]
+        for index, param in enumerate(parts):
+            key, separator, value = param.partition("=")
+            self._replace_query_part(
+                parts,
+                normalized_parts,
+                index,
+                _format_query_param(_safe_unquote(key), separator, value),
+            )
+            key, separator, value = parts[index].partition("=")  # noqa: PLR1736
+            self._replace_query_part(
+                parts,
+                normalized_parts,
+                index,
+                _format_query_param(key, separator, _safe_unquote(value)),
+            )
+
+    def _replace_query_part(
+        self,
+        parts: list[str],
+        normalized_parts: list[list[str]] | None,
+        index: int,
+        part: str,
+    ) -> None:
+        """Change a query part if the URL still normalizes the same.
+
+        Params:
+            parts: Query parts of the current URL, updated in place
+            normalized_parts: Normalized parameters of each query part,
+                updated in place; ignored once the normalized components of
+                the URL are unknown
+            index: Index of the part to change
+            part: New value of the part
+
+        """
+        if part == parts[index]:
+            return
+        last = index == len(parts) - 1 and not self.url.fragment
+        if (
+            self._parts is not None
+            and normalized_parts is not None
+            and _keeps_query_split(part, last=last)
+        ):
+            normalized_part = _normalize_query_part(part)
+            query = "&".join(
+                chain.from_iterable(
+                    normalized_part if i == index else params
+                    for i, params in enumerate(normalized_parts)
+                )
+            )
+            if query == self._parts.query:
+                parts[index] = part
+                normalized_parts[index] = normalized_part
+                self.url = self.url._replace(query="&".join(parts))
+            return
+        candidate_parts = [*parts]
+        candidate_parts[index] = part
+        candidate = self.url._replace(query="&".join(candidate_parts))
+        if url_normalize(reconstruct_url(candidate)) == self._normalized:
+            parts[index] = part
+            self.url = candidate
+            self._parts = None
 
 
 def url_humanize(  # noqa: PLR0913
@@ -90,6 +238,11 @@ def url_humanize(  # noqa: PLR0913
     default_domain: str | None = None,
     filter_params: bool = False,
     param_allowlist: dict | list | None = None,
+    strip_tracking_params: bool = False,
+    param_denylist: dict | list | None = None,
+    sort_params: bool = False,
+    sort_param_values: bool = False,
+    collapse_params: bool = False,
 ) -> str | None:
     """Return a human-readable URL representation when it is safe.
 
@@ -98,31 +251,28 @@ def url_humanize(  # noqa: PLR0913
     is intentionally conservative around reserved URL characters and malformed
     percent-encoded bytes.
     """
-    normalized = url_normalize(
+    if not url:
+        return url
+    normalized = url_normalize_structured(
         url,
         charset=charset,
         default_scheme=default_scheme,
         default_domain=default_domain,
         filter_params=filter_params,
         param_allowlist=param_allowlist,
+        strip_tracking_params=strip_tracking_params,
+        param_denylist=param_denylist,
+        sort_params=sort_params,
+        sort_param_values=sort_param_values,
+        collapse_params=collapse_params,
     )
-    if not normalized:
-        return normalized
-
-    url_elements = deconstruct_url(normalized)
-    url_elements = _replace_if_round_trips(
-        url_elements,
-        normalized,
-        host=_humanize_host(url_elements.host),
-    )
+    if normalized is None or not str(normalized):
+        return ""
 
+    round_trip = _RoundTrip(normalized)
+    round_trip.replace("host", _humanize_host(round_trip.url.host))
     for component in ("userinfo", "path", "fragment"):
-        value = getattr(url_elements, component)
-        url_elements = _replace_if_round_trips(
-            url_elements,
-            normalized,
-            **{component: _safe_unquote(value)},
-        )
-    url_elements = _humanize_query(url_elements, normalized)
-
-    return reconstruct_url(url_elements)
+        round_trip.replace(component, _safe_unquote(getattr(round_trip.url, component)))
+    round_trip.humanize_query()
+
+    return reconstruct_url(round_trip.url)
@@ -8,28 +8,247 @@ https://opensource.org/licenses/MIT
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast, overload
+
+from .cache import LRUCache
 from .generic_url_cleanup import generic_url_cleanup
-from .normalize_fragment import normalize_fragment
-from .normalize_host import DEFAULT_CHARSET, normalize_host
-from .normalize_path import normalize_path
+from .normalize_fragment import FRAGMENT_SAFE_CHARS, normalize_fragment
+from .normalize_host import DEFAULT_CHARSET, _normalize_host, normalize_host
+from .normalize_path import PATH_SAFE_CHARS, normalize_path
 from .normalize_port import normalize_port
-from .normalize_query import normalize_query
+from .normalize_query import (
+    QUERY_PARAM_SAFE_CHARS,
+    normalize_query,
+    normalized_query_pattern,
+)
 from .normalize_scheme import DEFAULT_SCHEME, normalize_scheme
 from .normalize_userinfo import normalize_userinfo
+from .normalizer import Normalizer
 from .provide_url_domain import provide_url_domain
 from .provide_url_scheme import provide_url_scheme
-from .tools import deconstruct_url, reconstruct_url
+from .tools import canonical_pattern, deconstruct_url, quote_table, reconstruct_url
+
+if TYPE_CHECKING:
+    import sys
+    from collections.abc import Callable
+
+    from .normalized_url import NormalizedURL
+
+    if sys.version_info >= (3, 11):
+        from typing import Unpack
+    else:
+        from typing_extensions import Unpack
+
+# Pipeline stages stay importable from here for backward compatibility
+__all__ = [
+    "deconstruct_url",
+    "generic_url_cleanup",
+    "get_normalizer",
+    "get_str_normalizer",
+    "is_normalized",
+    "normalize_fragment",
+    "normalize_host",
+    "normalize_path",
+    "normalize_port",
+    "normalize_query",
+    "normalize_scheme",
+    "normalize_userinfo",
+    "provide_url_domain",
+    "provide_url_scheme",
+    "reconstruct_url",
+    "url_normalize",
+    "url_normalize_structured",
+    "warmup",
+]
+
+NORMALIZER_CACHE_SIZE = 64
+
+_default_normalizer = Normalizer()
+_normalizers: LRUCache[tuple, Normalizer] = LRUCache(NORMALIZER_CACHE_SIZE)
+
+
+class NormalizeOptions(TypedDict, total=False):
+    """Keyword options of url_normalize other than return_bytes."""
+
+    charset: str
+    default_scheme: str
+    default_domain: str | None
+    filter_params: bool
+    param_allowlist: dict | list | None
+    strip_tracking_params: bool
+    param_denylist: dict | list | None
+    sort_params: bool
+    sort_param_values: bool
+    collapse_params: bool
+    skip_normalized: bool
+
+
+def _uses_default_normalizer(  # noqa: PLR0913
+    charset: str,
+    default_scheme: str,
+    default_domain: str | None,
+    *,
+    filter_params: bool,
+    strip_tracking_params: bool,
+    sort_params: bool,
+    sort_param_values: bool,
+    collapse_params: bool,
+    skip_normalized: bool,
+    return_bytes: bool,
+) -> bool:
+    """Check whether options normalize like the default normalizer.
+
+    The parameter lists are ignored: they only matter when filter_params or
+    strip_tracking_params is set.
+    """
+    return (
+        charset == DEFAULT_CHARSET
+        and default_scheme == DEFAULT_SCHEME
+        and default_domain is None
+        and not filter_params
+        and not strip_tracking_params
+        and not (sort_params or sort_param_values or collapse_params)
+        and not skip_normalized
+        and not return_bytes
+    )
+
+
+def _param_list_key(params: dict | list | None) -> tuple | None:
+    """Build a hashable cache key for a parameter allowlist or denylist."""
+    if isinstance(params, Mapping):
+        return tuple((domain, tuple(rules)) for domain, rules in params.items())
+    if params is not None:
+        return ("list", tuple(params))
+    return None
+
+
+def _cached_normalizer(  # noqa: PLR0913
+    charset: str,
+    default_scheme: str,
+    default_domain: str | None,
+    filter_params: bool,  # noqa: FBT001
+    param_allowlist: dict | list | None,
+    *,
+    strip_tracking_params: bool = False,
+    param_denylist: dict | list | None = None,
+    **options: Any,  # noqa: ANN401
+) -> Normalizer:
+    """Look up or build the Normalizer for a set of options."""
+    # The allowlist only matters when filtering, the denylist when stripping;
+    # unused ones are dropped so the shared normalizer does not report them
+    if not filter_params:
+        param_allowlist = None
+    if not strip_tracking_params:
+        param_denylist = None
+    key = (
+        charset,
+        default_scheme,
+        default_domain,
+        filter_params,
+        _param_list_key(param_allowlist),
+        strip_tracking_params,
+        _param_list_key(param_denylist),
+        *options.items(),
+    )
+    normalizer = _normalizers.get(key)
+    if normalizer is None:
+        normalizer = Normalizer(
+            charset=charset,
+            default_scheme=default_scheme,
+            default_domain=default_domain,
+            filter_params=filter_params,
+            param_allowlist=param_allowlist,
+            strip_tracking_params=strip_tracking_params,
+            param_denylist=param_denylist,
+            **options,
+        )
+        _normalizers.put(key, normalizer)
+    return normalizer
+
+
+def get_normalizer(**options: Any) -> Normalizer:  # noqa: ANN401
+    """Return a shared Normalizer for the given url_normalize options.
+
+    Instances are cached per distinct set of options, so repeated calls with
+    the same configuration reuse the precomputed normalization state. The
+    param_allowlist and param_denylist options are dropped unless
+    filter_params and strip_tracking_params, respectively, use them.
+
+    Params:
+        **options: Keyword options accepted by Normalizer
+
+    Returns:
+        Normalizer : normalizer bound to the options
+
+    """
+    if not options:
+        return _default_normalizer
+    return _cached_normalizer(**{**_default_normalizer.options, **options})
+
+
+def get_str_normalizer(**options: Any) -> Callable[[str | None], str | None]:  # noqa: ANN401
+    """Return a shared Normalizer for options of an API working on str URLs.
+
+    Params:
+        **options: Keyword options accepted by Normalizer, except return_bytes
+
+    Returns:
+        Normalizer : normalizer bound to the options, returning str
+
+    Raises:
+        TypeError: If return_bytes is set
+
+    """
+    if options.get("return_bytes"):
+        msg = "return_bytes is not supported, normalized URLs are returned as str"
+        raise TypeError(msg)
+    return cast("Callable[[str | None], str | None]", get_normalizer(**options))
+
+
+@overload
+def url_normalize(
+    url: str | bytes | bytearray | memoryview | None,
+    *,
+    return_bytes: Literal[False] = ...,
+    **options: Unpack[NormalizeOptions],
+) -> str | None: ...
+
+
+@overload
+def url_normalize(
+    url: str | bytes | bytearray | memoryview | None,
+    *,
+    return_bytes: Literal[True],
+    **options: Unpack[NormalizeOptions],
+) -> bytes | None: ...
+
+
+@overload
+def url_normalize(
+    url: str | bytes | bytearray | memoryview | None,
+    *,
+    return_bytes: bool,
+    **options: Unpack[NormalizeOptions],
+) -> str | bytes | None: ...
 
 
 def url_normalize(  # noqa: PLR0913
-    url: str | None,
+    url: str | bytes | bytearray | memoryview | None,
     *,  # Force keyword-only arguments
     charset: str = DEFAULT_CHARSET,
     default_scheme: str = DEFAULT_SCHEME,
     default_domain: str | None = None,
     filter_params: bool = False,
     param_allowlist: dict | list | None = None,
-) -> str | None:
+    strip_tracking_params: bool = False,
+    param_denylist: dict | list | None = None,
+    sort_params: bool = False,
+    sort_param_values: bool = False,
+    collapse_params: bool = False,
+    skip_normalized: bool = False,
+    return_bytes: bool = False,
+) -> str | bytes | None:
     """URI normalization routine.
 
     Sometimes you get an URL by a user that just isn't a real
@@ -40,10 +259,18 @@ def url_normalize(  # noqa: PLR0913
     >>> url_normalize('http://de.wikipedia.org/wiki/Elf (Begriffsklärung)')
     'http://de.wikipedia.org/wiki/Elf%20%28Begriffskl%C3%A4rung%29'
 
+    URLs can also be given as bytes, e.g. lines of a memory-mapped file:
+
+    >>> url_normalize(b'www.foo.com:80/foo', return_bytes=True)
+    b'https://www.foo.com:80/foo'
+
     Params:
-        url : str | None : URL to normalize
+        url : str | bytes | bytearray | memoryview | None : URL to normalize;
+            bytes-like URLs are decoded with charset, ASCII ones without
+            going through the codec
         charset : str : optional
-            The target charset for the URL if the url was given as unicode string
+            The target charset for the URL if the url was given as unicode
+            string, and the charset of bytes-like input and output
         default_scheme : str : default scheme to use if none present
         default_domain : str | None : optional
             Default domain to use for absolute paths (starting with '/')
@@ -51,31 +278,172 @@ def url_normalize(  # noqa: PLR0913
             Whether to filter non-allowlisted parameters (False by default)
         param_allowlist : dict | list | None : optional
             Override for the parameter allowlist
+        strip_tracking_params : bool : optional
+            Whether to remove known tracking parameters, such as utm_* and
+            fbclid, on any host (False by default)
+        param_denylist : dict | list | None : optional
+            Override for the parameter denylist: a list of rules replacing
+            the default ones, or a dict of per-domain rules added to them
+        sort_params : bool : optional
+            Whether to sort query parameters by key, keeping the order of the
+            values of a repeated key (False by default)
+        sort_param_values : bool : optional
+            Whether to also sort the values of a repeated key; requires
+            sort_params (False by default)
+        collapse_params : bool : optional
+            Whether to keep only the first of identical query key/value pairs
+            (False by default)
+        skip_normalized : bool : optional
+            Whether to return URLs already in normal form as is, after a fast
+            check (False by default). The result is the same either way.
+        return_bytes : bool : optional
+            Whether to return the normalized URL encoded with charset
+            (False by default)
 
     Returns:
-        str | None : a normalized url
+        str | bytes | None : a normalized url, None for None
 
     """
-    if not url:
-        return url
-    url = provide_url_domain(url, default_domain)
-    url = provide_url_scheme(url, default_scheme)
-    url = generic_url_cleanup(url)
-    url_elements = deconstruct_url(url)
-    url_elements = url_elements._replace(
-        scheme=normalize_scheme(url_elements.scheme),
-        userinfo=normalize_userinfo(url_elements.userinfo),
-        host=normalize_host(url_elements.host, charset),
-        query=normalize_query(
-            url_elements.query,
-            host=url_elements.host,
-            filter_params=filter_params,
-            param_allowlist=param_allowlist,
-        ),
-        fragment=normalize_fragment(url_elements.fragment),
+    if _uses_default_normalizer(
+        charset,
+        default_scheme,
+        default_domain,
+        filter_params=filter_params,
+        strip_tracking_params=strip_tracking_params,
+        sort_params=sort_params,
+        sort_param_values=sort_param_values,
+        collapse_params=collapse_params,
+        skip_normalized=skip_normalized,
+        return_bytes=return_bytes,
+    ):
+        return _default_normalizer(url)
+    normalizer = _cached_normalizer(
+        charset,
+        default_scheme,
+        default_domain,
+        filter_params,
+        param_allowlist,
+        strip_tracking_params=strip_tracking_params,
+        param_denylist=param_denylist,
+        sort_params=sort_params,
+        sort_param_values=sort_param_values,
+        collapse_params=collapse_params,
+        skip_normalized=skip_normalized,
+        return_bytes=return_bytes,
     )
-    url_elements = url_elements._replace(
-        port=normalize_port(url_elements.port, url_elements.scheme),
-        path=normalize_path(url_elements.path, url_elements.scheme),
+    return normalizer(url)
+
+
+def url_normalize_structured(  # noqa: PLR0913
+    url: str | bytes | bytearray | memoryview | None,
+    *,  # Force keyword-only arguments
+    charset: str = DEFAULT_CHARSET,
+    default_scheme: str = DEFAULT_SCHEME,
+    default_domain: str | None = None,
+    filter_params: bool = False,
+    param_allowlist: dict | list | None = None,
+    strip_tracking_params: bool = False,
+    param_denylist: dict | list | None = None,
+    sort_params: bool = False,
+    sort_param_values: bool = False,
+    collapse_params: bool = False,
+    skip_normalized: bool = False,
+) -> NormalizedURL | None:
+    """Normalize a URL and return its components instead of a string.
+
+    The components come straight from the pipeline, so reading the host or
+    the query parameters does not parse the normalized URL again; the string
+    is only built if str() is called.
+
+    >>> url = url_normalize_structured('http://www.FOO.com:80/a/../b?x=1')
+    >>> url.host, url.path, url.query_params
+    ('www.foo.com', '/b', [('x', '1')])
+    >>> str(url)
+    'http://www.foo.com/b?x=1'
+
+    Params:
+        url : str | bytes | bytearray | memoryview | None : URL to normalize
+        charset, default_scheme, default_domain, filter_params,
+        param_allowlist, strip_tracking_params, param_denylist, sort_params,
+        sort_param_values, collapse_params, skip_normalized : as for
+        url_normalize
+
+    Returns:
+        NormalizedURL | None : components of url_normalize(url, ...), or
+            None if url is None
+
+    """
+    if _uses_default_normalizer(
+        charset,
+        default_scheme,
+        default_domain,
+        filter_params=filter_params,
+        strip_tracking_params=strip_tracking_params,
+        sort_params=sort_params,
+        sort_param_values=sort_param_values,
+        collapse_params=collapse_params,
+        skip_normalized=skip_normalized,
+        return_bytes=False,
+    ):
+        return _default_normalizer.structured(url)
+    normalizer = _cached_normalizer(
+        charset,
+        default_scheme,
+        default_domain,
+        filter_params,
+        param_allowlist,
+        strip_tracking_params=strip_tracking_params,
+        param_denylist=param_denylist,
+        sort_params=sort_params,
+        sort_param_values=sort_param_values,
+        collapse_params=collapse_params,
+        skip_normalized=skip_normalized,
     )
-    return reconstruct_url(url_elements)
+    return normalizer.structured(url)
+
+
+def is_normalized(
+    url: str | bytes | bytearray | memoryview | None,
+    **options: Any,  # noqa: ANN401
+) -> bool:
+    """Check whether a URL is already in normal form.
+
+    Cheaper than comparing a URL with url_normalize(url) when it is
+    normalized: components are scanned in place and no output is built.
+
+    >>> is_normalized('https://www.foo.com/foo')
+    True
+    >>> is_normalized('www.foo.com:80/foo')
+    False
+
+    Params:
+        url : str | bytes | bytearray | memoryview | None : URL to check
+        **options : keyword options accepted by url_normalize
+
+    Returns:
+        bool : True if url_normalize(url, **options) returns url unchanged
+
+    """
+    return get_normalizer(**options).is_normalized(url)
+
+
+def warmup() -> None:
+    """Pay the one-time costs of normalization up front.
+
+    Modules and tables that most URLs do not need are loaded on first use:
+    idna and its UTS46 mapping tables for non-ASCII hosts, ipaddress for
+    bracketed hosts, and the quoting tables and regexes of each component.
+    Long-lived processes can call this once at startup so that no request
+    pays for them. Calling it again is cheap.
+    """
+    import ipaddress  # noqa: F401
+
+    import idna
+
+    for safe in (PATH_SAFE_CHARS, QUERY_PARAM_SAFE_CHARS, FRAGMENT_SAFE_CHARS):
+        quote_table(safe)
+        canonical_pattern(safe)
+    normalized_query_pattern()
+    # Load the UTS46 tables without filling the host cache
+    _normalize_host("xn--e1afmkfd.испытание", DEFAULT_CHARSET)
+    idna.decode("xn--e1afmkfd")